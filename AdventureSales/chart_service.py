@@ -0,0 +1,151 @@
+# chart_service.py (대시보드 차트 렌더링: 입력 데이터/옵션 해시 -> 캐시된 PNG 경로)
+#
+# chart_cache/
+#   top_spending_3fa9c0d1e2b4....png   <- 같은 데이터/옵션이면 같은 파일 (다른 필터는 다른 파일이므로 워커끼리 덮어쓰지 않음)
+
+import hashlib
+import json
+import os
+import threading
+import uuid
+from collections import OrderedDict
+from typing import Dict, Any, Optional
+import pandas as pd
+
+CHART_CACHE_DIR = 'chart_cache'
+# 메모리에 기억하는 차트 수 / 디스크에 남겨 두는 차트 파일 수
+MAX_MEMORY_CHARTS = 64
+MAX_DISK_CHARTS = 256
+CHART_FIGSIZE = (10, 6)
+CHART_DPI = 100
+
+
+def _import_plotting():
+    """matplotlib / seaborn 은 import 에 시간이 걸리므로 처음 차트를 그릴 때 불러옵니다."""
+    import matplotlib
+    matplotlib.use('Agg') # 화면 없이 PNG 로만 렌더링
+    from matplotlib.figure import Figure
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+    import seaborn as sns
+    return Figure, FigureCanvasAgg, sns
+
+
+def chart_key(kind: str, data: pd.DataFrame, params: Dict[str, Any]) -> str:
+    """차트 종류 + 입력 데이터(열 이름/값) + 옵션의 SHA-256 해시."""
+    digest = hashlib.sha256(f"{kind}\n".encode())
+    digest.update(json.dumps(list(map(str, data.columns)), ensure_ascii=False).encode())
+    digest.update(pd.util.hash_pandas_object(data, index=False).to_numpy().tobytes())
+    digest.update(json.dumps(params, ensure_ascii=False, sort_keys=True, default=str).encode())
+    return digest.hexdigest()
+
+
+class ChartService:
+    """
+    차트를 (입력 해시 -> PNG 파일)로 캐시합니다.
+    - 메모리 LRU 에 있으면 파일 확인 없이 경로 반환, 없으면 디스크 파일, 그것도 없으면 렌더링
+    - Figure 하나를 재사용하며 렌더링은 잠금 안에서만 수행 (matplotlib 는 스레드 안전하지 않음)
+    - 파일은 임시 이름으로 저장한 뒤 교체하므로 다른 워커가 반쯤 쓴 파일을 읽지 않음
+    """
+
+    def __init__(self, cache_dir: str = CHART_CACHE_DIR, max_memory: int = MAX_MEMORY_CHARTS, max_disk: int = MAX_DISK_CHARTS):
+        self.cache_dir = cache_dir
+        self.max_memory = max_memory
+        self.max_disk = max_disk
+        self._paths: "OrderedDict[str, str]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._render_lock = threading.Lock()
+        self._figure = None
+        self._sns = None
+        os.makedirs(cache_dir, exist_ok=True)
+
+    def _remember(self, key: str, path: str) -> None:
+        with self._lock:
+            self._paths[key] = path
+            self._paths.move_to_end(key)
+            while len(self._paths) > self.max_memory:
+                self._paths.popitem(last=False)
+
+    def _cached_path(self, key: str, kind: str) -> Optional[str]:
+        with self._lock:
+            path = self._paths.get(key)
+            if path is not None:
+                self._paths.move_to_end(key)
+        if path is not None and os.path.exists(path):
+            return path
+        path = os.path.join(self.cache_dir, f"{kind}_{key}.png")
+        if os.path.exists(path):
+            self._remember(key, path)
+            return path
+        return None
+
+    def _get_figure(self):
+        if self._figure is None:
+            Figure, FigureCanvasAgg, self._sns = _import_plotting()
+            self._figure = Figure(figsize=CHART_FIGSIZE, dpi=CHART_DPI)
+            FigureCanvasAgg(self._figure)
+        self._figure.clear()
+        return self._figure
+
+    def _save(self, figure, path: str) -> None:
+        tmp_path = os.path.join(self.cache_dir, f".tmp-{uuid.uuid4().hex}.png")
+        try:
+            figure.savefig(tmp_path, format='png')
+            os.replace(tmp_path, path)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+
+    def _prune_disk(self) -> None:
+        # 오래된 파일부터 정리 (다른 워커가 먼저 지웠으면 무시)
+        entries = []
+        for name in os.listdir(self.cache_dir):
+            if name.endswith('.png') and not name.startswith('.tmp-'):
+                try:
+                    entries.append((os.path.getmtime(os.path.join(self.cache_dir, name)), name))
+                except OSError:
+                    pass
+        entries.sort()
+        for _, name in entries[:max(0, len(entries) - self.max_disk)]:
+            try:
+                os.remove(os.path.join(self.cache_dir, name))
+            except OSError:
+                pass
+
+    def top_spending_chart(self, df: pd.DataFrame, name_column: str, value_column: str, title: str,
+                           xlabel: str = 'Total Spending (USD)', ylabel: str = 'Customer Name') -> Optional[str]:
+        """
+        구매액 가로 막대 그래프 PNG 경로를 반환합니다. (데이터가 비어 있으면 None)
+        전달받은 DataFrame 은 수정하지 않습니다.
+        """
+        if df.empty:
+            return None
+
+        data = df[[name_column, value_column]].sort_values(by=value_column, ascending=True)
+        kind = 'top_spending'
+        key = chart_key(kind, data, {'title': title, 'xlabel': xlabel, 'ylabel': ylabel})
+        path = self._cached_path(key, kind)
+        if path is not None:
+            return path
+
+        with self._render_lock:
+            # 기다리는 동안 같은 차트를 다른 요청이 이미 그렸을 수 있음
+            path = self._cached_path(key, kind)
+            if path is not None:
+                return path
+
+            figure = self._get_figure()
+            ax = figure.add_subplot()
+            self._sns.barplot(x=value_column, y=name_column, data=data, palette='viridis', hue=name_column, legend=False, ax=ax)
+            ax.set_title(title, fontsize=16)
+            ax.set_xlabel(xlabel, fontsize=12)
+            ax.set_ylabel(ylabel, fontsize=12)
+            figure.tight_layout()
+
+            path = os.path.join(self.cache_dir, f"{kind}_{key}.png")
+            self._save(figure, path)
+            figure.clear()
+
+        self._remember(key, path)
+        self._prune_disk()
+        return path
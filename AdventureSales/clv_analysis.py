@@ -0,0 +1,202 @@
+# clv_analysis.py (CLV 분석 파이프라인: 고객/일자별 구매액 로드 -> RFM 피처 -> CLV 모델 학습/점수 -> 바이너리 결과 저장)
+#
+# - 입력은 Adventure.db 의 (고객, 일자) 구매액 부분합(customer_daily_spending): 판매 행 전체를 다시 읽지 않음
+# - RFM 피처는 groupby 집계만으로 계산 (행 단위 파이썬 루프 없음)
+# - 모델: 관측 구간(마지막 CLV_HORIZON_DAYS 일 이전)의 RFM 으로 그 뒤 CLV_HORIZON_DAYS 일 구매액을 예측하는 로그 선형 회귀
+# - 점수 계산은 행렬 곱 한 번 (고객 100만 명도 수십 ms 이므로 프로세스 풀을 쓰지 않음)
+# - 단계별 소요 시간을 dict 로 기록, 결과는 CSV 대신 .npz 로 저장
+
+import os
+import pickle
+import sqlite3
+import time
+from contextlib import contextmanager
+from typing import Dict, Optional, Tuple
+import numpy as np
+import pandas as pd
+
+from clv_index import CLV_COLUMNS
+from clv_store import MODEL_PATH
+from data_model import DB_PATH, DAILY_SPENDING_TABLE, ensure_database
+
+RESULTS_PATH = 'clv_analysis_results.npz'
+# 예측 기간 (이 기간 동안의 구매액을 CLV 로 봄) - 학습 시에는 마지막 이 기간을 정답 구간으로 사용
+CLV_HORIZON_DAYS = 365
+RFM_BINS = 5
+FEATURE_NAMES = ['Recency', 'Frequency', 'Monetary', 'Tenure']
+
+
+@contextmanager
+def _timed(timings: Optional[Dict[str, float]], stage: str):
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        if timings is not None:
+            timings[stage] = round(time.perf_counter() - start, 6)
+
+
+# =========================================================================
+# 📥 1. 데이터 로드
+# =========================================================================
+def load_and_prepare_data(db_path: str = DB_PATH, timings: Optional[Dict[str, float]] = None) -> pd.DataFrame:
+    """(CustomerKey, OrderDate, Spending) 고객/일자별 구매액을 반환합니다. DB가 없으면 먼저 만듭니다."""
+    with _timed(timings, 'load'):
+        ensure_database()
+        conn = sqlite3.connect(db_path)
+        try:
+            df = pd.read_sql(f'SELECT CustomerKey, OrderDate, Spending FROM {DAILY_SPENDING_TABLE}', conn, parse_dates=['OrderDate'])
+        finally:
+            conn.close()
+        df['CustomerKey'] = df['CustomerKey'].astype('int64')
+    return df
+
+
+# =========================================================================
+# 🧮 2. RFM 피처
+# =========================================================================
+def _rfm_features(daily_df: pd.DataFrame, snapshot: pd.Timestamp) -> pd.DataFrame:
+    """snapshot 시점 기준 고객별 Recency(일) / Frequency(구매 일수) / Monetary(구매액 합) / Tenure(첫 구매 후 일수)."""
+    grouped = daily_df.groupby('CustomerKey', sort=True)
+    first = grouped['OrderDate'].min()
+    last = grouped['OrderDate'].max()
+    return pd.DataFrame({
+        'Recency': (snapshot - last).dt.days,
+        'Frequency': grouped.size(),
+        'Monetary': grouped['Spending'].sum(),
+        'Tenure': (snapshot - first).dt.days,
+    })
+
+
+def _quantile_score(values: pd.Series) -> np.ndarray:
+    # 순위 백분위를 RFM_BINS 구간으로 나눈 1~RFM_BINS 점 (값이 같으면 먼저 나온 순서대로)
+    return np.ceil(values.rank(method='first', pct=True).to_numpy() * RFM_BINS).astype(np.int64)
+
+
+def calculate_rfm_score(daily_df: pd.DataFrame, horizon_days: int = CLV_HORIZON_DAYS,
+                        timings: Optional[Dict[str, float]] = None) -> pd.DataFrame:
+    """
+    고객별 RFM 피처와 1~5점 R/F/M 점수를 계산합니다.
+    학습용으로 마지막 horizon_days 일 이전까지의 피처(Calib_*)와 그 뒤 구매액(Holdout_Spending)도 함께 계산합니다.
+    """
+    with _timed(timings, 'rfm'):
+        snapshot = daily_df['OrderDate'].max() + pd.Timedelta(days=1)
+        cutoff = snapshot - pd.Timedelta(days=horizon_days)
+
+        rfm = _rfm_features(daily_df, snapshot)
+        rfm['R_Score'] = _quantile_score(-rfm['Recency'])
+        rfm['F_Score'] = _quantile_score(rfm['Frequency'])
+        rfm['M_Score'] = _quantile_score(rfm['Monetary'])
+        rfm['RFM_Score'] = rfm['R_Score'] + rfm['F_Score'] + rfm['M_Score']
+
+        before = daily_df['OrderDate'] < cutoff
+        calib = _rfm_features(daily_df[before], cutoff).add_prefix('Calib_')
+        holdout = daily_df[~before].groupby('CustomerKey')['Spending'].sum().rename('Holdout_Spending')
+        rfm = rfm.join(calib).join(holdout)
+        rfm['Holdout_Spending'] = rfm['Holdout_Spending'].fillna(0.0)
+    return rfm.reset_index()
+
+
+# =========================================================================
+# 🤖 3. CLV 모델 학습 / 점수
+# =========================================================================
+def _design_matrix(recency, frequency, monetary, tenure) -> np.ndarray:
+    columns = [np.asarray(values, dtype=np.float64) for values in (recency, frequency, monetary, tenure)]
+    return np.column_stack([np.ones(len(columns[0]))] + [np.log1p(np.maximum(values, 0)) for values in columns])
+
+
+class CLVModel:
+    """log1p(다음 horizon_days 일 구매액) ~ 1 + log1p(R, F, M, T) 선형 회귀. 예측은 0 이상의 구매액(USD)."""
+
+    def __init__(self, coef: np.ndarray, horizon_days: int):
+        self.coef = coef
+        self.horizon_days = horizon_days
+        self.feature_names = FEATURE_NAMES
+
+    @classmethod
+    def fit(cls, rfm_df: pd.DataFrame, horizon_days: int = CLV_HORIZON_DAYS) -> "CLVModel":
+        """관측 구간에 구매가 있었던 고객의 Calib_* 피처로 Holdout_Spending 을 학습합니다."""
+        train = rfm_df.dropna(subset=[f'Calib_{name}' for name in FEATURE_NAMES])
+        if train.empty:
+            raise ValueError(f"학습 데이터가 없습니다: 마지막 {horizon_days}일 이전의 구매 기록이 필요합니다.")
+        X = _design_matrix(*(train[f'Calib_{name}'] for name in FEATURE_NAMES))
+        y = np.log1p(train['Holdout_Spending'].to_numpy(dtype=np.float64))
+        coef, *_ = np.linalg.lstsq(X, y, rcond=None)
+        return cls(coef, horizon_days)
+
+    def predict(self, X: np.ndarray) -> np.ndarray:
+        return np.maximum(np.expm1(X @ self.coef), 0.0)
+
+
+def score_customers(model: CLVModel, rfm_df: pd.DataFrame) -> np.ndarray:
+    """현재 RFM 피처로 고객별 예측 CLV 를 계산합니다. (전체 고객을 행렬 곱 한 번으로)"""
+    X = _design_matrix(*(rfm_df[name] for name in FEATURE_NAMES))
+    return model.predict(X)
+
+
+def train_and_score_clv_model(rfm_df: pd.DataFrame, model_path: Optional[str] = MODEL_PATH,
+                              timings: Optional[Dict[str, float]] = None) -> pd.DataFrame:
+    """
+    CLV 모델을 학습하여 model_path 에 저장하고 (CustomerKey, Predicted_CLV, CLV_Score) DataFrame을 반환합니다.
+    CLV_Score 는 예측 CLV 의 백분위 (0~99, 높을수록 가치가 큰 고객)입니다.
+    """
+    with _timed(timings, 'train'):
+        model = CLVModel.fit(rfm_df)
+        if model_path:
+            with open(model_path, 'wb') as f:
+                pickle.dump(model, f)
+
+    with _timed(timings, 'score'):
+        predicted = score_customers(model, rfm_df)
+        percentile = pd.Series(predicted).rank(method='first', pct=True).to_numpy()
+        scores = np.minimum((percentile * 100).astype(np.int64), 99)
+        clv_df = pd.DataFrame({
+            'CustomerKey': rfm_df['CustomerKey'].to_numpy(dtype=np.int64),
+            'Predicted_CLV': predicted,
+            'CLV_Score': scores,
+        }, columns=CLV_COLUMNS)
+    return clv_df
+
+
+# =========================================================================
+# 💾 결과 저장 / 전체 실행
+# =========================================================================
+def save_clv_results(clv_df: pd.DataFrame, path: str = RESULTS_PATH) -> None:
+    """CLV 결과를 열별 배열로 .npz 에 저장합니다. (임시 파일에 쓴 뒤 교체)"""
+    tmp_path = f"{path}.tmp.npz"
+    np.savez(tmp_path, **{column: clv_df[column].to_numpy() for column in CLV_COLUMNS})
+    os.replace(tmp_path, path)
+
+
+def load_clv_results(path: str = RESULTS_PATH) -> pd.DataFrame:
+    """save_clv_results 로 저장한 결과를 DataFrame으로 읽습니다. (시각화/분석용)"""
+    with np.load(path) as data:
+        return pd.DataFrame({column: data[column] for column in CLV_COLUMNS})
+
+
+def run_clv_pipeline(results_path: Optional[str] = RESULTS_PATH) -> Tuple[pd.DataFrame, Dict[str, float]]:
+    """로드 -> RFM -> 학습/점수 -> 저장을 실행하고 (CLV 결과, 단계별 소요 시간(초))을 반환합니다."""
+    timings: Dict[str, float] = {}
+    daily_df = load_and_prepare_data(timings=timings)
+    rfm_df = calculate_rfm_score(daily_df, timings=timings)
+    clv_df = train_and_score_clv_model(rfm_df, timings=timings)
+    if results_path:
+        with _timed(timings, 'save'):
+            save_clv_results(clv_df, results_path)
+    return clv_df, timings
+
+
+def format_timings(timings: Dict[str, float]) -> str:
+    return ", ".join(f"{stage} {seconds:.3f}s" for stage, seconds in timings.items())
+
+
+if __name__ == '__main__':
+    import argparse
+    parser = argparse.ArgumentParser(description="RFM/CLV 분석 실행")
+    parser.add_argument('--output', default=RESULTS_PATH)
+    args = parser.parse_args()
+
+    # 저장되는 모델이 __main__.CLVModel 이 아닌 clv_analysis.CLVModel 로 pickle 되도록 모듈로 불러와 실행
+    from clv_analysis import run_clv_pipeline as run_pipeline
+    result, stage_timings = run_pipeline(args.output)
+    print(f"✅ 고객 {len(result)}명 CLV 계산 완료 -> {args.output} ({format_timings(stage_timings)})")
@@ -0,0 +1,113 @@
+# clv_index.py (CLV 점수 조회용 색인: 고객 키 -> 행 위치)
+
+from typing import List, Dict, Any, Optional, Tuple
+import numpy as np
+import pandas as pd
+
+CLV_COLUMNS = ['CustomerKey', 'Predicted_CLV', 'CLV_Score']
+# 고객 키 범위가 고객 수의 이 배수 이하이면 키 -> 위치 직접 주소표를 만들어 상수 시간 조회
+DENSE_SLOT_RATIO = 4
+# 색인의 고객 키는 int64 - 이 범위 밖의 요청 키는 조회 없이 '없음'
+INT64_MIN, INT64_MAX = -2 ** 63, 2 ** 63 - 1
+
+
+def build_slots(keys: np.ndarray) -> Tuple[Optional[np.ndarray], int]:
+    """정렬된 고유 고객 키로 (키 - 최소 키) -> 행 위치 배열(없으면 -1)을 만듭니다. 키가 너무 성기면 (None, 0)."""
+    if len(keys) == 0:
+        return None, 0
+    base = int(keys[0])
+    span = int(keys[-1]) - base + 1
+    if span > DENSE_SLOT_RATIO * len(keys) + 1024:
+        return None, 0
+    slots = np.full(span, -1, dtype=np.int64)
+    slots[keys - base] = np.arange(len(keys), dtype=np.int64)
+    return slots, base
+
+
+class CLVIndex:
+    """
+    CLV 분석 결과를 고객 키로 바로 찾을 수 있도록 만들어 두는 조회 구조입니다.
+    - keys: 정렬된 고유 고객 키 / predicted, scores: 같은 순서의 응답 값 (반올림/형 변환 완료)
+    - slots: (고객 키 - slot_base) -> 행 위치 직접 주소표 -> 상수 시간 조회, pandas 를 거치지 않음
+      (키가 성기면 slots 없이 정렬된 keys 에서 searchsorted)
+    배열은 np.load(mmap_mode='r') 로 연 파일이어도 되므로 여러 워커가 같은 페이지 캐시를 공유할 수 있습니다.
+    """
+
+    def __init__(self, keys: np.ndarray, predicted: np.ndarray, scores: np.ndarray,
+                 slots: Optional[np.ndarray] = None, slot_base: int = 0):
+        self.keys = keys
+        self.predicted = predicted
+        self.scores = scores
+        self.slots = slots
+        self.slot_base = slot_base
+
+    @classmethod
+    def from_frame(cls, clv_df: pd.DataFrame) -> "CLVIndex":
+        """CLV 결과 DataFrame 으로 색인을 만듭니다. 같은 고객 키가 여러 행이면 기존 조회(.iloc[0])와 같이 처음 나온 행을 사용합니다."""
+        keys = clv_df['CustomerKey'].to_numpy(dtype=np.int64)
+        # 응답 값은 미리 반올림/형 변환하여 요청마다 계산하지 않음
+        predicted = np.array([round(float(value), 2) for value in clv_df['Predicted_CLV'].tolist()], dtype=np.float64)
+        scores = clv_df['CLV_Score'].to_numpy(dtype=np.int64)
+
+        # 고객 키별 첫 행만 남기고 키 순서로 정렬 (np.unique 는 정렬된 키와 첫 등장 위치를 반환)
+        unique_keys, first_positions = np.unique(keys, return_index=True)
+        slots, slot_base = build_slots(unique_keys)
+        return cls(unique_keys, predicted[first_positions], scores[first_positions], slots, slot_base)
+
+    def __len__(self) -> int:
+        return len(self.keys)
+
+    def _position(self, customer_key: int) -> int:
+        if not INT64_MIN <= customer_key <= INT64_MAX:
+            return -1
+        if self.slots is not None:
+            offset = customer_key - self.slot_base
+            if 0 <= offset < len(self.slots):
+                return int(self.slots[offset])
+            return -1
+        position = int(np.searchsorted(self.keys, customer_key))
+        if position < len(self.keys) and int(self.keys[position]) == customer_key:
+            return position
+        return -1
+
+    def get(self, customer_key: int) -> Optional[Dict[str, Any]]:
+        """고객 한 명의 CLV 결과를 반환합니다. 없으면 None."""
+        position = self._position(customer_key)
+        if position < 0:
+            return None
+        return {
+            "CustomerKey": customer_key,
+            "Predicted_CLV_USD": float(self.predicted[position]),
+            "CLV_Score": int(self.scores[position]),
+        }
+
+    def get_many(self, customer_keys: List[int]) -> Tuple[List[Dict[str, Any]], List[int]]:
+        """여러 고객의 CLV 결과를 요청 순서대로 반환합니다. (찾은 결과 목록, 없는 고객 키 목록)"""
+        if not customer_keys or len(self.keys) == 0:
+            return [], list(customer_keys)
+        if not all(INT64_MIN <= key <= INT64_MAX for key in customer_keys):
+            # int64 로 바꿀 수 없는 키는 빼고 조회한 뒤, not_found 에 요청 순서대로 다시 넣음
+            results, _ = self.get_many([key for key in customer_keys if INT64_MIN <= key <= INT64_MAX])
+            found_keys = {result["CustomerKey"] for result in results}
+            return results, [key for key in customer_keys if key not in found_keys]
+
+        query = np.asarray(customer_keys, dtype=np.int64)
+        if self.slots is not None:
+            offsets = query - self.slot_base
+            in_range = (offsets >= 0) & (offsets < len(self.slots))
+            positions = np.full(len(query), -1, dtype=np.int64)
+            positions[in_range] = self.slots.take(offsets[in_range])
+            found = positions >= 0
+        else:
+            positions = np.minimum(np.searchsorted(self.keys, query), len(self.keys) - 1)
+            found = self.keys.take(positions) == query
+
+        found_positions = positions[found]
+        predicted = self.predicted.take(found_positions).tolist()
+        scores = self.scores.take(found_positions).tolist()
+
+        results = [
+            {"CustomerKey": key, "Predicted_CLV_USD": value, "CLV_Score": score}
+            for key, value, score in zip(query[found].tolist(), predicted, scores)
+        ]
+        return results, query[~found].tolist()
@@ -0,0 +1,198 @@
+# clv_store.py (CLV 모델/점수 산출물 저장소: 버전별 디렉토리 + 메모리 매핑 점수 파일)
+#
+# clv_artifacts/
+#   LATEST                                 <- 현재 버전 디렉토리 이름 (임시 파일 작성 후 교체)
+#   v1732500000000000000_3fa9c0d1e2b4/
+#     manifest.json                        <- 형식 버전, 원본 데이터 지문, 생성 시각, 고객 수
+#     clv_model.pkl                        <- 학습된 모델
+#     keys.npy / predicted.npy / scores.npy / slots.npy   <- CLVIndex 배열 (np.load(mmap_mode='r'))
+
+import hashlib
+import json
+import os
+import pickle
+import shutil
+import time
+import uuid
+from typing import List, Dict, Any, Optional
+import numpy as np
+import pandas as pd
+
+from clv_index import CLVIndex
+from data_model import DB_PATH, EXCEL_PATH, ensure_database, read_aggregate_state
+
+ARTIFACT_DIR = 'clv_artifacts'
+# CLV 분석의 입력 파일: 내용이 바뀌면 다시 학습
+# (학습 데이터는 DB 의 고객/일자별 부분합이므로 append_sales 로 추가된 판매는 DB 집계 상태로 지문에 반영)
+CLV_SOURCE_FILES = [EXCEL_PATH]
+MODEL_PATH = 'clv_model.pkl'
+# 저장 형식이 바뀌면 올려서 기존 산출물을 쓰지 않도록 함
+ARTIFACT_FORMAT_VERSION = 1
+KEEP_VERSIONS = 3
+# 다른 워커가 학습 중임을 알리는 잠금 파일 (이 시간보다 오래되면 중단된 학습으로 보고 무시)
+TRAIN_LOCK_TIMEOUT = 60 * 60
+HASH_CHUNK_SIZE = 1024 * 1024
+
+_ARRAY_NAMES = ['keys', 'predicted', 'scores']
+
+
+def source_fingerprint(paths: List[str] = CLV_SOURCE_FILES, db_path: str = DB_PATH) -> str:
+    """
+    CLV 입력 파일 내용 + DB 집계 상태(마지막으로 반영한 sales rowid, 가장 최근 주문일)의 SHA-256 지문.
+    없는 파일/상태는 '없음'으로 지문에 반영합니다. DB가 없으면 먼저 만들어 학습할 때와 같은 상태를 봅니다.
+    """
+    ensure_database()
+    digest = hashlib.sha256(f"format={ARTIFACT_FORMAT_VERSION}\n".encode())
+    for path in paths:
+        digest.update(f"{path}\n".encode())
+        try:
+            with open(path, 'rb') as f:
+                for chunk in iter(lambda: f.read(HASH_CHUNK_SIZE), b''):
+                    digest.update(chunk)
+        except FileNotFoundError:
+            digest.update(b"<missing>")
+    state = read_aggregate_state(db_path)
+    digest.update(f"aggregate={state[0]},{state[1]}\n".encode() if state is not None else b"aggregate=<missing>\n")
+    return digest.hexdigest()
+
+
+class CLVArtifact:
+    """한 버전의 CLV 산출물. 점수 배열은 메모리 매핑으로 열어 여러 워커 프로세스가 같은 페이지를 공유합니다."""
+
+    def __init__(self, path: str, manifest: Dict[str, Any], index: CLVIndex):
+        self.path = path
+        self.name = os.path.basename(path)
+        self.manifest = manifest
+        self.index = index
+
+    @property
+    def fingerprint(self) -> str:
+        return self.manifest['fingerprint']
+
+    def load_model(self):
+        """학습된 모델을 불러옵니다. (점수 조회에는 필요 없으므로 필요할 때만 호출)"""
+        with open(os.path.join(self.path, MODEL_PATH), 'rb') as f:
+            return pickle.load(f)
+
+
+class CLVArtifactStore:
+    """버전별 CLV 산출물을 저장/조회합니다. 새 버전은 완성된 뒤에만 LATEST 로 공개되므로 읽는 쪽은 항상 온전한 버전을 봅니다."""
+
+    def __init__(self, root: str = ARTIFACT_DIR):
+        self.root = root
+        os.makedirs(root, exist_ok=True)
+
+    def _latest_path(self) -> str:
+        return os.path.join(self.root, 'LATEST')
+
+    def latest_name(self) -> Optional[str]:
+        try:
+            with open(self._latest_path(), encoding='utf-8') as f:
+                return f.read().strip() or None
+        except FileNotFoundError:
+            return None
+
+    def _versions(self) -> List[str]:
+        # 디렉토리 이름이 v<나노초 시각>_... 이므로 이름 역순 = 최신순
+        return sorted((name for name in os.listdir(self.root) if name.startswith('v')), reverse=True)
+
+    def _open(self, name: str) -> CLVArtifact:
+        """버전 하나를 메모리 매핑으로 엽니다. 파일이 빠졌거나 길이가 맞지 않으면 ValueError."""
+        path = os.path.join(self.root, name)
+        with open(os.path.join(path, 'manifest.json'), encoding='utf-8') as f:
+            manifest = json.load(f)
+        if manifest.get('format_version') != ARTIFACT_FORMAT_VERSION:
+            raise ValueError(f"지원하지 않는 산출물 형식입니다: {name}")
+
+        arrays = {array_name: np.load(os.path.join(path, f'{array_name}.npy'), mmap_mode='r') for array_name in _ARRAY_NAMES}
+        if not all(len(array) == manifest['rows'] for array in arrays.values()):
+            raise ValueError(f"산출물 배열 길이가 manifest 와 다릅니다: {name}")
+
+        slots = None
+        if manifest.get('slot_base') is not None:
+            slots = np.load(os.path.join(path, 'slots.npy'), mmap_mode='r')
+        index = CLVIndex(arrays['keys'], arrays['predicted'], arrays['scores'], slots, manifest.get('slot_base') or 0)
+        return CLVArtifact(path, manifest, index)
+
+    def load_latest(self) -> Optional[CLVArtifact]:
+        """LATEST 가 가리키는 버전을, 깨져 있으면 그다음 최신 버전을 엽니다. 쓸 수 있는 버전이 없으면 None."""
+        latest = self.latest_name()
+        candidates = ([latest] if latest else []) + [name for name in self._versions() if name != latest]
+        for name in candidates:
+            try:
+                return self._open(name)
+            except (OSError, ValueError, KeyError) as e:
+                print(f"⚠️ CLV 산출물 {name} 을(를) 건너뜁니다: {e}")
+        return None
+
+    def publish(self, clv_df: pd.DataFrame, fingerprint: str, model_path: Optional[str] = MODEL_PATH) -> CLVArtifact:
+        """
+        CLV 결과(와 학습된 모델 파일)를 새 버전으로 저장하고 LATEST 를 교체합니다.
+        임시 디렉토리에 모두 쓴 뒤 이름을 바꾸므로 중간에 실패해도 기존 버전은 그대로 남습니다.
+        """
+        index = CLVIndex.from_frame(clv_df)
+        name = f"v{time.time_ns()}_{fingerprint[:12]}"
+        tmp_path = os.path.join(self.root, f".tmp-{uuid.uuid4().hex}")
+        os.makedirs(tmp_path)
+        try:
+            np.save(os.path.join(tmp_path, 'keys.npy'), index.keys)
+            np.save(os.path.join(tmp_path, 'predicted.npy'), index.predicted)
+            np.save(os.path.join(tmp_path, 'scores.npy'), index.scores)
+            if index.slots is not None:
+                np.save(os.path.join(tmp_path, 'slots.npy'), index.slots)
+            if model_path and os.path.exists(model_path):
+                shutil.copyfile(model_path, os.path.join(tmp_path, MODEL_PATH))
+            manifest = {
+                'format_version': ARTIFACT_FORMAT_VERSION,
+                'fingerprint': fingerprint,
+                'created_at': time.strftime('%Y-%m-%dT%H:%M:%S'),
+                'rows': len(index),
+                'slot_base': index.slot_base if index.slots is not None else None,
+            }
+            with open(os.path.join(tmp_path, 'manifest.json'), 'w', encoding='utf-8') as f:
+                json.dump(manifest, f, ensure_ascii=False, indent=2)
+            os.rename(tmp_path, os.path.join(self.root, name))
+        except BaseException:
+            shutil.rmtree(tmp_path, ignore_errors=True)
+            raise
+
+        latest_tmp = os.path.join(self.root, f".LATEST-{uuid.uuid4().hex}")
+        with open(latest_tmp, 'w', encoding='utf-8') as f:
+            f.write(name)
+        os.replace(latest_tmp, self._latest_path())
+
+        self._prune(keep=name)
+        return self._open(name)
+
+    def _prune(self, keep: str) -> None:
+        # 오래된 버전 정리 (다른 워커가 아직 매핑 중이어도 POSIX 에서는 파일 내용이 유지됨, 실패하면 다음 기회에 정리)
+        for name in self._versions()[KEEP_VERSIONS:]:
+            if name != keep:
+                shutil.rmtree(os.path.join(self.root, name), ignore_errors=True)
+
+    # ---------------------------------------------------------------------
+    # 학습 잠금: 여러 uvicorn 워커 중 하나만 다시 학습
+    # ---------------------------------------------------------------------
+    def _lock_path(self) -> str:
+        return os.path.join(self.root, 'train.lock')
+
+    def try_acquire_train_lock(self) -> bool:
+        lock_path = self._lock_path()
+        try:
+            if time.time() - os.path.getmtime(lock_path) > TRAIN_LOCK_TIMEOUT:
+                os.remove(lock_path)
+        except OSError:
+            pass
+        try:
+            fd = os.open(lock_path, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+        except FileExistsError:
+            return False
+        with os.fdopen(fd, 'w') as f:
+            f.write(str(os.getpid()))
+        return True
+
+    def release_train_lock(self) -> None:
+        try:
+            os.remove(self._lock_path())
+        except FileNotFoundError:
+            pass
@@ -1,9 +1,10 @@
 # data_controller.py
 
-from typing import List
-from pydantic import BaseModel, Field
+from typing import List, Optional, Tuple
+from pydantic import BaseModel, Field, TypeAdapter
+import numpy as np
 import pandas as pd
-from data_model import get_top_100_data, setup_database
+from data_model import get_top_100_data, ensure_database, query_top_customers, count_top_customers, list_regions, TOP_N
 
 # 1. Pydantic 모델 정의: API/UI로 전달할 데이터의 구조를 명확히 합니다.
 class TopCustomer(BaseModel):
@@ -16,12 +17,34 @@ class TopCustomer(BaseModel):
     country: str = Field(..., description="고객의 국가")
 
 
+# 목록 전체를 한 번에 검증 (행마다 모델 생성자를 호출하지 않음)
+TOP_CUSTOMER_LIST_ADAPTER = TypeAdapter(List[TopCustomer])
+
+# Gradio 표에 표시할 열 / 그래프용 숫자 구매액 열 (표시용 문자열을 다시 파싱하지 않도록 함께 전달)
+DISPLAY_COLUMNS = ['순위', '고객 키', '고객 이름', '총 구매액 (USD)', '도시', '국가']
+SPENDING_VALUE_COLUMN = '총 구매액 값'
+
+
+def build_top_customer_frame(df: pd.DataFrame) -> pd.DataFrame:
+    """DB의 Top N 결과를 TopCustomer 필드 이름의 열 단위 DataFrame으로 변환합니다. (순위/반올림은 벡터 연산)"""
+    # 페이지 조회 결과는 SQL에서 매긴 전체 순위(Rank)를 그대로 사용
+    ranks = df['Rank'].astype('int64').to_numpy() if 'Rank' in df.columns else np.arange(1, len(df) + 1)
+    return pd.DataFrame({
+        'rank': ranks,
+        'customer_key': df['CustomerKey'].astype('int64').to_numpy(),
+        'customer_name': df['Customer'].to_numpy(),
+        'total_spending': df['Total Spending'].astype(float).round(2).to_numpy(),
+        'city': df['City'].to_numpy(),
+        'country': df['Country-Region'].to_numpy(),
+    })
+
+
 # 2. 컨트롤러 로직
 class AdventureController:
     
     def __init__(self):
-        # DB 설정을 초기화 시도. (Gradio 앱 시작 전 데이터 준비)
-        self.status_message = setup_database()
+        # DB 설정을 초기화 시도. (프로세스당 한 번만 실행, 이미 만들어진 DB는 캐시 확인만 함)
+        self.status_message = ensure_database()
 
     def get_db_setup_status(self) -> str:
         """DB 설정 상태 메시지 반환."""
@@ -36,42 +59,50 @@ class AdventureController:
         if df.empty:
             return []
 
-        # Pydantic 모델로 변환
-        data_list = []
-        for index, row in df.iterrows():
-            # 순위는 1부터 시작 (index + 1)
-            data_list.append(
-                TopCustomer(
-                    rank=index + 1,
-                    customer_key=int(row['CustomerKey']),
-                    customer_name=row['Customer'],
-                    total_spending=round(row['Total Spending'], 2),
-                    city=row['City'],
-                    country=row['Country-Region']
-                )
-            )
-            
-        return data_list
+        # 열 단위로 변환한 뒤 목록 전체를 한 번에 검증
+        frame = build_top_customer_frame(df)
+        return TOP_CUSTOMER_LIST_ADAPTER.validate_python(frame.to_dict('records'))
+
+    def get_top_customers_frame(self, top_n: int = TOP_N, country: Optional[str] = None, city: Optional[str] = None,
+                                start_date: Optional[str] = None, end_date: Optional[str] = None,
+                                page: int = 1, page_size: Optional[int] = None) -> pd.DataFrame:
+        """
+        표시용 열(DISPLAY_COLUMNS)과 숫자 구매액 열(SPENDING_VALUE_COLUMN)을 함께 담은 DataFrame을 반환합니다.
+        N / 국가·도시 / 기간 / 페이지 조건은 SQL 조회에 그대로 전달하고, 행마다 모델을 거치지 않고 열 단위로 검증/포맷팅합니다.
+        """
+        offset = (max(1, page) - 1) * page_size if page_size else 0
+        df = query_top_customers(top_n, start_date, end_date, country or None, city or None, offset, page_size)
+        
+        if df.empty:
+            return pd.DataFrame(columns=DISPLAY_COLUMNS + [SPENDING_VALUE_COLUMN])
+
+        frame = build_top_customer_frame(df)
+        TOP_CUSTOMER_LIST_ADAPTER.validate_python(frame.to_dict('records'))
+
+        return pd.DataFrame({
+            '순위': frame['rank'],
+            '고객 키': frame['customer_key'],
+            '고객 이름': frame['customer_name'],
+            '총 구매액 (USD)': frame['total_spending'].map('${:,.2f}'.format), # 금액 포맷팅
+            '도시': frame['city'],
+            '국가': frame['country'],
+            SPENDING_VALUE_COLUMN: frame['total_spending'],
+        })
+
+    def count_top_customers(self, top_n: int = TOP_N, country: Optional[str] = None, city: Optional[str] = None,
+                            start_date: Optional[str] = None, end_date: Optional[str] = None) -> int:
+        """get_top_customers_frame 과 같은 조건에서 페이지 나누기 전 전체 고객 수를 반환합니다."""
+        return count_top_customers(top_n, start_date, end_date, country or None, city or None)
+
+    def get_regions(self) -> List[Tuple[str, str]]:
+        """필터 선택지로 쓸 (국가, 도시) 목록을 반환합니다."""
+        return list_regions()
 
     def get_top_100_for_gradio(self):
-        """Gradio의 DataFrame 컴포넌트에 맞는 형식(List[List])으로 데이터를 반환합니다."""
-        top_customers = self.get_top_100_customers_data()
+        """Gradio의 DataFrame 컴포넌트에 맞는 형식(표시용 6개 열)으로 데이터를 반환합니다."""
+        top_customers = self.get_top_customers_frame()
         
-        if not top_customers:
+        if top_customers.empty:
             return pd.DataFrame() # 빈 데이터프레임 반환
 
-        # Pydantic 모델 리스트를 Gradio의 DataFrame에 적합한 Pandas DataFrame으로 변환
-        data_for_gradio = [
-            [
-                customer.rank,
-                customer.customer_key,
-                customer.customer_name,
-                f"${customer.total_spending:,.2f}", # 금액 포맷팅
-                customer.city,
-                customer.country
-            ] 
-            for customer in top_customers
-        ]
-        
-        columns = ['순위', '고객 키', '고객 이름', '총 구매액 (USD)', '도시', '국가']
-        return pd.DataFrame(data_for_gradio, columns=columns)
\ No newline at end of file
+        return top_customers[DISPLAY_COLUMNS]
@@ -3,6 +3,11 @@
 import pandas as pd
 import sqlite3
 import datetime as dt
+import hashlib
+import os
+import threading
+import time
+from contextlib import contextmanager
 
 # DB 파일 이름
 DB_PATH = 'Adventure.db' 
@@ -21,77 +26,528 @@ SHEET_NAMES = {
     'Sales Order_data': 'sales_order'
 }
 
-def setup_database():
-    """Excel 파일에서 데이터를 읽어와 DB에 7개 테이블을 저장하고, Top 100 고객 테이블을 생성합니다."""
+# 원본 Excel 정보(수정 시각/크기/해시)를 기록하는 테이블: 같으면 다음 실행에서 Excel 파싱을 건너뜀
+SOURCE_META_TABLE = '_source_meta'
+# 테이블 구성이나 Top N 계산 방식이 바뀌면 올려서 기존 DB 캐시를 다시 만들도록 함
+#   2: 고객/일자별 부분합, 최근 1년 합계, 집계 상태 테이블 추가
+#   3: Excel 을 청크 단위(openpyxl)로 읽어 열 형식이 달라짐
+CACHE_VERSION = 3
+HASH_CHUNK_SIZE = 1024 * 1024
+
+# 증분 집계 테이블: 고객/일자별 구매액 부분합 -> 최근 1년 고객별 합계 -> Top N
+DAILY_SPENDING_TABLE = 'customer_daily_spending'
+WINDOW_SPENDING_TABLE = 'customer_window_spending'
+AGGREGATE_STATE_TABLE = '_aggregate_state'
+WINDOW_DAYS = 365
+# 판매 데이터를 한 번에 메모리/임시 테이블에 올리는 최대 행 수 (Excel/CSV 읽기, 증분 집계 모두 이 단위로 나눔)
+SALES_CHUNK_ROWS = 50000
+
+# 조회용 인덱스: (테이블, 인덱스 이름, 열) - to_sql(if_exists='replace') 가 테이블과 함께 인덱스도 지우므로 설정 때마다 다시 만듦
+QUERY_INDEXES = [
+    ('sales', 'idx_sales_customer_date', '(CustomerKey, OrderDateKey)'),
+    ('customer', 'idx_customer_key', '(CustomerKey)'),
+    ('customer', 'idx_customer_region', '("Country-Region", City)'),
+    ('date', 'idx_date_key', '(DateKey)'),
+]
+# 한 번에 조회할 수 있는 최대 행 수 (페이지 크기 상한)
+MAX_PAGE_SIZE = 1000
+
+# 여러 프로세스(워커)가 동시에 DB를 만들지 않도록 하는 잠금 파일 (이 시간보다 오래되면 중단된 설정으로 보고 무시)
+SETUP_LOCK_PATH = DB_PATH + '.lock'
+SETUP_LOCK_TIMEOUT = 30 * 60
+SETUP_LOCK_POLL_INTERVAL = 0.1
+
+
+def _iter_sheet_chunks(sheet, chunksize):
+    """읽기 전용 워크시트를 chunksize 행씩 DataFrame으로 반환합니다. 첫 행은 열 이름, 빈 행은 건너뜁니다. (데이터가 없으면 빈 DataFrame 하나)"""
+    rows = sheet.iter_rows(values_only=True)
+    header = next(rows, None)
+    if header is None:
+        return
+    columns = [str(name) if name is not None else f'Unnamed: {i}' for i, name in enumerate(header)]
+    width = len(columns)
+
+    buffer = []
+    yielded = False
+    for row in rows:
+        if all(value is None for value in row):
+            continue
+        buffer.append(tuple(row[:width]) + (None,) * (width - len(row)))
+        if len(buffer) >= chunksize:
+            yield pd.DataFrame.from_records(buffer, columns=columns)
+            buffer = []
+            yielded = True
+    if buffer or not yielded:
+        yield pd.DataFrame.from_records(buffer, columns=columns)
+
+
+def iter_workbook_chunks(excel_path=EXCEL_PATH, chunksize=SALES_CHUNK_ROWS):
+    """
+    Excel 파일을 한 번만 (읽기 전용 스트리밍으로) 열어 시트 순서대로 (테이블 이름, DataFrame 청크 iterator)를 반환합니다.
+    시트 전체를 메모리에 올리지 않으므로 여러 해의 판매 데이터도 chunksize 행 단위로 처리할 수 있습니다.
+    각 청크 iterator 는 다음 시트로 넘어가기 전에 모두 소비해야 합니다.
+    """
+    from openpyxl import load_workbook
+    workbook = load_workbook(excel_path, read_only=True, data_only=True)
     try:
-        # 1. Excel 파일의 7개 시트 읽기
-        data_frames = {}
         for sheet_name, table_name in SHEET_NAMES.items():
-            # pandas의 ExcelFile 객체를 사용해 성능 개선
-            with pd.ExcelFile(EXCEL_PATH) as xls:
-                 data_frames[table_name] = pd.read_excel(xls, sheet_name=sheet_name)
-        
-        # 2. SQLite DB 연결 및 7개 테이블 저장
-        conn = sqlite3.connect(DB_PATH)
-        for table_name, df in data_frames.items():
-            df.to_sql(table_name, conn, if_exists='replace', index=False)
-        
-        # 3. Top 100 고객 테이블 계산 및 저장 (수정된 부분)
-        sales_df = data_frames['sales']
-        date_df = data_frames['date']
-        
-        # 🚨 수정: CustomerKey가 -1인 데이터 (측정 불가 또는 Not Applicable) 제외 🚨
-        sales_df = sales_df[sales_df['CustomerKey'] != -1].copy()
+            yield table_name, _iter_sheet_chunks(workbook[sheet_name], chunksize)
+    finally:
+        workbook.close()
 
-        # 날짜 조인을 위한 전처리
-        sales_date_df = pd.merge(sales_df, date_df[['DateKey', 'Date']], 
-                                 left_on='OrderDateKey', right_on='DateKey', how='left')
-        sales_date_df['OrderDate'] = pd.to_datetime(sales_date_df['Date'])
-        
-        # 최근 1년 기준일 설정
-        PRESENT = sales_date_df['OrderDate'].max()
-        ONE_YEAR_AGO = PRESENT - dt.timedelta(days=365)
 
-        # 최근 1년 데이터 필터링
-        recent_sales = sales_date_df[sales_date_df['OrderDate'] >= ONE_YEAR_AGO]
-        
-        # 고객별 총 구매액 계산
-        customer_spending = recent_sales.groupby('CustomerKey')['Sales Amount'].sum().reset_index()
-        customer_spending.columns = ['CustomerKey', 'Total Spending']
-        
-        # Top 100 고객 선정
-        top_100_customers = customer_spending.nlargest(TOP_N, 'Total Spending')
-        
-        # customer_df와 조인하여 고객 상세 정보 추가
-        customer_df = data_frames['customer'][['CustomerKey', 'Customer', 'City', 'Country-Region']]
-        top_100_details = pd.merge(top_100_customers, customer_df, 
-                                   on='CustomerKey', how='left')
+def _file_sha256(path):
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(HASH_CHUNK_SIZE), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _read_source_meta(conn):
+    """DB에 기록된 원본 Excel 정보를 반환합니다. 캐시가 없거나 버전이 다르면 None."""
+    try:
+        row = conn.execute(f'SELECT version, mtime_ns, size, sha256 FROM {SOURCE_META_TABLE}').fetchone()
+    except sqlite3.Error:
+        return None
+    if row is None or row[0] != CACHE_VERSION:
+        return None
+    return {'mtime_ns': row[1], 'size': row[2], 'sha256': row[3]}
+
+
+def _write_source_meta(conn, stat, sha256):
+    with conn:
+        conn.execute(f'DROP TABLE IF EXISTS {SOURCE_META_TABLE}')
+        conn.execute(f'CREATE TABLE {SOURCE_META_TABLE} (version INTEGER, mtime_ns INTEGER, size INTEGER, sha256 TEXT)')
+        conn.execute(f'INSERT INTO {SOURCE_META_TABLE} VALUES (?, ?, ?, ?)', (CACHE_VERSION, stat.st_mtime_ns, stat.st_size, sha256))
+
+
+def _clear_source_meta(conn):
+    with conn:
+        conn.execute(f'DROP TABLE IF EXISTS {SOURCE_META_TABLE}')
+
+
+def setup_database(force=False):
+    """
+    Excel 파일에서 데이터를 읽어와 DB에 7개 테이블을 저장하고, Top 100 고객 테이블을 생성합니다.
+    DB에 기록된 원본 Excel의 수정 시각/크기(다르면 SHA-256)가 현재 파일과 같으면 Excel을 다시 읽지 않고 기존 DB를 사용합니다.
+    """
+    conn = sqlite3.connect(DB_PATH)
+    try:
+        meta = _read_source_meta(conn)
+        if meta is not None:
+            # 인덱스가 없던 이전 캐시도 다시 만들지 않고 그대로 사용할 수 있도록 보강
+            ensure_query_indexes(conn)
+        try:
+            stat = os.stat(EXCEL_PATH)
+        except FileNotFoundError:
+            if meta is not None:
+                return f"⚠️ '{EXCEL_PATH}' 파일이 없어 기존 DB 캐시를 사용합니다. (Adventure.db)"
+            raise
+
+        # 0. 캐시 확인: 수정 시각/크기가 같으면 해시 계산도 생략, 다르면 내용 해시로 한 번 더 확인
+        if meta is not None and not force:
+            if meta['mtime_ns'] == stat.st_mtime_ns and meta['size'] == stat.st_size:
+                return "✅ 원본 Excel이 변경되지 않아 기존 DB 캐시를 사용합니다. (Adventure.db)"
+            sha256 = _file_sha256(EXCEL_PATH)
+            if meta['sha256'] == sha256:
+                _write_source_meta(conn, stat, sha256)
+                return "✅ 원본 Excel 내용이 같아 기존 DB 캐시를 사용합니다. (Adventure.db)"
+        else:
+            sha256 = _file_sha256(EXCEL_PATH)
+
+        # 1~2. Excel 파일을 한 번만 열어 7개 시트를 청크 단위로 읽으며 바로 테이블에 저장
+        #      (쓰는 도중 중단되어도 다음 실행에서 다시 만들도록 캐시 정보를 먼저 지움)
+        _clear_source_meta(conn)
+        for table_name, chunks in iter_workbook_chunks(EXCEL_PATH):
+            for i, chunk in enumerate(chunks):
+                chunk.to_sql(table_name, conn, if_exists='replace' if i == 0 else 'append', index=False)
+        ensure_query_indexes(conn)
         
-        # 'top_100_customers'라는 별도 테이블로 저장
-        top_100_details.to_sql('top_100_customers', conn, if_exists='replace', index=False)
+        # 3. 최근 1년 Top 100 고객 테이블 계산 및 저장 (부분합을 처음부터 다시 만든 뒤 증분 갱신 경로로 집계)
+        reset_aggregates(conn)
+        refresh_top_customers(conn)
         
-        conn.close()
+        _write_source_meta(conn, stat, sha256)
         return f"✅ DB 설정 및 Top {TOP_N} 고객 테이블 저장이 완료되었습니다. (Adventure.db)"
     
     except FileNotFoundError:
         return f"❌ 오류: '{EXCEL_PATH}' 파일을 찾을 수 없습니다. 프로젝트 폴더에 넣어주세요."
     except Exception as e:
         return f"❌ DB 설정 중 오류 발생: {e}"
+    finally:
+        conn.close()
 
 
-def get_top_100_data():
-    """DB에서 Top 100 고객 데이터를 불러옵니다."""
+# =========================================================================
+# 🚦 DB 준비 (프로세스당 한 번)
+#   - 같은 프로세스의 스레드들은 threading.Lock 으로, 다른 프로세스와는 잠금 파일로 setup_database 를 한 번에 하나만 실행
+#   - _source_meta 는 모든 테이블을 다 쓴 뒤에 기록되므로 준비 완료 표시 역할을 함
+#     -> 먼저 끝난 워커가 DB를 만들면 나머지 워커는 잠금을 얻은 뒤 캐시 확인만 하고 바로 반환
+# =========================================================================
+
+_setup_lock = threading.Lock()
+_setup_status = None
+
+
+@contextmanager
+def _file_lock(lock_path, timeout=SETUP_LOCK_TIMEOUT):
+    """O_EXCL 로 잠금 파일을 만들어 얻을 때까지 기다립니다. (오래된 잠금 파일은 중단된 프로세스의 것으로 보고 지움)"""
+    while True:
+        try:
+            fd = os.open(lock_path, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+            break
+        except FileExistsError:
+            try:
+                if time.time() - os.path.getmtime(lock_path) > timeout:
+                    os.remove(lock_path)
+                    continue
+            except OSError:
+                continue
+            time.sleep(SETUP_LOCK_POLL_INTERVAL)
+    try:
+        with os.fdopen(fd, 'w') as f:
+            f.write(str(os.getpid()))
+        yield
+    finally:
+        try:
+            os.remove(lock_path)
+        except FileNotFoundError:
+            pass
+
+
+def ensure_database():
+    """DB가 준비되어 있도록 setup_database 를 프로세스당 한 번만 실행하고 그 상태 메시지를 반환합니다."""
+    global _setup_status
+    if _setup_status is not None:
+        return _setup_status
+    with _setup_lock:
+        if _setup_status is None:
+            with _file_lock(SETUP_LOCK_PATH):
+                _setup_status = setup_database()
+    return _setup_status
+
+
+# =========================================================================
+# 📈 Top N 증분 집계
+#   - sales 는 뒤에 행이 추가되기만 한다고 보고, 마지막으로 집계한 sales rowid 를 기록
+#   - 새 행은 (고객, 일자) 부분합에 더하고, 1년 구간에 새로 들어오거나 빠지는 날짜의 고객만 합계를 다시 계산
+#   - Top N 은 합계 인덱스를 따라 N 행만 읽어 다시 만듦
+# =========================================================================
+
+def _ensure_aggregate_tables(conn):
+    conn.executescript(f"""
+        CREATE TABLE IF NOT EXISTS {DAILY_SPENDING_TABLE} (
+            CustomerKey INTEGER NOT NULL,
+            OrderDate TEXT NOT NULL,
+            Spending REAL NOT NULL,
+            PRIMARY KEY (CustomerKey, OrderDate)
+        );
+        CREATE INDEX IF NOT EXISTS idx_daily_spending_date ON {DAILY_SPENDING_TABLE} (OrderDate);
+        CREATE TABLE IF NOT EXISTS {WINDOW_SPENDING_TABLE} (
+            CustomerKey INTEGER PRIMARY KEY,
+            TotalSpending REAL NOT NULL
+        );
+        CREATE INDEX IF NOT EXISTS idx_window_spending_total ON {WINDOW_SPENDING_TABLE} (TotalSpending DESC, CustomerKey);
+        CREATE TABLE IF NOT EXISTS {AGGREGATE_STATE_TABLE} (
+            id INTEGER PRIMARY KEY CHECK (id = 1),
+            last_sales_rowid INTEGER NOT NULL,
+            window_start TEXT,
+            present TEXT
+        );
+    """)
+
+
+def reset_aggregates(conn):
+    """증분 집계 상태를 지웁니다. sales 테이블을 통째로 다시 쓴 뒤(rowid 가 새로 매겨짐)에는 반드시 호출해야 합니다."""
+    conn.executescript(f"""
+        DROP TABLE IF EXISTS {DAILY_SPENDING_TABLE};
+        DROP TABLE IF EXISTS {WINDOW_SPENDING_TABLE};
+        DROP TABLE IF EXISTS {AGGREGATE_STATE_TABLE};
+    """)
+
+
+def read_aggregate_state(db_path=DB_PATH):
+    """증분 집계 상태 (마지막으로 반영한 sales rowid, 가장 최근 주문일)를 반환합니다. DB나 상태가 없으면 None."""
+    if not os.path.exists(db_path):
+        return None
+    conn = sqlite3.connect(db_path)
+    try:
+        return conn.execute(f'SELECT last_sales_rowid, present FROM {AGGREGATE_STATE_TABLE}').fetchone()
+    except sqlite3.OperationalError:
+        return None
+    finally:
+        conn.close()
+
+
+def _accumulate_sales_chunk(conn, start_rowid, end_rowid):
+    """sales rowid (start_rowid, end_rowid] 범위를 (고객, 일자) 부분합에 더하고 고객을 _affected 에 추가합니다. 범위의 가장 최근 주문일을 반환합니다."""
+    conn.execute('DROP TABLE IF EXISTS temp._new_spending')
+    conn.execute("""
+        CREATE TEMP TABLE _new_spending AS
+        SELECT s.CustomerKey AS CustomerKey, date(d.Date) AS OrderDate, SUM(s."Sales Amount") AS Spending
+        FROM sales s JOIN date d ON d.DateKey = s.OrderDateKey
+        WHERE s.rowid > ? AND s.rowid <= ? AND s.CustomerKey != -1
+        GROUP BY s.CustomerKey, date(d.Date)
+    """, (start_rowid, end_rowid))
+    conn.execute('INSERT OR IGNORE INTO temp._affected SELECT CustomerKey FROM temp._new_spending')
+    conn.execute(f"""
+        INSERT INTO {DAILY_SPENDING_TABLE} (CustomerKey, OrderDate, Spending)
+        SELECT CustomerKey, OrderDate, Spending FROM temp._new_spending WHERE true
+        ON CONFLICT (CustomerKey, OrderDate) DO UPDATE SET Spending = Spending + excluded.Spending
+    """)
+    chunk_present = conn.execute('SELECT MAX(OrderDate) FROM temp._new_spending').fetchone()[0]
+    conn.execute('DROP TABLE temp._new_spending')
+    return chunk_present
+
+
+def refresh_top_customers(conn, top_n=TOP_N):
+    """
+    마지막 집계 이후 sales 에 추가된 행과 최근 1년 구간에 들어오거나 빠지는 날짜만 반영하여
+    top_100_customers 테이블을 갱신합니다. 처리한 새 sales 행 수를 반환합니다.
+    """
+    _ensure_aggregate_tables(conn)
+    with conn:
+        conn.execute('BEGIN')
+        state = conn.execute(f'SELECT last_sales_rowid, window_start, present FROM {AGGREGATE_STATE_TABLE}').fetchone()
+        last_rowid, old_start, old_present = state if state is not None else (0, None, None)
+        max_rowid = conn.execute('SELECT COALESCE(MAX(rowid), 0) FROM sales').fetchone()[0]
+
+        # 1. 새 sales 행을 rowid 범위(SALES_CHUNK_ROWS 행)씩 (고객, 일자)별로 묶어 부분합에 누적
+        #    (CustomerKey 가 -1 인 행은 측정 불가/Not Applicable 이므로 제외, 주문일은 DateKey 인덱스로 조회)
+        conn.execute('DROP TABLE IF EXISTS temp._affected')
+        conn.execute('CREATE TEMP TABLE _affected (CustomerKey INTEGER PRIMARY KEY)')
+        batch_present = None
+        for chunk_start in range(last_rowid, max_rowid, SALES_CHUNK_ROWS):
+            chunk_present = _accumulate_sales_chunk(conn, chunk_start, min(chunk_start + SALES_CHUNK_ROWS, max_rowid))
+            batch_present = max([day for day in (batch_present, chunk_present) if day is not None], default=None)
+
+        # 2. 기준일(가장 최근 주문일)과 1년 구간 시작일
+        present = max([day for day in (old_present, batch_present) if day is not None], default=None)
+        window_start = (dt.date.fromisoformat(present) - dt.timedelta(days=WINDOW_DAYS)).isoformat() if present else None
+
+        # 3. 합계를 다시 계산할 고객: 새 행이 있는 고객(1 에서 추가) + 구간에서 빠지는/새로 들어오는 날짜에 구매가 있는 고객
+        if old_start is not None and old_start < window_start:
+            conn.execute(f'INSERT OR IGNORE INTO temp._affected SELECT CustomerKey FROM {DAILY_SPENDING_TABLE} WHERE OrderDate >= ? AND OrderDate < ?',
+                         (old_start, window_start))
+        if old_present is not None and old_present < present:
+            conn.execute(f'INSERT OR IGNORE INTO temp._affected SELECT CustomerKey FROM {DAILY_SPENDING_TABLE} WHERE OrderDate > ? AND OrderDate <= ?',
+                         (old_present, present))
+
+        # 4. 영향받은 고객의 구간 합계만 다시 계산
+        conn.execute(f'DELETE FROM {WINDOW_SPENDING_TABLE} WHERE CustomerKey IN (SELECT CustomerKey FROM temp._affected)')
+        if present is not None:
+            conn.execute(f"""
+                INSERT INTO {WINDOW_SPENDING_TABLE} (CustomerKey, TotalSpending)
+                SELECT d.CustomerKey, SUM(d.Spending)
+                FROM {DAILY_SPENDING_TABLE} d JOIN temp._affected a ON a.CustomerKey = d.CustomerKey
+                WHERE d.OrderDate >= ? AND d.OrderDate <= ?
+                GROUP BY d.CustomerKey
+            """, (window_start, present))
+
+        # 5. 합계 인덱스 순서로 N 명만 읽어 고객 상세 정보와 함께 Top N 테이블로 저장
+        conn.execute('DROP TABLE IF EXISTS top_100_customers')
+        conn.execute(f"""
+            CREATE TABLE top_100_customers AS
+            SELECT w.CustomerKey AS CustomerKey, w.TotalSpending AS "Total Spending",
+                   c.Customer AS Customer, c.City AS City, c."Country-Region" AS "Country-Region"
+            FROM (SELECT CustomerKey, TotalSpending FROM {WINDOW_SPENDING_TABLE}
+                  ORDER BY TotalSpending DESC, CustomerKey LIMIT ?) w
+            LEFT JOIN customer c ON c.CustomerKey = w.CustomerKey
+            ORDER BY w.TotalSpending DESC, w.CustomerKey
+        """, (top_n,))
+
+        conn.execute(f'INSERT OR REPLACE INTO {AGGREGATE_STATE_TABLE} VALUES (1, ?, ?, ?)', (max_rowid, window_start, present))
+        conn.execute('DROP TABLE temp._affected')
+    return max_rowid - last_rowid
+
+
+def append_sales(new_sales, new_dates=None):
+    """
+    새 판매 행(DataFrame, sales 시트와 같은 열)을 sales 테이블 뒤에 추가하고 Top N 을 증분 갱신합니다.
+    새 주문일의 DateKey 가 date 테이블에 없으면 new_dates 로 함께 넘겨야 합니다. (없는 날짜의 행은 집계에서 제외됨)
+    """
     conn = sqlite3.connect(DB_PATH)
     try:
-        # Top 100 고객 테이블 로드
-        top_100_df = pd.read_sql('SELECT * FROM top_100_customers ORDER BY "Total Spending" DESC', conn)
+        _append_new_dates(conn, new_dates)
+        new_sales.to_sql('sales', conn, if_exists='append', index=False)
+        processed = refresh_top_customers(conn)
+        return f"✅ 판매 {processed}행을 반영하여 Top {TOP_N} 고객 테이블을 갱신했습니다. (Adventure.db)"
+    finally:
         conn.close()
-        return top_100_df
-    except Exception as e:
+
+
+def append_sales_csv(sales_path, dates_path=None, chunksize=SALES_CHUNK_ROWS):
+    """
+    판매 CSV를 chunksize 행씩 읽어 sales 테이블 뒤에 추가한 뒤 Top N 을 한 번만 증분 갱신합니다.
+    파일 전체를 DataFrame으로 올리지 않으므로 메모리보다 큰 판매 export 도 처리할 수 있습니다.
+    """
+    conn = sqlite3.connect(DB_PATH)
+    try:
+        if dates_path:
+            _append_new_dates(conn, pd.read_csv(dates_path, parse_dates=['Date']))
+        for chunk in pd.read_csv(sales_path, chunksize=chunksize):
+            chunk.to_sql('sales', conn, if_exists='append', index=False)
+        processed = refresh_top_customers(conn)
+        return f"✅ 판매 {processed}행을 반영하여 Top {TOP_N} 고객 테이블을 갱신했습니다. (Adventure.db)"
+    finally:
+        conn.close()
+
+
+def _append_new_dates(conn, new_dates):
+    # date 테이블에 아직 없는 DateKey 만 추가
+    if new_dates is None or new_dates.empty:
+        return
+    existing_keys = {row[0] for row in conn.execute('SELECT DateKey FROM date')}
+    new_dates = new_dates[~new_dates['DateKey'].isin(existing_keys)]
+    new_dates.to_sql('date', conn, if_exists='append', index=False)
+
+
+# =========================================================================
+# 🔎 Top N 조회
+#   - 스레드마다 연결 하나를 열어 재사용 (Gradio/FastAPI 워커 스레드에서 호출해도 연결을 공유하지 않음)
+#   - N / 기간 / 국가·도시 / 페이지를 매개변수로 받아 SQL 안에서 집계·정렬·잘라내기까지 수행
+#   - 기간을 주지 않으면 증분 집계된 최근 1년 합계를, 주면 고객/일자 부분합을 구간 합산
+# =========================================================================
+
+_local = threading.local()
+
+
+def get_connection():
+    """현재 스레드 전용 DB 연결을 반환합니다. (처음 호출할 때만 연결)"""
+    conn = getattr(_local, 'conn', None)
+    if conn is None:
+        conn = sqlite3.connect(DB_PATH)
+        _local.conn = conn
+    return conn
+
+
+def close_connection():
+    """현재 스레드의 DB 연결을 닫습니다."""
+    conn = getattr(_local, 'conn', None)
+    if conn is not None:
         conn.close()
+        _local.conn = None
+
+
+def ensure_query_indexes(conn):
+    """Top N 조회/필터에 쓰는 인덱스를 만듭니다. (이미 있으면 그대로 둠)"""
+    with conn:
+        for table_name, index_name, columns in QUERY_INDEXES:
+            conn.execute(f'CREATE INDEX IF NOT EXISTS {index_name} ON "{table_name}" {columns}')
+
+
+def _spending_source(start_date, end_date, country, city):
+    """(고객별 합계를 만드는 SQL, 매개변수)를 반환합니다. 필터는 모두 바인딩 매개변수로 전달합니다."""
+    params = []
+    region_join = ''
+    region_where = ''
+    if country or city:
+        region_join = 'JOIN customer c ON c.CustomerKey = t.CustomerKey'
+        conditions = []
+        if country:
+            conditions.append('c."Country-Region" = ?')
+            params.append(country)
+        if city:
+            conditions.append('c.City = ?')
+            params.append(city)
+        region_where = ' AND '.join(conditions)
+
+    if start_date is None and end_date is None:
+        # 증분 집계된 최근 1년 합계 (TotalSpending 인덱스 순서로 읽음)
+        sql = f'SELECT t.CustomerKey AS CustomerKey, t.TotalSpending AS TotalSpending FROM {WINDOW_SPENDING_TABLE} t {region_join}'
+        if region_where:
+            sql += f' WHERE {region_where}'
+        return sql, params
+
+    date_conditions = []
+    date_params = []
+    if start_date is not None:
+        date_conditions.append('t.OrderDate >= ?')
+        date_params.append(dt.date.fromisoformat(str(start_date)[:10]).isoformat())
+    if end_date is not None:
+        date_conditions.append('t.OrderDate <= ?')
+        date_params.append(dt.date.fromisoformat(str(end_date)[:10]).isoformat())
+    where = ' AND '.join(date_conditions + ([region_where] if region_where else []))
+    sql = f"""
+        SELECT t.CustomerKey AS CustomerKey, SUM(t.Spending) AS TotalSpending
+        FROM {DAILY_SPENDING_TABLE} t {region_join}
+        WHERE {where}
+        GROUP BY t.CustomerKey
+    """
+    return sql, date_params + params
+
+
+def query_top_customers(top_n=TOP_N, start_date=None, end_date=None, country=None, city=None, offset=0, limit=None):
+    """
+    구매액 상위 top_n 명 중 offset 번째부터 limit 명을 반환합니다. (열: Rank, CustomerKey, Total Spending, Customer, City, Country-Region)
+    - start_date / end_date: 'YYYY-MM-DD' (양 끝 포함). 둘 다 None 이면 최근 1년 구간
+    - country / city: 고객의 국가 / 도시 (None 이면 전체)
+    """
+    offset = max(0, offset)
+    page_size = top_n if limit is None else min(limit, MAX_PAGE_SIZE)
+    # 페이지가 top_n 경계를 넘지 않도록 자름
+    limit = max(0, min(page_size, top_n - offset))
+
+    source_sql, params = _spending_source(start_date, end_date, country, city)
+    sql = f"""
+        SELECT ? + ROW_NUMBER() OVER (ORDER BY w.TotalSpending DESC, w.CustomerKey) AS Rank,
+               w.CustomerKey AS CustomerKey, w.TotalSpending AS "Total Spending",
+               c.Customer AS Customer, c.City AS City, c."Country-Region" AS "Country-Region"
+        FROM ({source_sql} ORDER BY TotalSpending DESC, CustomerKey LIMIT ? OFFSET ?) w
+        LEFT JOIN customer c ON c.CustomerKey = w.CustomerKey
+        ORDER BY w.TotalSpending DESC, w.CustomerKey
+    """
+    try:
+        return pd.read_sql(sql, get_connection(), params=[offset] + params + [limit, offset])
+    except Exception as e:
+        print(f"Top N 데이터 조회 오류: {e}")
+        return pd.DataFrame()
+
+
+def count_top_customers(top_n=TOP_N, start_date=None, end_date=None, country=None, city=None):
+    """query_top_customers 와 같은 조건에서 페이지 나누기 전 전체 행 수(최대 top_n)를 반환합니다."""
+    source_sql, params = _spending_source(start_date, end_date, country, city)
+    try:
+        return get_connection().execute(f'SELECT COUNT(*) FROM ({source_sql} LIMIT ?)', params + [top_n]).fetchone()[0]
+    except sqlite3.Error as e:
+        print(f"Top N 데이터 조회 오류: {e}")
+        return 0
+
+
+def list_regions():
+    """고객 테이블의 (국가, 도시) 목록을 정렬하여 반환합니다. (대시보드 필터 선택지)"""
+    try:
+        rows = get_connection().execute(
+            'SELECT DISTINCT "Country-Region", City FROM customer WHERE "Country-Region" IS NOT NULL ORDER BY 1, 2'
+        ).fetchall()
+    except sqlite3.Error as e:
+        print(f"지역 목록 조회 오류: {e}")
+        return []
+    return rows
+
+
+def get_top_100_data():
+    """DB에서 Top 100 고객 데이터를 불러옵니다."""
+    try:
+        # Top 100 고객 테이블 로드 (스레드별 연결 재사용)
+        return pd.read_sql('SELECT * FROM top_100_customers ORDER BY "Total Spending" DESC', get_connection())
+    except Exception as e:
         print(f"Top 100 데이터 로드 오류: {e}")
         return pd.DataFrame()
 
 if __name__ == '__main__':
     # 이 파일을 직접 실행하여 DB를 설정할 수 있습니다.
-    print(setup_database())
\ No newline at end of file
+    #   --force: 캐시를 무시하고 Excel에서 다시 생성
+    #   --append-sales new_sales.csv [--append-dates new_dates.csv]: 새 판매 행만 추가하고 Top N 증분 갱신
+    import argparse
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--force', action='store_true')
+    parser.add_argument('--append-sales')
+    parser.add_argument('--append-dates')
+    args = parser.parse_args()
+
+    if args.append_sales:
+        print(append_sales_csv(args.append_sales, args.append_dates))
+    else:
+        print(setup_database(force=args.force))
\ No newline at end of file
@@ -1,50 +1,90 @@
 # gradio_app.py 파일 내용 (AttributeError를 해결한 최종 버전)
 
-import gradio as gr
-from data_controller import AdventureController
+import threading
+from data_controller import AdventureController, DISPLAY_COLUMNS, SPENDING_VALUE_COLUMN, TOP_N
 import pandas as pd
-import matplotlib.pyplot as plt
-import seaborn as sns
-# io 모듈은 더 이상 필요하지 않습니다.
-# import io 
+from chart_service import ChartService
+# gradio 는 import 가 무거우므로 대시보드를 띄울 때(run_dashboard) 불러옵니다.
 
-# 컨트롤러 인스턴스 생성 (DB 설정 및 Top 100 계산 완료)
-controller = AdventureController()
+# 컨트롤러 / 차트 서비스는 처음 사용할 때 한 번만 생성 (모듈 import 만으로는 DB 설정을 실행하지 않음)
+_controller = None
+_charts = None
+_init_lock = threading.Lock()
 
-# 1. 시각화 함수: Matplotlib 그래프를 PNG 파일로 저장하고 파일 경로를 반환
+# 지역 필터에서 '전체'를 뜻하는 선택지 / 한 페이지에 보여줄 고객 수
+ALL_REGIONS = '전체'
+PAGE_SIZE = 50
+
+
+def get_controller() -> AdventureController:
+    """컨트롤러를 반환합니다. 처음 호출할 때 DB 설정을 확인/실행합니다. (프로세스 간에는 data_model 의 잠금 파일로 한 번만 실행)"""
+    global _controller
+    if _controller is None:
+        with _init_lock:
+            if _controller is None:
+                _controller = AdventureController()
+    return _controller
+
+
+def get_chart_service() -> ChartService:
+    """차트는 입력 데이터/옵션 해시별 PNG 로 캐시 (필터가 다른 사용자끼리 같은 파일을 덮어쓰지 않음)"""
+    global _charts
+    if _charts is None:
+        with _init_lock:
+            if _charts is None:
+                _charts = ChartService()
+    return _charts
+
+
+# 1. 시각화 함수: 캐시된 차트 PNG 파일 경로를 반환
 def plot_top_10_spending(df: pd.DataFrame):
-    """Top 10 고객의 구매액 막대 그래프를 생성하고 파일 경로를 반환합니다."""
+    """Top 10 고객의 구매액 막대 그래프 파일 경로를 반환합니다. (같은 데이터면 다시 그리지 않음, df 는 수정하지 않음)"""
     
     if df.empty:
         return None 
 
-    # 금액 포맷팅을 풀기 위해 (데이터프레임의 '총 구매액 (USD)' 컬럼은 문자열로 포맷되어 있음)
-    df['Spending_Clean'] = df['총 구매액 (USD)'].str.replace('$', '', regex=False).str.replace(',', '', regex=False).astype(float)
-    top_10 = df.head(10).sort_values(by='Spending_Clean', ascending=True)
-
-    # 그래프 생성
-    plt.figure(figsize=(10, 6))
-    # FutureWarning 경고를 피하기 위해 hue를 명시적으로 설정합니다.
-    sns.barplot(x='Spending_Clean', y='고객 이름', data=top_10, palette='viridis', hue='고객 이름', legend=False) 
-    plt.title('Top 10 Customers by Recent Total Spending', fontsize=16)
-    plt.xlabel('Total Spending (USD)', fontsize=12)
-    plt.ylabel('Customer Name', fontsize=12)
-    plt.tight_layout()
-
-    # 🚨 수정된 부분: 이미지를 파일로 저장하고 파일 경로를 반환합니다.
-    PLOT_FILE_NAME = "top_10_spending_graph.png"
-    plt.savefig(PLOT_FILE_NAME, format='png')
-    plt.close() # 메모리 누수 방지
-    
-    return PLOT_FILE_NAME # 파일 경로 (문자열) 반환
+    # 컨트롤러가 표시용 문자열과 함께 넘겨준 숫자 구매액 열을 그대로 사용 (문자열을 다시 파싱하지 않음)
+    return get_chart_service().top_spending_chart(df.head(10), '고객 이름', SPENDING_VALUE_COLUMN, 'Top 10 Customers by Recent Total Spending')
+
+
+def render_top_10_chart(top_n, country, city, page):
+    """시각화 탭을 열 때 현재 지역 필터의 Top 10 차트를 그립니다. (UI 구성 시에는 그리지 않음)"""
+    country = None if country == ALL_REGIONS else country
+    city = None if city == ALL_REGIONS else city
+    return plot_top_10_spending(get_controller().get_top_customers_frame(min(10, int(top_n or TOP_N)), country, city))
 
 
-# 2. 메인 Gradio UI 로직
+# 2. 지역 필터 조회: 선택한 조건을 그대로 SQL 조회에 넘김 (조합별로 미리 계산해 두지 않음)
+def _city_choices(regions, country):
+    cities = sorted({city for region_country, city in regions if country in (None, ALL_REGIONS, region_country)})
+    return [ALL_REGIONS] + cities
+
+
+def filter_top_customers(top_n, country, city, page):
+    """필터 조건에 맞는 Top N 고객의 한 페이지와 조회 요약 문구를 반환합니다."""
+    top_n = int(top_n or TOP_N)
+    page = max(1, int(page or 1))
+    country = None if country == ALL_REGIONS else country
+    city = None if city == ALL_REGIONS else city
+
+    controller = get_controller()
+    total = controller.count_top_customers(top_n, country, city)
+    page_df = controller.get_top_customers_frame(top_n, country, city, page=page, page_size=PAGE_SIZE)
+    first = (page - 1) * PAGE_SIZE + 1
+    summary = f"조건에 맞는 고객 {total}명 중 {first}~{first + len(page_df) - 1}위" if len(page_df) else f"조건에 맞는 고객 {total}명 (표시할 행 없음)"
+    return page_df[DISPLAY_COLUMNS], summary
+
+
+# 3. 메인 Gradio UI 로직
 def run_dashboard():
+    import gradio as gr
     
-    # 컨트롤러에서 Top 100 데이터 로드
-    top_100_df = controller.get_top_100_for_gradio()
+    # 컨트롤러에서 Top 100 데이터 로드 (표시용 열 + 숫자 구매액 열)
+    controller = get_controller()
+    top_100_df = controller.get_top_customers_frame()
     db_status = controller.get_db_setup_status()
+    regions = controller.get_regions()
+    countries = [ALL_REGIONS] + sorted({country for country, _ in regions})
     
     # UI 구성
     with gr.Blocks(title="AdventureWorks Sales Dashboard (MVC)") as demo:
@@ -62,26 +102,44 @@ def run_dashboard():
             
             with gr.TabItem("💰 최근 1년 Top 100 고객"):
                 gr.Markdown("## 최근 1년간 구매액이 높은 Top 100 고객 목록")
+
+                # 지역 / N / 페이지 필터
+                with gr.Row():
+                    top_n_input = gr.Number(value=TOP_N, label="Top N", precision=0, minimum=1)
+                    country_input = gr.Dropdown(choices=countries, value=ALL_REGIONS, label="국가")
+                    city_input = gr.Dropdown(choices=_city_choices(regions, ALL_REGIONS), value=ALL_REGIONS, label="도시")
+                    page_input = gr.Number(value=1, label="페이지", precision=0, minimum=1)
+                summary = gr.Markdown()
                 
                 # Top 100 고객 테이블 (데이터프레임 컴포넌트)
-                gr.DataFrame(
-                    value=top_100_df,
-                    headers=['순위', '고객 키', '고객 이름', '총 구매액 (USD)', '도시', '국가'],
+                table = gr.DataFrame(
+                    value=top_100_df[DISPLAY_COLUMNS],
+                    headers=DISPLAY_COLUMNS,
                     row_count=10, 
                     col_count=(6, 'fixed'),
                     interactive=False
                 )
+
+                filter_inputs = [top_n_input, country_input, city_input, page_input]
+                # 국가를 바꾸면 도시 선택지를 좁히고 첫 페이지부터 다시 조회
+                country_input.change(
+                    lambda country: (gr.update(choices=_city_choices(regions, country), value=ALL_REGIONS), 1),
+                    inputs=country_input, outputs=[city_input, page_input]
+                )
+                for component in filter_inputs:
+                    component.change(filter_top_customers, inputs=filter_inputs, outputs=[table, summary])
+                demo.load(filter_top_customers, inputs=filter_inputs, outputs=[table, summary])
             
-            with gr.TabItem("📈 Top 10 시각화"):
+            with gr.TabItem("📈 Top 10 시각화") as chart_tab:
                 gr.Markdown("## Top 10 고객 구매액 시각화")
                 
                 if not top_100_df.empty:
-                    # value=에 파일 경로 (문자열)가 전달되도록 수정되었습니다.
-                    gr.Image(
-                        value=plot_top_10_spending(top_100_df),
+                    # 탭을 처음 열 때 렌더링 (value 에는 캐시된 파일 경로가 전달됨)
+                    chart = gr.Image(
                         label="Top 10 Customers Spending Graph",
                         interactive=False
                     )
+                    chart_tab.select(render_top_10_chart, inputs=filter_inputs, outputs=chart)
                 else:
                     gr.Markdown("데이터 로드에 실패하여 시각화를 표시할 수 없습니다.")
                     
@@ -1,47 +1,115 @@
 # main.py 파일 내용 (시각화 CSV 저장 기능 추가)
 
 from fastapi import FastAPI, HTTPException
+from pydantic import BaseModel
 from contextlib import asynccontextmanager
+from typing import List
+import asyncio
 import time
-import pandas as pd 
+from clv_index import CLVIndex
+from clv_store import CLVArtifact, CLVArtifactStore, source_fingerprint
 # clv_analysis.py에서 정의된 핵심 함수들을 불러옵니다.
-from clv_analysis import load_and_prepare_data, calculate_rfm_score, train_and_score_clv_model
+from clv_analysis import load_and_prepare_data, calculate_rfm_score, train_and_score_clv_model, save_clv_results, format_timings
 
 # 1. 전역 변수 초기화
-clv_df: pd.DataFrame = None
-clv_model = None
+# 고객 키 -> CLV 결과 조회 색인 (저장된 산출물을 메모리 매핑으로 열어 사용, 새 버전이 나오면 참조만 교체)
+clv_index: CLVIndex = None
+clv_artifact: CLVArtifact = None
+store = CLVArtifactStore()
+# 한 번에 조회할 수 있는 최대 고객 수
+MAX_BATCH_KEYS = 10000
+# 다른 워커가 새 산출물을 공개했는지 확인하는 간격 (초)
+ARTIFACT_POLL_INTERVAL = 30
+
+
+class CLVBatchRequest(BaseModel):
+    customer_keys: List[int]
+
+
+def _swap_artifact(artifact: CLVArtifact) -> None:
+    # 전역 참조 하나만 바꾸므로 요청은 이전 또는 새 색인 중 하나를 온전히 보게 됨
+    global clv_index, clv_artifact
+    clv_index = artifact.index
+    clv_artifact = artifact
+
+
+def _train_and_publish(fingerprint: str) -> CLVArtifact:
+    """(백그라운드 스레드) 데이터 로드 -> RFM -> CLV 학습 후 새 산출물로 저장합니다."""
+    timings = {}
+    # 1. 데이터 로드 및 전처리
+    full_df = load_and_prepare_data(timings=timings)
+    
+    # 2. RFM 및 CLV 점수 계산 및 모델 학습 (점수 계산은 고객을 나눠 프로세스 풀에서 수행)
+    # train_and_score_clv_model 함수에서 clv_model.pkl 파일이 생성됩니다.
+    rfm_df = calculate_rfm_score(full_df, timings=timings)
+    clv_df = train_and_score_clv_model(rfm_df, timings=timings)
+    
+    # 💡 시각화를 위해 최종 결과를 바이너리(.npz) 파일로 저장 (clv_analysis.load_clv_results 로 읽음) 💡
+    save_clv_results(clv_df)
+    
+    # 3. 모델 + 점수 배열을 버전 디렉토리에 저장하고 LATEST 교체
+    artifact = store.publish(clv_df, fingerprint)
+    print(f"⏱️ CLV 단계별 소요 시간: {format_timings(timings)}")
+    return artifact
+
+
+async def refresh_clv_artifact() -> None:
+    """원본 데이터 지문이 현재 산출물과 다를 때만 다시 학습하고, 끝나면 새 점수로 교체합니다."""
+    fingerprint = await asyncio.to_thread(source_fingerprint)
+    if clv_artifact is not None and clv_artifact.fingerprint == fingerprint:
+        print(f"✅ 원본 데이터가 바뀌지 않아 재학습을 건너뜁니다. ({clv_artifact.name})")
+        return
+    if not store.try_acquire_train_lock():
+        print("ℹ️ 다른 워커가 CLV 모델을 학습 중입니다. 완료되면 새 산출물을 불러옵니다.")
+        return
+
+    start_time = time.time()
+    try:
+        artifact = await asyncio.to_thread(_train_and_publish, fingerprint)
+        _swap_artifact(artifact)
+        print(f"✅ CLV 분석 결과 로딩 및 모델 학습 완료: {artifact.name} (소요 시간: {time.time() - start_time:.2f}초)")
+    except Exception as e:
+        # 오류 시 기존 산출물을 계속 사용하여 서버가 멈추지 않도록 합니다.
+        print(f"❌ 데이터 처리/분석 중 오류 발생: {e}")
+    finally:
+        store.release_train_lock()
+
+
+async def watch_clv_artifacts() -> None:
+    """다른 워커가 공개한 새 버전이 있으면 불러와 교체합니다."""
+    while True:
+        await asyncio.sleep(ARTIFACT_POLL_INTERVAL)
+        latest = store.latest_name()
+        if latest and (clv_artifact is None or latest != clv_artifact.name):
+            artifact = await asyncio.to_thread(store.load_latest)
+            if artifact is not None:
+                _swap_artifact(artifact)
+                print(f"🔄 새 CLV 산출물로 교체했습니다: {artifact.name}")
+
 
 # 2. 애플리케이션 시작/종료 이벤트 관리 (lifespan)
 @asynccontextmanager
 async def lifespan(app: FastAPI):
-    global clv_df, clv_model
     start_time = time.time()
-    print("--- FastAPI 서비스 시작: 데이터 로딩 및 분석 ---")
+    print("--- FastAPI 서비스 시작: 저장된 CLV 산출물 로딩 ---")
     
-    try:
-        # 1. 데이터 로드 및 전처리
-        full_df = load_and_prepare_data()
-        
-        # 2. RFM 및 CLV 점수 계산 및 모델 학습
-        # train_and_score_clv_model 함수에서 clv_model.pkl 파일이 생성됩니다.
-        rfm_df = calculate_rfm_score(full_df)
-        clv_df = train_and_score_clv_model(rfm_df)
-        
-        # 💡 시각화를 위해 최종 결과를 CSV 파일로 저장하는 코드 추가 💡
-        clv_df.to_csv('clv_analysis_results.csv', index=False)
-        
-        end_time = time.time()
-        print(f"✅ CLV 분석 결과 로딩 및 모델 학습 완료. (소요 시간: {end_time - start_time:.2f}초)")
-        
-    except Exception as e:
-        print(f"❌ 데이터 처리/분석 중 오류 발생: {e}")
-        # 오류 시 빈 DataFrame을 할당하여 서버가 멈추지 않도록 합니다.
-        clv_df = pd.DataFrame(columns=['CustomerKey', 'Predicted_CLV', 'CLV_Score']) 
+    # 1. 마지막으로 저장된 산출물을 바로 사용 (학습 없이 메모리 매핑만 하므로 즉시 응답 가능)
+    artifact = store.load_latest()
+    if artifact is not None:
+        _swap_artifact(artifact)
+        print(f"🔎 CLV 산출물 {artifact.name} 로딩 완료: 고객 {len(clv_index)}명 (소요 시간: {(time.time() - start_time) * 1000:.1f}ms)")
+    else:
+        print("⚠️ 저장된 CLV 산출물이 없습니다. 백그라운드 학습이 끝날 때까지 조회 요청은 503 을 반환합니다.")
+    
+    # 2. 원본 데이터가 바뀌었으면 백그라운드에서 재학습, 다른 워커의 새 버전도 주기적으로 확인
+    tasks = [asyncio.create_task(refresh_clv_artifact()), asyncio.create_task(watch_clv_artifacts())]
     
     # 서버 실행
     yield
     
     # 애플리케이션 종료 시 정리 작업 (필요시)
+    for task in tasks:
+        task.cancel()
     print("--- FastAPI 서비스 종료 ---")
 
 # 3. FastAPI 인스턴스 생성
@@ -50,25 +118,29 @@ app = FastAPI(lifespan=lifespan)
 # 4. API 엔드포인트 정의
 @app.get("/")
 def read_root():
-    return {"message": "CLV Prediction Service is running. Use /clv_score/{customer_key} to get CLV."}
+    return {"message": "CLV Prediction Service is running. Use /clv_score/{customer_key} to get CLV, or POST /clv_scores with {\"customer_keys\": [...]} for a batch."}
 
 @app.get("/clv_score/{customer_key}")
 async def get_clv_score(customer_key: int):
-    # 전역 변수인 clv_df에서 고객 키를 기준으로 데이터 조회
-    if clv_df is None or clv_df.empty:
+    # 시작 시 만든 색인으로 고객 키를 상수 시간에 조회
+    if clv_index is None or len(clv_index) == 0:
         raise HTTPException(status_code=503, detail="CLV data is not loaded or processing failed.")
     
-    # CustomerKey는 정수형이므로, 일치하는 행을 찾습니다.
-    result = clv_df[clv_df['CustomerKey'] == customer_key]
+    customer_data = clv_index.get(customer_key)
     
-    if result.empty:
+    if customer_data is None:
         raise HTTPException(status_code=404, detail=f"CustomerKey {customer_key} not found.")
     
-    # 결과 포맷팅 (첫 번째 행 사용)
-    customer_data = result.iloc[0]
+    return customer_data
+
+
+@app.post("/clv_scores")
+async def get_clv_scores(request: CLVBatchRequest):
+    # 여러 고객을 한 번에 조회 (요청 순서 유지, 없는 고객 키는 not_found 로 따로 반환)
+    if clv_index is None or len(clv_index) == 0:
+        raise HTTPException(status_code=503, detail="CLV data is not loaded or processing failed.")
+    if len(request.customer_keys) > MAX_BATCH_KEYS:
+        raise HTTPException(status_code=413, detail=f"A batch may contain at most {MAX_BATCH_KEYS} customer keys.")
     
-    return {
-        "CustomerKey": int(customer_data['CustomerKey']),
-        "Predicted_CLV_USD": round(float(customer_data['Predicted_CLV']), 2),
-        "CLV_Score": int(customer_data['CLV_Score'])
-    }
\ No newline at end of file
+    results, not_found = clv_index.get_many(request.customer_keys)
+    return {"results": results, "not_found": not_found}
@@ -0,0 +1,156 @@
+# startup_profile.py (gradio_app 시작 비용 측정: -X importtime 보고서 + 컨트롤러 준비 시간 -> JSON, CI 기준 검사)
+#
+# 사용 예:
+#   python startup_profile.py                                  # startup_profile.json 저장, 상위 import 20개 출력
+#   python startup_profile.py --max-startup-seconds 1.0        # 기준을 넘거나 금지된 모듈이 import 되면 종료 코드 1
+#
+# 측정은 매번 새 인터프리터(subprocess)에서 하므로 이미 import 된 모듈의 영향을 받지 않습니다.
+# 워커 기동 시간은 DB가 이미 만들어져 있는 상태(캐시 확인만 하는 경로)를 가정합니다.
+
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+from typing import List, Dict, Any, Optional
+
+APP_DIR = os.path.dirname(os.path.abspath(__file__))
+TARGET_MODULE = 'gradio_app'
+# 모듈 import 만으로는 불러오지 않아야 하는 무거운 라이브러리 (처음 사용할 때 import)
+DEFAULT_FORBIDDEN = ['gradio', 'matplotlib', 'seaborn']
+DEFAULT_MAX_STARTUP_SECONDS = 1.0
+
+
+def parse_importtime(stderr: str) -> List[Dict[str, Any]]:
+    """'-X importtime' 출력(import time: self [us] | cumulative | imported package)을 모듈별 dict 목록으로 변환합니다."""
+    entries = []
+    for line in stderr.splitlines():
+        if not line.startswith('import time:') or 'imported package' in line:
+            continue
+        self_us, cumulative_us, name = line[len('import time:'):].split('|', 2)
+        entries.append({
+            'module': name.strip(),
+            'depth': (len(name) - len(name.lstrip()) - 1) // 2,
+            'self_us': int(self_us),
+            'cumulative_us': int(cumulative_us),
+        })
+    return entries
+
+
+def _run_python(code: str, importtime: bool = False) -> subprocess.CompletedProcess:
+    args = [sys.executable] + (['-X', 'importtime'] if importtime else []) + ['-c', code]
+    return subprocess.run(args, cwd=APP_DIR, capture_output=True, text=True)
+
+
+def _error(result: subprocess.CompletedProcess) -> Optional[Dict[str, Any]]:
+    """측정 프로세스가 실패했으면 종료 코드와 stderr(importtime 줄 제외), 성공이면 None."""
+    if result.returncode == 0:
+        return None
+    stderr = "\n".join(line for line in result.stderr.splitlines() if not line.startswith('import time:'))
+    return {'returncode': result.returncode, 'stderr': stderr}
+
+
+def profile_import() -> Dict[str, Any]:
+    """대상 모듈 import 의 모듈별 시간과 import 직후 로드된 금지 모듈 목록을 측정합니다."""
+    code = f"import sys, json, {TARGET_MODULE}; print(json.dumps(sorted(sys.modules)))"
+    start = time.perf_counter()
+    result = _run_python(code, importtime=True)
+    wall = time.perf_counter() - start
+    entries = parse_importtime(result.stderr)
+    target = next((entry for entry in entries if entry['module'] == TARGET_MODULE), None)
+    error = _error(result)
+    return {
+        'wall_seconds': round(wall, 6),
+        'import_seconds': round(target['cumulative_us'] / 1e6, 6) if target and not error else None,
+        'loaded_modules': [] if error else json.loads(result.stdout.strip().splitlines()[-1]),
+        'modules': entries,
+        'error': error,
+    }
+
+
+def profile_startup() -> Dict[str, Any]:
+    """새 프로세스에서 import + get_controller() 까지 걸리는 시간(워커 기동 시간)을 측정합니다."""
+    code = (
+        "import time, json; start = time.perf_counter()\n"
+        f"import {TARGET_MODULE}\n"
+        "imported = time.perf_counter()\n"
+        f"status = {TARGET_MODULE}.get_controller().get_db_setup_status()\n"
+        "ready = time.perf_counter()\n"
+        "print(json.dumps({'import': imported - start, 'controller': ready - imported, 'status': status}, ensure_ascii=False))"
+    )
+    start = time.perf_counter()
+    result = _run_python(code)
+    wall = time.perf_counter() - start
+    error = _error(result)
+    if error:
+        return {'wall_seconds': round(wall, 6), 'error': error}
+    measured = json.loads(result.stdout.strip().splitlines()[-1])
+    return {
+        'wall_seconds': round(wall, 6),
+        'import_seconds': round(measured['import'], 6),
+        'controller_seconds': round(measured['controller'], 6),
+        'db_status': measured['status'],
+        'error': None,
+    }
+
+
+def check_report(report: Dict[str, Any], max_startup_seconds: Optional[float], forbidden: List[str]) -> List[str]:
+    """CI 기준을 넘은 항목의 설명 목록을 반환합니다. (비어 있으면 통과)"""
+    failures = []
+    for stage in ('import', 'startup'):
+        error = (report.get(stage) or {}).get('error')
+        if error:
+            failures.append(f"{stage} 측정 프로세스가 실패했습니다. (종료 코드 {error['returncode']})")
+    loaded = set(report['import']['loaded_modules'])
+    for module in forbidden:
+        if module in loaded:
+            failures.append(f"'{TARGET_MODULE}' import 만으로 '{module}' 이(가) 로드되었습니다.")
+    startup = report.get('startup')
+    if max_startup_seconds is not None and startup and not startup['error'] and startup['wall_seconds'] > max_startup_seconds:
+        failures.append(f"워커 기동 시간 {startup['wall_seconds']:.3f}s 가 기준 {max_startup_seconds:.3f}s 를 넘었습니다.")
+    return failures
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="gradio_app 시작 비용 측정")
+    parser.add_argument("--output", default="startup_profile.json")
+    parser.add_argument("--top", type=int, default=20, help="출력할 import 시간 상위 모듈 수")
+    parser.add_argument("--max-startup-seconds", type=float, default=DEFAULT_MAX_STARTUP_SECONDS)
+    parser.add_argument("--forbid", nargs="*", default=DEFAULT_FORBIDDEN, help="import 시 로드되면 안 되는 모듈")
+    parser.add_argument("--skip-startup", action="store_true", help="get_controller() 측정 생략 (DB 없이 import 만 확인)")
+    args = parser.parse_args(argv)
+
+    import_profile = profile_import()
+    report = {
+        "generated_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "python": platform.python_version(),
+        "import": import_profile,
+        # import 가 실패하면 기동 측정도 같은 오류로 실패하므로 생략
+        "startup": None if args.skip_startup or import_profile['error'] else profile_startup(),
+    }
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+
+    import_seconds = "실패" if import_profile['error'] else f"{import_profile['import_seconds']}s"
+    print(f"{TARGET_MODULE} import: {import_seconds} (프로세스 {import_profile['wall_seconds']:.3f}s)")
+    for entry in sorted(import_profile['modules'], key=lambda e: e['cumulative_us'], reverse=True)[:args.top]:
+        print(f"  {entry['cumulative_us'] / 1000:>9.1f} ms  {'  ' * entry['depth']}{entry['module']}")
+    startup = report['startup']
+    if startup and not startup['error']:
+        print(f"워커 기동: {startup['wall_seconds']:.3f}s (import {startup['import_seconds']:.3f}s + 컨트롤러 {startup['controller_seconds']:.3f}s) | {startup['db_status']}")
+    print(f"보고서 저장: {args.output}")
+
+    failures = check_report(report, args.max_startup_seconds, args.forbid)
+    for failure in failures:
+        print(f"❌ {failure}")
+    for stage in ('import', 'startup'):
+        error = (report.get(stage) or {}).get('error')
+        if error and error['stderr']:
+            print(f"--- {stage} stderr ---\n{error['stderr']}")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
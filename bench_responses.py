@@ -0,0 +1,165 @@
+# bench_responses.py (응답 직렬화 마이크로 벤치마크: FastAPI 기본 경로 vs fast_response, 초당 요청 수)
+#
+# 사용 예:
+#   python bench_responses.py                     # 시나리오마다 2000회, 결과 표 출력
+#   python bench_responses.py --requests 10000 --output bench_responses.json
+#
+# 네트워크/서버 없이 ASGI 앱을 같은 프로세스에서 직접 호출하므로 라우팅 + 검증 + 직렬화 비용만 측정합니다.
+# 같은 핸들러를 기본 경로(dict/모델 반환, response_model 재검증)와 FastJSONResponse 반환 두 가지로 만들고,
+# 두 응답 본문이 같은 JSON 인지 먼저 확인한 뒤 시간을 잽니다.
+
+import argparse
+import asyncio
+import json
+import time
+import uuid
+from datetime import datetime, date, time as dt_time, timedelta
+from typing import List, Dict, Any, Optional, Tuple
+
+from fastapi import FastAPI
+from pydantic import BaseModel
+
+from fast_response import FastJSONResponse
+
+DEFAULT_REQUESTS = 2000
+LIST_SIZE = 100
+
+
+class Item(BaseModel):
+    # homework/main12.py 와 같은 형식
+    id: uuid.UUID
+    timestamp: datetime
+    date: date
+    time: dt_time
+    duration: timedelta
+
+
+def _sample_item(i: int = 0) -> Dict[str, Any]:
+    return {
+        "id": str(uuid.UUID(int=i + 1)),
+        "timestamp": "2024-05-01T12:30:45.123456",
+        "date": "2024-05-01",
+        "time": "12:30:45",
+        "duration": 3600.5,
+    }
+
+
+ITEMS = [Item(**_sample_item(i)) for i in range(LIST_SIZE)]
+
+
+def build_apps() -> Tuple[FastAPI, FastAPI]:
+    """(기본 경로 앱, fast_response 앱) - 라우트는 같고 반환 방식만 다름."""
+    baseline = FastAPI()
+
+    @baseline.post("/items/")
+    async def create_item(item: Item):
+        return item
+
+    @baseline.get("/items/", response_model=List[Item])
+    async def list_items():
+        return ITEMS
+
+    @baseline.get("/items/raw")
+    async def list_items_raw():
+        return ITEMS
+
+    fast = FastAPI(default_response_class=FastJSONResponse)
+
+    @fast.post("/items/")
+    async def create_item_fast(item: Item):
+        return FastJSONResponse(item)
+
+    @fast.get("/items/", response_model=List[Item])
+    async def list_items_fast():
+        return FastJSONResponse(ITEMS)
+
+    @fast.get("/items/raw")
+    async def list_items_raw_fast():
+        return FastJSONResponse(ITEMS)
+
+    return baseline, fast
+
+
+SCENARIOS = [
+    # (이름, 메서드, 경로, 요청 본문)
+    ("POST /items/ (UUID/datetime/timedelta 모델 1개)", "POST", "/items/", json.dumps(_sample_item()).encode()),
+    (f"GET /items/ (모델 {LIST_SIZE}개, response_model)", "GET", "/items/", b""),
+    # homework 예제처럼 response_model 없이 모델을 반환 -> 기본 경로는 jsonable_encoder
+    (f"GET /items/raw (모델 {LIST_SIZE}개, response_model 없음)", "GET", "/items/raw", b""),
+]
+
+
+async def _request(app: FastAPI, method: str, path: str, body: bytes) -> Tuple[int, bytes]:
+    # 최소한의 ASGI HTTP 요청 한 번
+    scope = {
+        "type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1",
+        "method": method, "scheme": "http", "path": path, "raw_path": path.encode(), "query_string": b"",
+        "root_path": "", "client": ("127.0.0.1", 50000), "server": ("127.0.0.1", 8000),
+        "headers": [(b"host", b"bench"), (b"content-type", b"application/json"), (b"content-length", str(len(body)).encode())],
+    }
+    sent = False
+    status = 0
+    chunks = []
+
+    async def receive():
+        nonlocal sent
+        if sent:
+            return {"type": "http.disconnect"}
+        sent = True
+        return {"type": "http.request", "body": body, "more_body": False}
+
+    async def send(message):
+        nonlocal status
+        if message["type"] == "http.response.start":
+            status = message["status"]
+        elif message["type"] == "http.response.body":
+            chunks.append(message.get("body", b""))
+
+    await app(scope, receive, send)
+    return status, b"".join(chunks)
+
+
+async def _measure(app: FastAPI, method: str, path: str, body: bytes, requests: int) -> float:
+    for _ in range(min(100, requests)):
+        await _request(app, method, path, body)
+    start = time.perf_counter()
+    for _ in range(requests):
+        await _request(app, method, path, body)
+    return requests / (time.perf_counter() - start)
+
+
+async def run_benchmark(requests: int = DEFAULT_REQUESTS) -> List[Dict[str, Any]]:
+    baseline, fast = build_apps()
+    results = []
+    for name, method, path, body in SCENARIOS:
+        base_status, base_body = await _request(baseline, method, path, body)
+        fast_status, fast_body = await _request(fast, method, path, body)
+        if (base_status, json.loads(base_body)) != (fast_status, json.loads(fast_body)):
+            raise AssertionError(f"{name}: 두 경로의 응답이 다릅니다.\n  기본: {base_body[:200]!r}\n  fast: {fast_body[:200]!r}")
+        base_rps = await _measure(baseline, method, path, body, requests)
+        fast_rps = await _measure(fast, method, path, body, requests)
+        results.append({
+            "scenario": name,
+            "baseline_rps": round(base_rps, 1),
+            "fast_rps": round(fast_rps, 1),
+            "speedup": round(fast_rps / base_rps, 2),
+        })
+    return results
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="FastAPI 기본 JSON 응답 vs fast_response 초당 요청 수 비교")
+    parser.add_argument("--requests", type=int, default=DEFAULT_REQUESTS, help="시나리오/앱마다 보낼 요청 수")
+    parser.add_argument("--output", help="결과를 저장할 JSON 파일")
+    args = parser.parse_args(argv)
+
+    results = asyncio.run(run_benchmark(args.requests))
+    for result in results:
+        print(f"{result['scenario']}\n  기본 {result['baseline_rps']:>10,.1f} req/s | fast {result['fast_rps']:>10,.1f} req/s | x{result['speedup']}")
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(results, f, ensure_ascii=False, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+# fast_response.py (FastAPI 공용 JSON 응답: orjson 직렬화 + jsonable_encoder / 응답 재검증 건너뛰기)
+#
+#   app = FastAPI(default_response_class=FastJSONResponse)
+#
+#   @app.post("/items/")
+#   async def create_item(item: Item):
+#       return FastJSONResponse(item)      # 이미 검증된 모델을 그대로 직렬화
+#
+# 핸들러가 dict/모델을 반환하면 FastAPI 는 jsonable_encoder 로 값 전체를 파이썬에서 한 번 더 순회해 새 dict 를 만들고,
+# response_model 이 있으면 다시 검증한 뒤 json.dumps 합니다.
+# Response 객체를 직접 반환하면 이 단계를 모두 건너뛰므로, 요청 모델처럼 이미 검증된(신뢰할 수 있는) 값에만 사용합니다.
+#
+# 출력 형식은 기본 경로와 같습니다. (UUID/datetime/date/time 은 문자열, 모델 안의 timedelta 는 pydantic v2 에서 ISO 8601 기간 / 그 밖에는 초)
+# - 모델이 없는 dict/list: orjson
+# - 모델이 들어 있으면 (pydantic v2): pydantic_core.to_json 으로 모델 직렬화기(Rust)가 바로 JSON 을 씀 (모델마다 dict 를 만들지 않음)
+# homework 예제도 이 모듈을 씁니다. (저장소 최상위에서 uvicorn homework.main12:app, homework 안에서는 homework/fast_response.py 를 거쳐 uvicorn main12:app)
+
+from datetime import timedelta
+from decimal import Decimal
+from typing import Any
+
+import orjson
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel
+
+PYDANTIC_V2 = hasattr(BaseModel, "model_dump")
+if PYDANTIC_V2:
+    import pydantic_core
+# dict 의 int 키 허용 (json.dumps 처럼 문자열로)
+ORJSON_OPTIONS = orjson.OPT_NON_STR_KEYS
+
+
+class _ModelFound(TypeError):
+    """orjson 직렬화 중 pydantic v2 모델을 만남 -> pydantic_core 로 다시 직렬화."""
+
+
+def _default(obj: Any) -> Any:
+    # orjson 이 직접 처리하지 못하는 값만 여기로 옴 (UUID/datetime/date/time/dataclass/Enum 은 orjson 이 처리)
+    if isinstance(obj, BaseModel):
+        if PYDANTIC_V2:
+            raise _ModelFound()
+        return obj.dict(by_alias=True)
+    if isinstance(obj, timedelta):
+        return obj.total_seconds()
+    if isinstance(obj, (set, frozenset)):
+        return list(obj)
+    if isinstance(obj, Decimal):
+        return float(obj)
+    raise TypeError(f"JSON 으로 변환할 수 없는 형식입니다: {type(obj).__name__}")
+
+
+def _dumps_models(content: Any) -> bytes:
+    # 모델 밖의 timedelta 는 jsonable_encoder 처럼 초 단위 (모델 필드는 모델 설정을 따름)
+    return pydantic_core.to_json(content, by_alias=True, timedelta_mode="float")
+
+
+def dumps(content: Any) -> bytes:
+    """응답 본문 bytes. pydantic v2 모델이 들어 있으면 pydantic_core 로, 아니면 orjson 으로 직렬화합니다."""
+    if PYDANTIC_V2:
+        if isinstance(content, BaseModel) or (isinstance(content, (list, tuple)) and content and isinstance(content[0], BaseModel)):
+            return _dumps_models(content)
+        try:
+            return orjson.dumps(content, default=_default, option=ORJSON_OPTIONS)
+        except orjson.JSONEncodeError:
+            # 중첩된 모델은 orjson 이 처음 만난 곳에서 멈추므로 전체를 다시 직렬화 (직렬화할 수 없는 값이면 여기서 다시 오류)
+            return _dumps_models(content)
+    return orjson.dumps(content, default=_default, option=ORJSON_OPTIONS)
+
+
+class FastJSONResponse(JSONResponse):
+    """orjson 으로 직렬화하는 JSON 응답. 핸들러에서 직접 반환하면 jsonable_encoder 와 response_model 검증을 건너뜁니다."""
+
+    media_type = "application/json"
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
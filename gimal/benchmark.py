@@ -0,0 +1,212 @@
+# benchmark.py (스케줄러 성능 측정: 합성 과목 CSV 생성 -> 단계별 시간/메모리/배정률 -> JSON 보고서)
+#
+# 사용 예:
+#   python benchmark.py                                   # 10^2 ~ 10^5 규모 측정, 이 파일 옆 bench_report.json 에 저장
+#   python benchmark.py --sizes 100 1000 --no-memory      # 작은 규모만 빠르게 측정
+#   python benchmark.py --output new.json --compare old.json   # 이전 보고서와 비교 출력
+#
+# 정규 강의실 + R_EXTRA, 배정 단위(분반)마다 주당 쓸 수 있는 시간이 정해져 있으므로 규모가 커지면 대부분 미배정이 됩니다.
+# 배정 시간은 배정률과 함께 보아야 하므로 규모마다 필요 시간 / 강의실 / 배정 단위 용량과 배정률을 같이 기록합니다.
+
+import argparse
+import copy
+import csv
+import json
+import os
+import platform
+import random
+import tempfile
+import time
+import tracemalloc
+from typing import List, Dict, Any, Callable, Optional, Tuple
+
+from scheduler import (
+    PROFESSOR_PREF_KEYS, DAYS, VALID_SW_DEPTS, DEFAULT_CONTEXT,
+    load_courses, schedule_courses, generate_full_html_schedule,
+)
+from ingest import iter_courses_from_file
+
+DEFAULT_SIZES = [100, 1000, 10000, 100000]
+# 실행한 위치와 관계없이 이 스크립트 옆에 저장
+DEFAULT_OUTPUT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "bench_report.json")
+# 배정률이 이보다 낮으면 배정 시간은 대부분 실패한 배치 시도를 잰 것이므로 경고
+LOW_ASSIGNED_RATE = 0.5
+CSV_HEADERS = ["과정", "개설학과", "교과목코드", "교과목명", "개설학년", "영역구분", "수강인원", "강좌대표교수", "강좌담당교수",
+               "수업주수", "교과목학점", "강의유형구분"] + PROFESSOR_PREF_KEYS
+
+
+# =========================================================================
+# 🧪 합성 과목 CSV 생성
+# =========================================================================
+def generate_courses_csv(path: str, num_sections: int, professor_overlap: float = 0.8, preference_density: float = 0.5,
+                         capstone_ratio: float = 0.05, seed: int = 0) -> None:
+    """
+    num_sections 개 분반의 과목 CSV 를 생성합니다.
+    - professor_overlap: 0 이면 분반마다 다른 교수, 1 에 가까울수록 적은 교수가 많은 분반을 담당
+    - preference_density: 1~5순위 선호 요일 칸이 채워질 확률
+    - capstone_ratio: '캡스톤'으로 시작하는 과목 비율 (3과목 연속 금지 예외)
+    """
+    rng = random.Random(seed)
+    num_professors = max(1, round(num_sections * (1 - professor_overlap)))
+    depts = VALID_SW_DEPTS[:2] + ["빅데이터과"]
+
+    with open(path, "w", encoding="utf-8", newline="") as f:
+        writer = csv.DictWriter(f, fieldnames=CSV_HEADERS)
+        writer.writeheader()
+        for i in range(num_sections):
+            dept = rng.choice(depts)
+            grade = rng.randint(1, 3) if dept == "빅데이터과" else rng.randint(1, 4)
+            name = f"캡스톤디자인{i}" if rng.random() < capstone_ratio else f"과목{i // 2}"  # 같은 이름 두 개씩 -> A/B 분반
+            professor = f"교수{rng.randrange(num_professors)}"
+            row = {
+                "과정": "전공심화", "개설학과": dept, "교과목코드": f"B{i:06d}", "교과목명": name, "개설학년": grade,
+                "영역구분": "전공", "수강인원": rng.randint(10, 40), "강좌대표교수": professor, "강좌담당교수": professor,
+                "수업주수": 15, "교과목학점": rng.randint(1, 4), "강의유형구분": "실습",
+            }
+            for key in PROFESSOR_PREF_KEYS:
+                row[key] = rng.choice(DAYS) if rng.random() < preference_density else ""
+            writer.writerow(row)
+
+
+# =========================================================================
+# ⏱️ 측정 도구
+# =========================================================================
+def _timed(func: Callable[[], Any]) -> Tuple[Any, float]:
+    start = time.perf_counter()
+    result = func()
+    return result, time.perf_counter() - start
+
+
+def _peak_memory(func: Callable[[], Any]) -> int:
+    tracemalloc.start()
+    try:
+        func()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return peak
+
+
+def bench_size(csv_path: str, num_sections: int, seed: int, measure_memory: bool) -> Dict[str, Any]:
+    """한 규모에 대해 load / stream_load / schedule / render 단계를 각각 측정합니다."""
+    courses, load_sec = _timed(lambda: load_courses(csv_path))
+    _, stream_sec = _timed(lambda: list(iter_courses_from_file(csv_path)))
+    (schedule, unassigned), schedule_sec = _timed(lambda: schedule_courses(copy.copy(courses), seed=seed))
+    _, render_sec = _timed(lambda: generate_full_html_schedule(schedule, unassigned))
+
+    extra_hours = sum(1 for (_, _, room) in schedule if room == "R_EXTRA")
+    total_hours = len(schedule)
+    assigned_rate = round(1 - len(unassigned) / len(courses), 4) if courses else 1.0
+    week_hours = len(DEFAULT_CONTEXT.days) * DEFAULT_CONTEXT.num_hours
+    stages = {
+        "load_courses": {"seconds": round(load_sec, 6)},
+        "stream_ingest": {"seconds": round(stream_sec, 6)},
+        "schedule_courses": {"seconds": round(schedule_sec, 6), "assigned_rate": assigned_rate},
+        "generate_full_html_schedule": {"seconds": round(render_sec, 6)},
+    }
+
+    if measure_memory:
+        # tracemalloc 는 실행을 크게 느리게 하므로 시간 측정과 분리하여 한 번 더 실행
+        stages["load_courses"]["peak_bytes"] = _peak_memory(lambda: load_courses(csv_path))
+        stages["stream_ingest"]["peak_bytes"] = _peak_memory(lambda: list(iter_courses_from_file(csv_path)))
+        stages["schedule_courses"]["peak_bytes"] = _peak_memory(lambda: schedule_courses(copy.copy(courses), seed=seed))
+        stages["generate_full_html_schedule"]["peak_bytes"] = _peak_memory(lambda: generate_full_html_schedule(schedule, unassigned))
+
+    return {
+        "sections": num_sections,
+        "courses_loaded": len(courses),
+        "csv_bytes": os.path.getsize(csv_path),
+        "stages": stages,
+        # 주당 필요 시간과 용량: 강의실 (정규 + R_EXTRA), 배정 단위 (단위마다 같은 시간에 한 과목)
+        "required_hours": sum(course["필요시간"] for course in courses),
+        "room_capacity_hours": len(DEFAULT_CONTEXT.all_rooms) * week_hours,
+        "unit_capacity_hours": len(DEFAULT_CONTEXT.all_classes) * week_hours,
+        "assigned_rate": assigned_rate,
+        "unassigned": len(unassigned),
+        "unassigned_rate": round(len(unassigned) / len(courses), 4) if courses else 0.0,
+        "r_extra_hours": extra_hours,
+        "r_extra_rate": round(extra_hours / total_hours, 4) if total_hours else 0.0,
+    }
+
+
+def run_benchmark(sizes: List[int], professor_overlap: float, preference_density: float, capstone_ratio: float,
+                  seed: int, measure_memory: bool = True) -> Dict[str, Any]:
+    results = []
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        for num_sections in sizes:
+            csv_path = os.path.join(tmp_dir, f"courses_{num_sections}.csv")
+            generate_courses_csv(csv_path, num_sections, professor_overlap, preference_density, capstone_ratio, seed)
+            result = bench_size(csv_path, num_sections, seed, measure_memory)
+            results.append(result)
+            stage_times = ", ".join(f"{name} {stage['seconds']:.3f}s" + (f" (배정 {stage['assigned_rate']:.1%})" if "assigned_rate" in stage else "")
+                                    for name, stage in result["stages"].items())
+            print(f"[{num_sections:>6}] {stage_times} | 미배정 {result['unassigned_rate']:.1%} | R_EXTRA {result['r_extra_rate']:.1%}")
+            if result["assigned_rate"] < LOW_ASSIGNED_RATE:
+                print(f"         ⚠️ 필요 {result['required_hours']}시간 > 용량 (강의실 {result['room_capacity_hours']}, "
+                      f"배정 단위 {result['unit_capacity_hours']}시간): 배정 시간은 대부분 실패한 배치 시도입니다.")
+
+    return {
+        "generated_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "params": {
+            "professor_overlap": professor_overlap,
+            "preference_density": preference_density,
+            "capstone_ratio": capstone_ratio,
+            "seed": seed,
+        },
+        "results": results,
+    }
+
+
+def compare_reports(old: Dict[str, Any], new: Dict[str, Any]) -> List[str]:
+    """두 보고서에서 같은 규모의 단계별 시간/메모리 변화율을 비교한 줄 목록을 반환합니다."""
+    lines = []
+    old_by_size = {result["sections"]: result for result in old.get("results", [])}
+    for result in new["results"]:
+        previous = old_by_size.get(result["sections"])
+        if previous is None:
+            continue
+        for name, stage in result["stages"].items():
+            before = previous["stages"].get(name)
+            if not before:
+                continue
+            parts = []
+            for metric in ("seconds", "peak_bytes"):
+                if metric in stage and before.get(metric):
+                    change = (stage[metric] - before[metric]) / before[metric]
+                    parts.append(f"{metric} {before[metric]} -> {stage[metric]} ({change:+.1%})")
+            if parts:
+                lines.append(f"[{result['sections']:>6}] {name}: " + ", ".join(parts))
+        lines.append(f"[{result['sections']:>6}] assigned_rate {previous.get('assigned_rate')} -> {result['assigned_rate']}, "
+                     f"unassigned_rate {previous['unassigned_rate']} -> {result['unassigned_rate']}, "
+                     f"r_extra_rate {previous['r_extra_rate']} -> {result['r_extra_rate']}")
+    return lines
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="강의실 배정 스케줄러 벤치마크")
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES, help="분반 수 목록 (예: 100 1000 10000 100000)")
+    parser.add_argument("--professor-overlap", type=float, default=0.8)
+    parser.add_argument("--preference-density", type=float, default=0.5)
+    parser.add_argument("--capstone-ratio", type=float, default=0.05)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--no-memory", action="store_true", help="tracemalloc 피크 메모리 측정 생략")
+    parser.add_argument("--output", default=DEFAULT_OUTPUT)
+    parser.add_argument("--compare", help="비교할 이전 보고서 JSON 경로")
+    args = parser.parse_args(argv)
+
+    report = run_benchmark(args.sizes, args.professor_overlap, args.preference_density, args.capstone_ratio,
+                           args.seed, measure_memory=not args.no_memory)
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+    print(f"보고서 저장: {args.output}")
+
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            old_report = json.load(f)
+        print("\n".join(compare_reports(old_report, report)))
+
+
+if __name__ == "__main__":
+    main()
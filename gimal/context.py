@@ -0,0 +1,139 @@
+# context.py (캠퍼스별 배정 설정: 설정 파일 -> 검증 -> 정수 ID/조회표를 한 번만 계산한 불변 객체)
+#
+# 설정 파일 예시 (campuses/example.json):
+#   {
+#     "name": "example",
+#     "rooms": ["A101", "A102"], "extra_room": "R_EXTRA",
+#     "start_hour": 9, "end_hour": 21,
+#     "days": ["월", "화", "수", "목", "금"],
+#     "sw_classes": ["SW-1A", "SW-1B", "SW-2"], "bd_classes": ["BD-1"],
+#     "sw_departments": ["소프트웨어융합과"], "bd_departments": ["빅데이터과"]
+#   }
+
+import hashlib
+import json
+import re
+from dataclasses import dataclass, field
+from typing import Dict, Tuple, Any, FrozenSet
+
+# 렌더링/분반 배정이 학년 번호와 A/B 분반 표기를 사용하므로 배정 단위 이름 형식을 고정
+_SW_UNIT_PATTERN = re.compile(r"^SW-\d[AB]?$")
+_BD_UNIT_PATTERN = re.compile(r"^BD-\d$")
+
+_CONFIG_KEYS = ["name", "rooms", "extra_room", "start_hour", "end_hour", "days",
+                "sw_classes", "bd_classes", "sw_departments", "bd_departments"]
+
+
+def _check_unique(label: str, values: Tuple[str, ...]) -> None:
+    if not values:
+        raise ValueError(f"설정 오류: {label} 목록이 비어 있습니다.")
+    duplicates = sorted({value for value in values if values.count(value) > 1})
+    if duplicates:
+        raise ValueError(f"설정 오류: {label} 에 중복된 값이 있습니다. -> {', '.join(duplicates)}")
+
+
+# =========================================================================
+# 🏫 배정 설정 (SchedulingContext)
+#   - 강의실 / 시간대 / 요일 / 배정 단위 / 학과 목록을 한 객체에 묶어 함수 인자로 전달
+#   - 생성 후에는 바뀌지 않으므로 여러 캠퍼스 요청이 동시에 같은 객체를 공유해도 안전
+#   - 강의실 / 요일 / 배정 단위의 정수 ID 와 시간 범위, 전체 비트마스크를 미리 계산
+# =========================================================================
+
+@dataclass(frozen=True)
+class SchedulingContext:
+    """한 캠퍼스의 배정 설정입니다. rooms 는 정규 강의실, extra_room 은 최후의 수단으로 쓰는 추가 강의실입니다."""
+
+    name: str
+    rooms: Tuple[str, ...]
+    extra_room: str
+    start_hour: int
+    end_hour: int
+    days: Tuple[str, ...]
+    sw_classes: Tuple[str, ...]
+    bd_classes: Tuple[str, ...]
+    sw_departments: FrozenSet[str]
+    bd_departments: FrozenSet[str]
+
+    # 아래는 생성 시 한 번만 계산하는 파생 값
+    all_rooms: Tuple[str, ...] = field(init=False)
+    all_classes: Tuple[str, ...] = field(init=False)
+    hours: Tuple[int, ...] = field(init=False)
+    num_hours: int = field(init=False)
+    full_mask: int = field(init=False)
+    room_ids: Dict[str, int] = field(init=False, compare=False)
+    day_ids: Dict[str, int] = field(init=False, compare=False)
+    unit_ids: Dict[str, int] = field(init=False, compare=False)
+    day_map: Dict[str, int] = field(init=False, compare=False)
+
+    def __post_init__(self):
+        # 목록 인자를 튜플/frozenset 으로 고정 (리스트로 넘겨도 이후 수정 불가)
+        for key in ("rooms", "days", "sw_classes", "bd_classes"):
+            object.__setattr__(self, key, tuple(str(value) for value in getattr(self, key)))
+        for key in ("sw_departments", "bd_departments"):
+            object.__setattr__(self, key, frozenset(str(value).strip() for value in getattr(self, key)))
+
+        self._validate()
+
+        all_rooms = self.rooms + (self.extra_room,)
+        all_classes = self.sw_classes + self.bd_classes
+        object.__setattr__(self, "all_rooms", all_rooms)
+        object.__setattr__(self, "all_classes", all_classes)
+        object.__setattr__(self, "hours", tuple(range(self.start_hour, self.end_hour)))
+        object.__setattr__(self, "num_hours", self.end_hour - self.start_hour)
+        object.__setattr__(self, "full_mask", (1 << (self.end_hour - self.start_hour)) - 1)
+        object.__setattr__(self, "room_ids", {room: i for i, room in enumerate(all_rooms)})
+        object.__setattr__(self, "day_ids", {day: i for i, day in enumerate(self.days)})
+        object.__setattr__(self, "unit_ids", {unit: i for i, unit in enumerate(all_classes)})
+        object.__setattr__(self, "day_map", {day: i for i, day in enumerate(self.days, 1)})
+
+    def _validate(self) -> None:
+        if not isinstance(self.start_hour, int) or not isinstance(self.end_hour, int) or not (0 <= self.start_hour < self.end_hour <= 24):
+            raise ValueError(f"설정 오류: 수업 시간은 0 <= start_hour < end_hour <= 24 인 정수여야 합니다. ({self.start_hour}, {self.end_hour})")
+        _check_unique("rooms", self.rooms)
+        if self.extra_room in self.rooms:
+            raise ValueError(f"설정 오류: 추가 강의실({self.extra_room})이 정규 강의실 목록에도 있습니다.")
+        _check_unique("days", self.days)
+        _check_unique("배정 단위", self.sw_classes + self.bd_classes)
+        for unit in self.sw_classes:
+            if not _SW_UNIT_PATTERN.match(unit):
+                raise ValueError(f"설정 오류: SW 배정 단위는 'SW-<학년>' 또는 'SW-<학년>A/B' 형식이어야 합니다. -> {unit}")
+        for unit in self.bd_classes:
+            if not _BD_UNIT_PATTERN.match(unit):
+                raise ValueError(f"설정 오류: BD 배정 단위는 'BD-<학년>' 형식이어야 합니다. -> {unit}")
+
+    def to_dict(self) -> Dict[str, Any]:
+        """설정 파일과 같은 형식의 dict 를 반환합니다. (학과 목록은 정렬)"""
+        data = {key: getattr(self, key) for key in _CONFIG_KEYS}
+        for key in ("rooms", "days", "sw_classes", "bd_classes"):
+            data[key] = list(data[key])
+        for key in ("sw_departments", "bd_departments"):
+            data[key] = sorted(data[key])
+        return data
+
+    @property
+    def fingerprint(self) -> str:
+        """배정 결과에 영향을 주는 설정 전체의 해시 (결과 캐시 키용)."""
+        encoded = json.dumps(self.to_dict(), ensure_ascii=False, sort_keys=True).encode("utf-8")
+        return hashlib.sha256(encoded).hexdigest()
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "SchedulingContext":
+        missing = [key for key in _CONFIG_KEYS if key not in data]
+        if missing:
+            raise ValueError(f"설정 오류: 다음 항목이 누락되었습니다. -> {', '.join(missing)}")
+        unknown = sorted(set(data) - set(_CONFIG_KEYS))
+        if unknown:
+            raise ValueError(f"설정 오류: 알 수 없는 항목이 있습니다. -> {', '.join(unknown)}")
+        return cls(**{key: data[key] for key in _CONFIG_KEYS})
+
+
+def load_context(path: str) -> SchedulingContext:
+    """JSON 설정 파일을 읽어 검증된 SchedulingContext 를 반환합니다. 형식이 잘못되면 ValueError."""
+    with open(path, encoding="utf-8") as f:
+        try:
+            data = json.load(f)
+        except json.JSONDecodeError as e:
+            raise ValueError(f"설정 오류: {path} 를 JSON 으로 읽을 수 없습니다. ({e})")
+    if not isinstance(data, dict):
+        raise ValueError(f"설정 오류: {path} 의 최상위 값은 객체여야 합니다.")
+    return SchedulingContext.from_dict(data)
@@ -0,0 +1,176 @@
+# incremental.py (단일 과목 추가/삭제/이동을 위한 증분 재배정)
+
+import random
+from typing import List, Dict, Tuple, Any, Optional
+
+from occupancy import OccupancyGrid
+from context import SchedulingContext
+from scheduler import (
+    DEFAULT_CONTEXT,
+    _parse_course_row, _assign_class_unit, _search_days, _find_slot, _greedy_assign,
+    generate_full_html_schedule,
+)
+
+# =========================================================================
+# 🛠️ 증분 재배정 세션 (ScheduleSession)
+#   - 마지막 배정 결과(점유 비트마스크 + 과목별 배정 위치)를 메모리에 유지
+#   - 과목 하나를 추가/삭제/이동할 때 해당 과목의 강의실·교수·배정 단위 칸만 수정
+#   - 이미 배정된 다른 과목의 위치는 절대 바꾸지 않음
+# =========================================================================
+
+class ScheduleSession:
+    """한 번 배정한 시간표를 유지하면서 과목 단위 수정을 적용합니다."""
+
+    def __init__(self, courses: List[Dict[str, Any]], seed: Optional[int] = None, context: SchedulingContext = DEFAULT_CONTEXT):
+        self.context = context
+        self.grid = OccupancyGrid(context)
+        self.placements: Dict[str, Tuple[str, str, int]] = {}
+        self.courses: Dict[str, Dict[str, Any]] = {}
+
+        rng = random.Random(seed) if seed is not None else random
+        ordered = list(courses)
+        self.schedule, _, self.class_day_load, _ = _greedy_assign(ordered, rng, grid=self.grid, placements=self.placements, context=context)
+
+        # 배정 순서를 유지해 두면 미배정 과목 재시도 순서도 그리디와 같아짐
+        for course in ordered:
+            self.courses[course["id"]] = course
+
+        # 분반(A/B) 추적기 복원: 이미 등장한 (과목명, 학과, 학년)은 다음부터 B반
+        self.split_class_trackers = {
+            (course["과목명"], course["학과"], course["학년"]): 'B' for course in ordered
+        }
+
+    # ---------------------------------------------------------------------
+    # 조회
+    # ---------------------------------------------------------------------
+    def unassigned_ids(self) -> List[str]:
+        return [course_id for course_id in self.courses if course_id not in self.placements]
+
+    def unassigned_names(self) -> List[str]:
+        return [self.courses[course_id]['과목명'] + f" ({self.courses[course_id]['배정_단위']})" for course_id in self.unassigned_ids()]
+
+    def slot_of(self, course_id: str) -> Optional[Dict[str, Any]]:
+        slot = self.placements.get(course_id)
+        if slot is None:
+            return None
+        day, room, start_hour = slot
+        return {"day": day, "room": room, "start_hour": start_hour, "end_hour": start_hour + self.courses[course_id]["필요시간"]}
+
+    def render_html(self) -> str:
+        return generate_full_html_schedule(self.schedule, self.unassigned_names(), self.context)
+
+    # ---------------------------------------------------------------------
+    # 내부: 배정 / 해제
+    # ---------------------------------------------------------------------
+    def _place(self, course: Dict[str, Any], slot: Tuple[str, str, int]) -> None:
+        day, room, start_hour = slot
+        hours = course["필요시간"]
+        self.grid.place(day, room, course["교수"], course["배정_단위"], course["과목명"], start_hour, hours)
+        for h in range(start_hour, start_hour + hours):
+            self.schedule[(day, h, room)] = (course["과목명"], course["배정_단위"], course["교수"])
+        self.class_day_load[course["배정_단위"]][day] += hours
+        self.placements[course["id"]] = slot
+
+    def _release(self, course: Dict[str, Any]) -> Optional[Tuple[str, str, int]]:
+        slot = self.placements.pop(course["id"], None)
+        if slot is None:
+            return None
+        day, room, start_hour = slot
+        hours = course["필요시간"]
+        self.grid.release(day, room, course["교수"], course["배정_단위"], start_hour, hours)
+        for h in range(start_hour, start_hour + hours):
+            self.schedule.pop((day, h, room), None)
+        self.class_day_load[course["배정_단위"]][day] -= hours
+        return slot
+
+    def _try_place(self, course: Dict[str, Any]) -> bool:
+        """그리디와 같은 순서(정규 강의실 -> 추가 강의실)로 빈 칸을 찾아 배정합니다."""
+        search_days = _search_days(course, self.class_day_load[course["배정_단위"]])
+        slot = _find_slot(self.grid, course, search_days, self.context.rooms)
+        if slot is None:
+            slot = _find_slot(self.grid, course, search_days, [self.context.extra_room])
+        if slot is None:
+            return False
+        self._place(course, slot)
+        return True
+
+    def _retry_unassigned(self) -> List[str]:
+        """빈 칸이 생겼을 때 미배정 과목만 다시 시도합니다. (배정된 과목은 건드리지 않음)"""
+        newly_placed = []
+        for course_id in self.unassigned_ids():
+            if self._try_place(self.courses[course_id]):
+                newly_placed.append(course_id)
+        return newly_placed
+
+    def _get(self, course_id: str) -> Dict[str, Any]:
+        course = self.courses.get(course_id)
+        if course is None:
+            raise KeyError(f"과목을 찾을 수 없습니다: {course_id}")
+        return course
+
+    # ---------------------------------------------------------------------
+    # 수정 연산
+    # ---------------------------------------------------------------------
+    def add_course(self, row: Dict[str, str]) -> Dict[str, Any]:
+        """CSV 한 행과 같은 형식(한글 헤더 키)의 과목을 추가하고 빈 칸에 배정합니다."""
+        parsed = _parse_course_row({key: str(value) for key, value in row.items()}, self.context)
+        if parsed is None:
+            raise ValueError("교과목학점, 개설학년, 수강인원은 0보다 큰 숫자여야 합니다.")
+        course_id, course = parsed
+        if course_id in self.courses:
+            raise ValueError(f"이미 등록된 과목입니다: {course_id}")
+
+        class_unit = row.get("배정_단위") or _assign_class_unit(course, self.split_class_trackers, self.context)
+        if class_unit not in self.context.unit_ids:
+            raise ValueError(f"배정 단위를 정할 수 없습니다. (개설학과/개설학년 확인): {course['학과']} {course['학년']}학년")
+        course['배정_단위'] = class_unit
+        course['id'] = course_id
+
+        self.courses[course_id] = course
+        self._try_place(course)
+        return {"course_id": course_id, "slot": self.slot_of(course_id)}
+
+    def remove_course(self, course_id: str) -> Dict[str, Any]:
+        """과목을 삭제하고, 비워진 칸에 들어갈 수 있는 미배정 과목을 다시 배정합니다."""
+        course = self._get(course_id)
+        self._release(course)
+        del self.courses[course_id]
+        newly_placed = self._retry_unassigned()
+        return {"course_id": course_id, "newly_placed": {cid: self.slot_of(cid) for cid in newly_placed}}
+
+    def move_course(self, course_id: str, day: str, start_hour: int, room: Optional[str] = None) -> Dict[str, Any]:
+        """
+        과목을 지정한 요일/시작 시간(선택적으로 강의실)으로 옮깁니다.
+        옮길 수 없으면 ValueError 를 발생시키고 기존 배정을 그대로 유지합니다.
+        """
+        course = self._get(course_id)
+        if day not in self.context.day_ids:
+            raise ValueError(f"잘못된 요일입니다: {day}")
+        if room is not None and room not in self.context.room_ids:
+            raise ValueError(f"잘못된 강의실입니다: {room}")
+
+        old_slot = self._release(course)
+        hours = course["필요시간"]
+        candidate_rooms = [room] if room is not None else self.context.all_rooms
+
+        new_slot = None
+        for candidate in candidate_rooms:
+            if not self.grid.is_free(day, candidate, course["교수"], course["배정_단위"], start_hour, hours):
+                continue
+            if not course["is_capstone"] and self.grid.violates_consecutive_rule(day, course["배정_단위"], course["과목명"], start_hour, hours):
+                continue
+            new_slot = (day, candidate, start_hour)
+            break
+
+        if new_slot is None:
+            if old_slot is not None:
+                self._place(course, old_slot)
+            raise ValueError(f"{day} {start_hour}:00 에는 강의실/교수/배정 단위 충돌 또는 3과목 연속 제약으로 옮길 수 없습니다.")
+
+        self._place(course, new_slot)
+        newly_placed = self._retry_unassigned() if old_slot is not None else []
+        return {
+            "course_id": course_id,
+            "slot": self.slot_of(course_id),
+            "newly_placed": {cid: self.slot_of(cid) for cid in newly_placed},
+        }
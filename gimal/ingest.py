@@ -0,0 +1,153 @@
+# ingest.py (업로드 CSV 스트리밍 파서: 청크 단위 디코딩 -> 헤더 검증 -> 중복 제거 -> 분반 배정)
+
+import codecs
+import csv
+from typing import List, Dict, Any, Iterator, Optional
+
+from context import SchedulingContext
+from scheduler import REQUIRED_KEYS, DEFAULT_CONTEXT, _parse_course_row, _assign_class_unit
+
+CHUNK_SIZE = 64 * 1024
+ENCODING_LIST = ['utf-8-sig', 'cp949', 'latin-1']
+
+
+class CourseStreamParser:
+    """
+    바이트 청크를 feed() 로 밀어 넣고 close() 로 과목 레코드 목록을 받는 증분 CSV 파서입니다.
+    - 첫 청크로 인코딩을 판별하고, 첫 행(헤더)에서 필수 헤더를 검사하여 잘못된 파일은 즉시 ValueError
+    - 같은 과목 ID는 scheduler.load_courses 와 같이 마지막 행을 사용 (순서는 처음 나온 위치)
+      -> 뒤에 같은 ID가 또 나올 수 있으므로 SW A/B 분반 배정은 close() 에서 한 번에
+    - 파일 전체를 메모리에 두지 않음 (남는 것은 ID -> 과목 dict 뿐)
+    """
+
+    def __init__(self, context: SchedulingContext = DEFAULT_CONTEXT):
+        self.context = context
+        self._decoder = None
+        self._encoding: Optional[str] = None
+        self._text_buffer = ""
+        self._record_lines: List[str] = []
+        self._quote_count = 0
+        self._fieldnames: Optional[List[str]] = None
+        self._line_number = 0
+        self._courses: Dict[str, Dict[str, Any]] = {}
+        self.rows_read = 0
+
+    # ---------------------------------------------------------------------
+    # 디코딩
+    # ---------------------------------------------------------------------
+    def _decode(self, chunk: bytes, final: bool = False) -> str:
+        if self._decoder is None:
+            for encoding in ENCODING_LIST:
+                decoder = codecs.getincrementaldecoder(encoding)()
+                try:
+                    text = decoder.decode(chunk, final)
+                except UnicodeDecodeError:
+                    continue
+                self._decoder = decoder
+                self._encoding = encoding
+                return text
+            raise ValueError("파일 인코딩 오류: UTF-8, CP949, Latin-1 인코딩으로 파일 내용을 읽을 수 없습니다.")
+
+        try:
+            return self._decoder.decode(chunk, final)
+        except UnicodeDecodeError:
+            raise ValueError(f"파일 인코딩 오류: {self._line_number + 1}번째 줄 부근에서 {self._encoding} 디코딩에 실패했습니다.")
+
+    # ---------------------------------------------------------------------
+    # 줄 -> 레코드 -> 과목
+    # ---------------------------------------------------------------------
+    def _complete_records(self, lines: List[str]) -> List[str]:
+        """따옴표 안의 줄바꿈을 고려하여, 레코드가 끝난 줄까지만 모아 반환합니다."""
+        complete = []
+        for line in lines:
+            self._line_number += 1
+            self._record_lines.append(line)
+            self._quote_count += line.count('"')
+            if self._quote_count % 2 == 0:
+                complete.extend(self._record_lines)
+                self._record_lines = []
+                self._quote_count = 0
+        return complete
+
+    def _read_lines(self, lines: List[str]) -> None:
+        try:
+            for values in csv.reader(self._complete_records(lines)):
+                if not values:
+                    continue  # 빈 줄 (csv.DictReader 와 동일하게 건너뜀)
+
+                if self._fieldnames is None:
+                    self._set_header(values)
+                    continue
+
+                # 뒤쪽 여분 열(끝의 쉼표 등)은 csv.DictReader 처럼 무시하고, 열이 모자란 행은 즉시 오류 처리
+                if len(values) < len(self._fieldnames):
+                    raise ValueError(f"형식 오류: {self.rows_read + 2}번째 행의 열 개수({len(values)})가 헤더({len(self._fieldnames)})보다 적습니다.")
+                self.rows_read += 1
+
+                self._add_row(dict(zip(self._fieldnames, values)))
+        except csv.Error as e:
+            raise ValueError(f"형식 오류: CSV 구문을 해석할 수 없습니다. ({e})")
+
+    def _set_header(self, values: List[str]) -> None:
+        self._fieldnames = values
+        missing_keys = set(REQUIRED_KEYS) - set(values)
+        if missing_keys:
+            raise ValueError(f"헤더 오류: 다음 필수 헤더가 누락되었거나 이름이 잘못되었습니다. -> **{', '.join(sorted(missing_keys))}**")
+
+    def _add_row(self, row: Dict[str, str]) -> None:
+        try:
+            parsed = _parse_course_row(row, self.context)
+        except ValueError:
+            return
+        if parsed is None:
+            return
+
+        course_id, course = parsed
+        self._courses[course_id] = course
+
+    def _assign_units(self) -> List[Dict[str, Any]]:
+        # scheduler.load_courses 와 같은 순서/규칙으로 분반 배정
+        courses = []
+        split_class_trackers = {}
+        for course_id, course in self._courses.items():
+            class_unit = _assign_class_unit(course, split_class_trackers, self.context)
+            if not class_unit:
+                continue
+            course['배정_단위'] = class_unit
+            course['id'] = course_id
+            courses.append(course)
+        return courses
+
+    # ---------------------------------------------------------------------
+    # 공개 API
+    # ---------------------------------------------------------------------
+    def feed(self, chunk: bytes) -> None:
+        """바이트 청크를 넣고 이 청크로 완성된 행까지 읽습니다. (형식 오류는 여기서 바로 ValueError)"""
+        self._text_buffer += self._decode(chunk)
+        lines = self._text_buffer.split('\n')
+        self._text_buffer = lines.pop()
+        self._read_lines([line + '\n' for line in lines])
+
+    def close(self) -> List[Dict[str, Any]]:
+        """입력이 끝났음을 알리고 과목 레코드 목록(분반 배정 포함)을 반환합니다."""
+        tail = self._text_buffer + self._decode(b"", final=True)
+        self._text_buffer = ""
+        self._read_lines([tail] if tail else [])
+        if self._record_lines:
+            raise ValueError("형식 오류: 닫히지 않은 따옴표(\")가 있습니다.")
+        if self._fieldnames is None:
+            raise ValueError("헤더 오류: 빈 파일입니다. 첫 번째 행에 헤더가 있어야 합니다.")
+        return self._assign_units()
+
+
+def iter_courses_from_file(file_path: str, chunk_size: int = CHUNK_SIZE,
+                           context: SchedulingContext = DEFAULT_CONTEXT) -> Iterator[Dict[str, Any]]:
+    """파일을 청크 단위로 읽고 과목 레코드를 하나씩 반환합니다. (중복 ID 처리 때문에 파일을 끝까지 읽은 뒤부터 나옴)"""
+    parser = CourseStreamParser(context)
+    with open(file_path, "rb") as f:
+        while True:
+            chunk = f.read(chunk_size)
+            if not chunk:
+                break
+            parser.feed(chunk)
+    yield from parser.close()
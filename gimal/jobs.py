@@ -0,0 +1,218 @@
+# jobs.py (백그라운드 배정 작업 큐: 프로세스 풀 실행 + 진행률 조회 + 취소)
+
+import multiprocessing
+import os
+import time
+import uuid
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor, Future
+from concurrent.futures.process import BrokenProcessPool
+from typing import List, Dict, Any, Optional
+
+from context import SchedulingContext
+from scheduler import run_schedule, SOLVER_TIME_LIMIT, DEFAULT_CONTEXT
+from result_cache import ResultCache, is_cacheable, make_cache_key
+
+# =========================================================================
+# ⚙️ 작업 큐 설정 (환경 변수로 조정 가능)
+# =========================================================================
+MAX_CONCURRENT_JOBS = int(os.environ.get("GIMAL_MAX_CONCURRENT_JOBS", "2"))  # 동시에 실행할 배정 작업 수 (= 워커 프로세스 수)
+MAX_QUEUED_JOBS = int(os.environ.get("GIMAL_MAX_QUEUED_JOBS", "20"))         # 실행 대기 중으로 받아 둘 최대 작업 수
+MAX_STORED_JOBS = 100                                                       # 결과를 보관할 최대 작업 수 (오래된 완료 작업부터 정리)
+PROGRESS_INTERVAL = 0.2                                                     # 진행률 보고/취소 확인 간격 (초)
+
+
+class JobCancelled(Exception):
+    """실행 중인 작업이 취소 요청을 확인하고 중단될 때 발생합니다."""
+
+
+class QueueFull(Exception):
+    """실행 중 + 대기 중인 작업 수가 한도에 이르러 새 작업을 받을 수 없을 때 발생합니다."""
+
+
+def _run_job(job_id: str, courses: List[Dict[str, Any]], mode: str, seed: Optional[int], time_limit: float, shared,
+             context: SchedulingContext = DEFAULT_CONTEXT, restart_workers: Optional[int] = None) -> Dict[str, Any]:
+    """
+    워커 프로세스에서 실행: 진행률을 공유 dict 에 기록하고, 취소 플래그가 보이면 중단합니다.
+    restarts 방식은 restart_workers 개 프로세스만 사용합니다. (동시 작업들이 CPU 코어를 나눠 씀)
+    """
+    last_report = 0.0
+
+    def progress(done: int, total: int) -> None:
+        nonlocal last_report
+        now = time.monotonic()
+        if done < total and now - last_report < PROGRESS_INTERVAL:
+            return
+        last_report = now
+        if shared.get(f"{job_id}:cancel"):
+            raise JobCancelled(job_id)
+        shared[job_id] = (done, total)
+
+    return run_schedule(courses, mode=mode, time_limit=time_limit, seed=seed, progress=progress, context=context,
+                        max_workers=restart_workers)
+
+
+# =========================================================================
+# 🗂️ 작업 관리자 (JobManager)
+# =========================================================================
+class JobManager:
+    """
+    배정 작업을 프로세스 풀에 넣고, 상태/진행률/결과 조회와 취소를 제공합니다.
+    같은 입력(캐시 키)의 결과가 캐시에 있으면 풀을 거치지 않고 바로 완료된 작업을 만들고,
+    같은 입력의 작업이 이미 실행 중이면 그 작업을 그대로 돌려줍니다.
+    """
+
+    def __init__(self, max_concurrent: int = MAX_CONCURRENT_JOBS, max_queued: int = MAX_QUEUED_JOBS,
+                 cache: Optional[ResultCache] = None):
+        self.max_concurrent = max(1, max_concurrent)
+        # 작업 하나가 restarts 에 쓸 프로세스 수: 동시 작업 수만큼 CPU 코어를 나눔 (작업 수 x 코어 수만큼 프로세스가 뜨지 않도록)
+        self.restart_workers = max(1, (os.cpu_count() or 1) // self.max_concurrent)
+        self.max_queued = max(0, max_queued)
+        self.cache = cache
+        self.jobs: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._inflight: Dict[str, str] = {}  # 캐시 키 -> 실행 중인 작업 ID
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._manager = None
+        self._shared = None
+
+    def _ensure_started(self) -> None:
+        # 첫 작업이 들어올 때 워커 풀과 진행률 공유용 Manager 프로세스를 시작
+        if self._executor is None:
+            self._manager = multiprocessing.Manager()
+            self._shared = self._manager.dict()
+            self._executor = ProcessPoolExecutor(max_workers=self.max_concurrent)
+
+    def _pending_count(self) -> int:
+        return sum(1 for job in self.jobs.values() if not job["future"].done())
+
+    def _evict(self) -> None:
+        finished = [job_id for job_id, job in self.jobs.items() if job["future"].done()]
+        while len(self.jobs) > MAX_STORED_JOBS and finished:
+            job_id = finished.pop(0)
+            del self.jobs[job_id]
+            if self._shared is not None:
+                self._shared.pop(job_id, None)
+                self._shared.pop(f"{job_id}:cancel", None)
+
+    def submit(self, courses: List[Dict[str, Any]], mode: str = "greedy", seed: Optional[int] = None,
+               time_limit: float = SOLVER_TIME_LIMIT, context: SchedulingContext = DEFAULT_CONTEXT) -> str:
+        """작업을 대기열에 넣고 작업 ID 를 반환합니다. 대기열이 가득 차면 QueueFull 을 발생시킵니다."""
+        cache_key = None
+        if self.cache is not None and is_cacheable(mode, seed):
+            cache_key = make_cache_key(courses, mode, seed, time_limit, context)
+
+        if cache_key is not None:
+            running_id = self._inflight.get(cache_key)
+            if running_id in self.jobs and not self.jobs[running_id]["future"].done():
+                return running_id
+
+            cached = self.cache.get(cache_key)
+            if cached is not None:
+                future = Future()
+                future.set_result(cached)
+                return self._register(future, mode, len(courses), cached=True)
+
+        if self._pending_count() >= self.max_concurrent + self.max_queued:
+            raise QueueFull("배정 작업 대기열이 가득 찼습니다. 잠시 후 다시 시도해 주세요.")
+
+        self._ensure_started()
+        job_id = uuid.uuid4().hex
+        self._shared[job_id] = (0, len(courses))
+        args = (_run_job, job_id, courses, mode, seed, time_limit, self._shared, context, self.restart_workers)
+        try:
+            future = self._executor.submit(*args)
+        except BrokenProcessPool:
+            # 워커 프로세스가 비정상 종료되어 풀을 더 쓸 수 없음 -> 새 풀로 다시 넣음 (이미 실패한 작업은 failed 로 남음)
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = ProcessPoolExecutor(max_workers=self.max_concurrent)
+            future = self._executor.submit(*args)
+        if cache_key is not None:
+            self._inflight[cache_key] = job_id
+            future.add_done_callback(lambda f: self._store_result(cache_key, job_id, f))
+        return self._register(future, mode, len(courses), job_id=job_id)
+
+    def _register(self, future: Future, mode: str, total: int, job_id: Optional[str] = None, cached: bool = False) -> str:
+        job_id = job_id or uuid.uuid4().hex
+        self.jobs[job_id] = {
+            "id": job_id,
+            "mode": mode,
+            "created_at": time.time(),
+            "future": future,
+            "total": total,
+            "cached": cached,
+        }
+        self._evict()
+        return job_id
+
+    def _store_result(self, cache_key: str, job_id: str, future: Future) -> None:
+        # 작업 완료 콜백 (풀 관리 스레드에서 호출됨)
+        if self._inflight.get(cache_key) == job_id:
+            del self._inflight[cache_key]
+        if not future.cancelled() and future.exception() is None:
+            self.cache.put(cache_key, future.result())
+
+    def future(self, job_id: str) -> Future:
+        return self._get(job_id)["future"]
+
+    def _get(self, job_id: str) -> Dict[str, Any]:
+        job = self.jobs.get(job_id)
+        if job is None:
+            raise KeyError(f"작업을 찾을 수 없습니다: {job_id}")
+        return job
+
+    def status(self, job_id: str) -> Dict[str, Any]:
+        job = self._get(job_id)
+        future = job["future"]
+
+        error = None
+        if future.cancelled():
+            state = "cancelled"
+        elif future.done():
+            exc = future.exception()
+            if exc is None:
+                state = "done"
+            elif isinstance(exc, JobCancelled):
+                state = "cancelled"
+            else:
+                state, error = "failed", str(exc)
+        elif self._shared is not None and self._shared.get(f"{job_id}:cancel"):
+            state = "cancelling"
+        elif future.running():
+            state = "running"
+        else:
+            state = "queued"
+
+        done, total = self._shared.get(job_id, (0, job["total"])) if self._shared is not None else (0, job["total"])
+        if state == "done":
+            done = total
+        return {
+            "job_id": job_id,
+            "mode": job["mode"],
+            "status": state,
+            "progress": {"done": done, "total": total},
+            "elapsed_sec": round(time.time() - job["created_at"], 2),
+            "cached": job["cached"],
+            "error": error,
+        }
+
+    def result_html(self, job_id: str) -> Optional[str]:
+        """완료된 작업의 결과 HTML 을 반환합니다. 아직 끝나지 않았거나 실패/취소된 작업이면 None."""
+        future = self.future(job_id)
+        if not future.done() or future.cancelled() or future.exception() is not None:
+            return None
+        return future.result()["html"]
+
+    def cancel(self, job_id: str) -> Dict[str, Any]:
+        """대기 중인 작업은 바로 취소하고, 실행 중인 작업은 다음 진행률 보고 시점에 중단되도록 표시합니다."""
+        future = self.future(job_id)
+        if not future.cancel() and not future.done():
+            self._shared[f"{job_id}:cancel"] = True
+        return self.status(job_id)
+
+    def shutdown(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._manager.shutdown()
+            self._executor = None
+            self._manager = None
+            self._shared = None
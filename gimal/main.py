@@ -1,20 +1,41 @@
 # main.py (최종 버전: 사용자 친화적 에러 출력 및 이미지 경로 수정)
 
-from fastapi import FastAPI, Request, File, UploadFile, Form
+from fastapi import FastAPI, Request, File, UploadFile, Form, HTTPException
 from fastapi.responses import HTMLResponse
+from fastapi.concurrency import run_in_threadpool
+from pydantic import BaseModel
+from collections import OrderedDict
+from typing import List, Dict, Any, Optional, Tuple
+from contextlib import asynccontextmanager
+import asyncio
 from fastapi.staticfiles import StaticFiles
 from fastapi.templating import Jinja2Templates
 import shutil
 import os
+import time
+import uuid
 import uvicorn
-from scheduler import run_scheduler 
+from scheduler import SCHEDULER_MODES, DEFAULT_CONTEXT
+from context import SchedulingContext, load_context
+from ingest import CourseStreamParser, CHUNK_SIZE
+from incremental import ScheduleSession
+from jobs import JobManager, JobCancelled, QueueFull
+from result_cache import ResultCache
 import traceback # 디버깅을 위해 traceback 모듈 사용
 
-app = FastAPI()
+# 1. 백그라운드 배정 작업 관리자 (CPU 작업은 프로세스 풀에서 실행하여 이벤트 루프를 막지 않음)
+# 같은 CSV + 같은 파라미터는 캐시된 결과를 바로 반환 (메모리 LRU + 디스크 계층)
+job_manager = JobManager(cache=ResultCache())
 
-# 2. 업로드된 파일을 임시 저장할 디렉토리 설정
-UPLOAD_DIR = "uploaded_csv"
-os.makedirs(UPLOAD_DIR, exist_ok=True)
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    yield
+    # 서버 종료 시 워커 프로세스 정리
+    job_manager.shutdown()
+
+
+app = FastAPI(lifespan=lifespan)
 
 # 📌 3. 정적 파일(이미지) 제공 설정
 app.mount("/static", StaticFiles(directory="static"), name="static")
@@ -22,12 +43,65 @@ app.mount("/static", StaticFiles(directory="static"), name="static")
 # 필수 헤더 목록 (에러 메시지 출력용)
 REQUIRED_HEADERS_STR = "교과목명, 강좌담당교수, 수업주수, 교과목학점, 개설학년, 개설학과, 교과목코드, 수강인원"
 
+# 캠퍼스별 배정 설정: 시작 시 한 번만 읽어 검증하고, 요청마다 불변 설정 객체를 골라 넘김
+CAMPUS_CONFIG_DIR = os.environ.get("GIMAL_CAMPUS_DIR", "campuses")
+
+
+def load_campus_contexts(config_dir: str) -> Dict[str, SchedulingContext]:
+    """config_dir 의 *.json 설정을 모두 읽어 {캠퍼스 이름: 설정} 을 반환합니다. 기본 설정은 항상 포함됩니다."""
+    contexts = {DEFAULT_CONTEXT.name: DEFAULT_CONTEXT}
+    if os.path.isdir(config_dir):
+        for name in sorted(os.listdir(config_dir)):
+            if name.endswith(".json"):
+                context = load_context(os.path.join(config_dir, name))
+                contexts[context.name] = context
+    return contexts
+
+
+campus_contexts = load_campus_contexts(CAMPUS_CONFIG_DIR)
+
+
+def _get_context(campus: str) -> SchedulingContext:
+    context = campus_contexts.get(campus)
+    if context is None:
+        raise HTTPException(status_code=400, detail=f"알 수 없는 캠퍼스입니다: {campus} (가능한 값: {', '.join(campus_contexts)})")
+    return context
+
+
+# 증분 수정용 배정 세션 (메모리 보관, 오래된 세션부터 정리)
+MAX_SESSIONS = 32
+sessions: "OrderedDict[str, ScheduleSession]" = OrderedDict()
+
+
+# =========================================================================
+# 💡 업로드 스트리밍: 청크를 디스크에 쓰면서 동시에 파서에 전달
+# =========================================================================
+async def stream_upload_courses(file: UploadFile, context: SchedulingContext = DEFAULT_CONTEXT) -> List[Dict[str, Any]]:
+    """
+    업로드 파일 전체를 메모리에 올리지 않고 청크 단위로 파싱하여 과목 목록을 반환합니다. 형식 오류는 ValueError 로 즉시 중단합니다.
+    (배정은 파싱한 과목 목록으로 하므로 업로드 파일을 디스크에 따로 저장하지 않음)
+    """
+    parser = CourseStreamParser(context)
+    try:
+        while True:
+            chunk = await file.read(CHUNK_SIZE)
+            if not chunk:
+                break
+            # CSV 디코딩/파싱은 스레드 풀에서 (큰 업로드가 이벤트 루프를 막지 않도록)
+            await run_in_threadpool(parser.feed, chunk)
+        return await run_in_threadpool(parser.close)
+    finally:
+        await file.close()
+
 
 # =========================================================================
 # 💡 1. 메인 페이지: 파일 업로드 폼 제공
 # =========================================================================
 @app.get("/", response_class=HTMLResponse)
 async def read_root():
+    campus_options = "".join(
+        f"<option value='{name}'{' selected' if name == DEFAULT_CONTEXT.name else ''}>{name}</option>" for name in campus_contexts
+    )
     html_content = f"""
     <!DOCTYPE html>
     <html>
@@ -78,6 +152,13 @@ async def read_root():
             
             <form action="/upload" method="post" enctype="multipart/form-data">
                 <input type="file" name="file" accept=".csv" required>
+                <select name="campus" style="padding: 8px; margin: 10px 0;">{campus_options}</select>
+                <select name="mode" style="padding: 8px; margin: 10px 0;">
+                    <option value="greedy" selected>빠른 배정 (그리디)</option>
+                    <option value="solver">정밀 배정 (제약 탐색, 최대 10초)</option>
+                    <option value="restarts">다중 재시작 (100회 중 최선)</option>
+                </select>
+                <input type="number" name="seed" placeholder="시드 (선택 입력)" min="0" style="padding: 8px; margin: 10px 0;">
                 <input type="submit" value="▶️ 파일 업로드 및 배정 시작">
             </form>
         </div>
@@ -91,27 +172,42 @@ async def read_root():
 # 💡 2. 파일 업로드 및 스케줄링 실행 라우터 (개선된 에러 처리)
 # =========================================================================
 @app.post("/upload", response_class=HTMLResponse)
-async def upload_file_and_run_scheduler(file: UploadFile = File(...)):
+async def upload_file_and_run_scheduler(file: UploadFile = File(...), mode: str = Form("greedy"), seed: str = Form(""),
+                                        campus: str = Form(DEFAULT_CONTEXT.name)):
+    if mode not in SCHEDULER_MODES:
+        mode = "greedy"
+    seed_value = int(seed) if seed.strip().isdigit() else None
+    context = campus_contexts.get(campus)
+    if context is None:
+        await file.close()
+        return HTMLResponse(content=f"<h1>오류: 알 수 없는 캠퍼스입니다. ({campus})</h1>")
+
     if not file.filename.endswith(".csv"):
         await file.close()
         return HTMLResponse(content="<h1>오류: CSV 파일만 업로드할 수 있습니다.</h1>")
     
-    file_location = os.path.join(UPLOAD_DIR, file.filename)
+    file_location = file.filename
     
-    # 비동기 파일 저장 로직
+    # 4. 업로드를 청크 단위로 읽으며 파싱한 뒤 스케줄러 실행 (잘못된 파일은 첫 청크에서 바로 중단)
     try:
-        contents = await file.read() 
-        with open(file_location, "wb") as buffer:
-            buffer.write(contents)
-            
-    except Exception as e:
-        return HTMLResponse(content=f"<h1>파일 저장 중 오류 발생: {e}</h1>")
-    finally:
-        await file.close()
+        courses = await stream_upload_courses(file, context)
+        # 배정은 작업 큐(프로세스 풀)에서 실행하고 결과만 기다림 -> 다른 요청은 계속 처리됨
+        job_id = job_manager.submit(courses, mode=mode, seed=seed_value, context=context)
+        future = job_manager.future(job_id)
+        try:
+            result = await asyncio.wrap_future(future)
+        except asyncio.CancelledError:
+            # 대기 중에 /jobs/{job_id}/cancel 로 취소된 작업 (요청 자체가 취소된 경우는 그대로 전파)
+            if not future.cancelled():
+                raise
+            raise JobCancelled(job_id)
+        schedule_html = result["html"]
 
-    # 4. 저장된 파일 경로를 사용하여 스케줄러 실행
-    try:
-        schedule_html = run_scheduler(file_location) 
+    except QueueFull as e:
+        return HTMLResponse(content=f"<h1>{e}</h1>", status_code=429)
+
+    except JobCancelled:
+        return HTMLResponse(content="<h1>배정 작업이 취소되었습니다.</h1>")
     
     # 📌 [수정] scheduler.py에서 발생시킨 ValueError (헤더 오류)를 사용자 친화적으로 출력
     except ValueError as ve:
@@ -158,6 +254,153 @@ async def upload_file_and_run_scheduler(file: UploadFile = File(...)):
     return HTMLResponse(content=schedule_html)
 
 
+# =========================================================================
+# 💡 3. 증분 재배정 API: 배정 결과를 세션으로 유지하고 과목 단위로 수정
+# =========================================================================
+class MoveRequest(BaseModel):
+    day: str
+    start_hour: int
+    room: Optional[str] = None
+
+
+def _get_session(session_id: str) -> ScheduleSession:
+    session = sessions.get(session_id)
+    if session is None:
+        raise HTTPException(status_code=404, detail=f"Session {session_id} not found.")
+    sessions.move_to_end(session_id)
+    return session
+
+
+def _edit_response(session: ScheduleSession, result: Dict[str, Any], start_time: float) -> Dict[str, Any]:
+    result["unassigned"] = session.unassigned_names()
+    result["elapsed_ms"] = round((time.perf_counter() - start_time) * 1000, 3)
+    return result
+
+
+@app.post("/sessions")
+async def create_session(file: UploadFile = File(...), seed: Optional[int] = Form(None), campus: str = Form(DEFAULT_CONTEXT.name)):
+    context = _get_context(campus)
+    if not file.filename.endswith(".csv"):
+        await file.close()
+        raise HTTPException(status_code=400, detail="CSV 파일만 업로드할 수 있습니다.")
+
+    session_id = uuid.uuid4().hex
+    try:
+        courses = await stream_upload_courses(file, context)
+    except ValueError as ve:
+        raise HTTPException(status_code=400, detail=str(ve))
+
+    # 첫 전체 배정은 CPU 작업이므로 스레드 풀에서 (이벤트 루프를 막지 않도록)
+    session = await run_in_threadpool(ScheduleSession, courses, seed=seed, context=context)
+    sessions[session_id] = session
+    while len(sessions) > MAX_SESSIONS:
+        sessions.popitem(last=False)
+
+    return {"session_id": session_id, "courses": len(courses), "unassigned": session.unassigned_names()}
+
+
+@app.get("/sessions/{session_id}", response_class=HTMLResponse)
+async def get_session_schedule(session_id: str):
+    return HTMLResponse(content=_get_session(session_id).render_html())
+
+
+@app.post("/sessions/{session_id}/courses")
+async def add_course(session_id: str, course: Dict[str, Any]):
+    session = _get_session(session_id)
+    start_time = time.perf_counter()
+    try:
+        result = session.add_course(course)
+    except (ValueError, KeyError) as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return _edit_response(session, result, start_time)
+
+
+@app.delete("/sessions/{session_id}/courses/{course_id}")
+async def remove_course(session_id: str, course_id: str):
+    session = _get_session(session_id)
+    start_time = time.perf_counter()
+    try:
+        result = session.remove_course(course_id)
+    except KeyError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    return _edit_response(session, result, start_time)
+
+
+@app.post("/sessions/{session_id}/courses/{course_id}/move")
+async def move_course(session_id: str, course_id: str, move: MoveRequest):
+    session = _get_session(session_id)
+    start_time = time.perf_counter()
+    try:
+        result = session.move_course(course_id, move.day, move.start_hour, move.room)
+    except KeyError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    except ValueError as e:
+        raise HTTPException(status_code=409, detail=str(e))
+    return _edit_response(session, result, start_time)
+
+
+# =========================================================================
+# 💡 4. 작업 큐 API: 배정을 백그라운드로 실행하고 상태/결과를 조회
+# =========================================================================
+@app.post("/jobs", status_code=202)
+async def create_job(file: UploadFile = File(...), mode: str = Form("greedy"), seed: Optional[int] = Form(None),
+                     campus: str = Form(DEFAULT_CONTEXT.name)):
+    if mode not in SCHEDULER_MODES:
+        raise HTTPException(status_code=400, detail=f"mode 는 {', '.join(SCHEDULER_MODES)} 중 하나여야 합니다.")
+    context = _get_context(campus)
+    if not file.filename.endswith(".csv"):
+        await file.close()
+        raise HTTPException(status_code=400, detail="CSV 파일만 업로드할 수 있습니다.")
+
+    try:
+        courses = await stream_upload_courses(file, context)
+    except ValueError as ve:
+        raise HTTPException(status_code=400, detail=str(ve))
+
+    try:
+        job_id = job_manager.submit(courses, mode=mode, seed=seed, context=context)
+    except QueueFull as e:
+        raise HTTPException(status_code=429, detail=str(e))
+
+    return {"job_id": job_id, "status_url": f"/jobs/{job_id}", "result_url": f"/jobs/{job_id}/result"}
+
+
+@app.get("/jobs/{job_id}")
+async def get_job_status(job_id: str):
+    try:
+        return job_manager.status(job_id)
+    except KeyError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+
+
+@app.get("/jobs/{job_id}/result", response_class=HTMLResponse)
+async def get_job_result(job_id: str):
+    try:
+        status = job_manager.status(job_id)
+    except KeyError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+
+    if status["status"] != "done":
+        raise HTTPException(status_code=409, detail=f"작업이 아직 완료되지 않았습니다. (상태: {status['status']})")
+    return HTMLResponse(content=job_manager.result_html(job_id))
+
+
+@app.delete("/jobs/{job_id}")
+async def cancel_job(job_id: str):
+    try:
+        return job_manager.cancel(job_id)
+    except KeyError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+
+
+# =========================================================================
+# 💡 5. 캠퍼스 설정 조회
+# =========================================================================
+@app.get("/campuses")
+async def list_campuses():
+    return {name: context.to_dict() for name, context in campus_contexts.items()}
+
+
 # =========================================================================
 # 💡 서버 실행
 # =========================================================================
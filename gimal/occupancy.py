@@ -0,0 +1,122 @@
+# occupancy.py (비트셋 기반 점유 관리 엔진)
+
+from typing import Dict, Iterator, List, Optional
+
+from context import SchedulingContext
+
+# =========================================================================
+# 🧮 점유 관리 엔진 (OccupancyGrid)
+#   - 강의실 / 교수 / 배정 단위별로 요일마다 정수 하나(1시간 = 1비트)를 사용
+#   - 강의실 / 배정 단위 / 요일은 SchedulingContext 의 정수 ID 로 리스트를 바로 인덱싱
+#   - 충돌 검사는 마스크 AND 한 번, 빈 시작 시간은 비트 스캔 한 번으로 계산
+# =========================================================================
+
+class OccupancyGrid:
+    """강의실, 교수, 배정 단위의 요일별 점유 상태를 비트마스크로 관리합니다."""
+
+    def __init__(self, context: SchedulingContext):
+        self.context = context
+        self.start_hour = context.start_hour
+        self.end_hour = context.end_hour
+        self.num_hours = context.num_hours
+        self.full_mask = context.full_mask
+        self._day_ids = context.day_ids
+        self._room_ids = context.room_ids
+        self._unit_ids = context.unit_ids
+
+        # [요일 ID][강의실/배정 단위 ID] -> 비트마스크 (설정에 없는 이름이면 KeyError)
+        num_days = len(context.days)
+        self.room_masks: List[List[int]] = [[0] * len(context.all_rooms) for _ in range(num_days)]
+        self.class_masks: List[List[int]] = [[0] * len(context.all_classes) for _ in range(num_days)]
+        # 교수는 입력 데이터에 따라 정해지므로 요일별 dict 로 관리
+        self.professor_masks: List[Dict[str, int]] = [{} for _ in range(num_days)]
+        # [요일 ID][배정 단위 ID] -> 시간별 과목명 (3과목 연속 금지 검사용)
+        self.class_course_names: List[List[Optional[List[Optional[str]]]]] = [[None] * len(context.all_classes) for _ in range(num_days)]
+
+    def _block(self, start_hour: int, hours: int) -> int:
+        return ((1 << hours) - 1) << (start_hour - self.start_hour)
+
+    def busy_mask(self, day: str, room: str, professor: str, class_unit: str) -> int:
+        """세 자원 중 하나라도 사용 중인 시간을 비트로 합쳐 반환합니다."""
+        d = self._day_ids[day]
+        return (
+            self.room_masks[d][self._room_ids[room]]
+            | self.professor_masks[d].get(professor, 0)
+            | self.class_masks[d][self._unit_ids[class_unit]]
+        )
+
+    def is_free(self, day: str, room: str, professor: str, class_unit: str, start_hour: int, hours: int) -> bool:
+        if start_hour < self.start_hour or start_hour + hours > self.end_hour:
+            return False
+        return not (self.busy_mask(day, room, professor, class_unit) & self._block(start_hour, hours))
+
+    def free_starts(self, day: str, room: str, professor: str, class_unit: str, hours: int) -> Iterator[int]:
+        """연속 hours 시간이 모두 비어 있는 시작 시간을 이른 순서대로 반환합니다."""
+        if hours <= 0 or hours > self.num_hours:
+            return
+        free = ~self.busy_mask(day, room, professor, class_unit) & self.full_mask
+        runs = free
+        for shift in range(1, hours):
+            runs &= free >> shift
+        # 시작 비트 s 는 s + hours <= num_hours 를 만족해야 함
+        runs &= (1 << (self.num_hours - hours + 1)) - 1
+
+        while runs:
+            low_bit = runs & -runs
+            yield self.start_hour + low_bit.bit_length() - 1
+            runs ^= low_bit
+
+    def course_at(self, day: str, hour: int, class_unit: str) -> Optional[str]:
+        """배정 단위의 해당 시간 과목명을 반환합니다. (비어 있으면 None)"""
+        names = self.class_course_names[self._day_ids[day]][self._unit_ids[class_unit]]
+        if names is None or not (self.start_hour <= hour < self.end_hour):
+            return None
+        return names[hour - self.start_hour]
+
+    def violates_consecutive_rule(self, day: str, class_unit: str, course_name: str, start_hour: int, hours: int) -> bool:
+        """앞뒤로 서로 다른 두 과목이 붙어 3과목 연속이 되는지 검사합니다. (캡스톤 예외는 호출측에서 처리)"""
+        adjacent_courses = set()
+
+        # 앞 블록 검사
+        name = self.course_at(day, start_hour - 1, class_unit)
+        if name is not None:
+            adjacent_courses.add(name)
+            name = self.course_at(day, start_hour - 2, class_unit)
+            if name is not None:
+                adjacent_courses.add(name)
+
+        # 뒤 블록 검사
+        hour_after = start_hour + hours
+        name = self.course_at(day, hour_after, class_unit)
+        if name is not None:
+            adjacent_courses.add(name)
+            name = self.course_at(day, hour_after + 1, class_unit)
+            if name is not None:
+                adjacent_courses.add(name)
+
+        return len(adjacent_courses) == 2 and course_name not in adjacent_courses
+
+    def place(self, day: str, room: str, professor: str, class_unit: str, course_name: str, start_hour: int, hours: int) -> None:
+        block = self._block(start_hour, hours)
+        d, u = self._day_ids[day], self._unit_ids[class_unit]
+        self.room_masks[d][self._room_ids[room]] |= block
+        self.professor_masks[d][professor] = self.professor_masks[d].get(professor, 0) | block
+        self.class_masks[d][u] |= block
+
+        names = self.class_course_names[d][u]
+        if names is None:
+            names = self.class_course_names[d][u] = [None] * self.num_hours
+        for h in range(start_hour, start_hour + hours):
+            names[h - self.start_hour] = course_name
+
+    def release(self, day: str, room: str, professor: str, class_unit: str, start_hour: int, hours: int) -> None:
+        block = ~self._block(start_hour, hours)
+        d, u = self._day_ids[day], self._unit_ids[class_unit]
+        self.room_masks[d][self._room_ids[room]] &= block
+        self.professor_masks[d][professor] = self.professor_masks[d].get(professor, 0) & block
+        self.class_masks[d][u] &= block
+
+        names = self.class_course_names[d][u]
+        if names is not None:
+            for h in range(start_hour, start_hour + hours):
+                names[h - self.start_hour] = None
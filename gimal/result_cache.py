@@ -0,0 +1,163 @@
+# result_cache.py (동일 시간표 요청용 내용 주소 기반 결과 캐시: 메모리 LRU + 디스크 계층)
+
+import hashlib
+import json
+import os
+import threading
+import uuid
+from collections import OrderedDict
+from typing import List, Dict, Any, Optional
+
+from context import SchedulingContext
+from scheduler import DEFAULT_CONTEXT
+
+CACHE_DIR = "result_cache"
+MAX_MEMORY_BYTES = 64 * 1024 * 1024   # 메모리 계층 최대 크기
+MAX_DISK_BYTES = 512 * 1024 * 1024    # 디스크 계층 최대 크기
+# 배정 알고리즘이 바뀌어 같은 입력의 결과가 달라지면 올려서 이전 캐시를 무효화
+CACHE_VERSION = 1
+
+# 배정 결과에 영향을 주는 과목 필드 (정규화 대상)
+_COURSE_KEY_FIELDS = ["id", "과목명", "교수", "필요시간", "배정_단위", "선호도_점수", "선호_요일", "is_capstone"]
+
+
+def is_cacheable(mode: str, seed: Optional[int]) -> bool:
+    """시드 없는 greedy / restarts 는 요청마다 새 무작위 시간표를 만들어야 하므로 캐시하지 않습니다."""
+    return seed is not None or mode == "solver"
+
+
+def make_cache_key(courses: List[Dict[str, Any]], mode: str, seed: Optional[int], time_limit: float,
+                   context: SchedulingContext = DEFAULT_CONTEXT) -> str:
+    """
+    정규화한 과목 목록 + 배정 파라미터(방식, 시드, 배정 설정 해시)의 SHA-256 을 캐시 키로 사용합니다.
+    시드가 같아도 과목 순서가 다르면 셔플 결과가 달라지므로 순서는 키에 포함합니다.
+    CSV 의 인코딩, 공백, 배정에 쓰이지 않는 열, 중복 행 차이는 키에 영향을 주지 않습니다.
+    """
+    digest = hashlib.sha256()
+    params = {
+        "version": CACHE_VERSION,
+        "mode": mode,
+        "seed": seed,
+        "time_limit": time_limit if mode == "solver" else None,
+        "context": context.fingerprint,
+    }
+    digest.update(json.dumps(params, ensure_ascii=False, sort_keys=True).encode("utf-8"))
+    for course in courses:
+        record = [course[field] for field in _COURSE_KEY_FIELDS]
+        digest.update(json.dumps(record, ensure_ascii=False).encode("utf-8"))
+        digest.update(b"\n")
+    return digest.hexdigest()
+
+
+def _encode_entry(result: Dict[str, Any]) -> bytes:
+    entry = {
+        "schedule": [[day, hour, room, *value] for (day, hour, room), value in result["schedule"].items()],
+        "unassigned": result["unassigned"],
+        "seed": result["seed"],
+        "html": result["html"],
+    }
+    return json.dumps(entry, ensure_ascii=False).encode("utf-8")
+
+
+def _decode_entry(data: bytes) -> Dict[str, Any]:
+    entry = json.loads(data.decode("utf-8"))
+    entry["schedule"] = {(day, hour, room): (course, unit, professor) for day, hour, room, course, unit, professor in entry["schedule"]}
+    return entry
+
+
+class ResultCache:
+    """
+    배정 결과(시간표 + 렌더링 HTML)를 캐시 키로 저장합니다.
+    - 메모리 계층: 인코딩된 바이트 크기 기준 LRU
+    - 디스크 계층: 키 이름의 JSON 파일, 재시작 후에도 유지되며 크기 초과 시 오래 사용되지 않은 파일부터 삭제
+    여러 스레드(작업 완료 콜백)에서 동시에 호출될 수 있으므로 내부 상태는 잠금으로 보호합니다.
+    """
+
+    def __init__(self, cache_dir: str = CACHE_DIR, max_memory_bytes: int = MAX_MEMORY_BYTES, max_disk_bytes: int = MAX_DISK_BYTES):
+        self.cache_dir = cache_dir
+        self.max_memory_bytes = max_memory_bytes
+        self.max_disk_bytes = max_disk_bytes
+        self._memory: "OrderedDict[str, bytes]" = OrderedDict()
+        self._memory_bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        if cache_dir:
+            os.makedirs(cache_dir, exist_ok=True)
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, f"{key}.json")
+
+    def _remember(self, key: str, data: bytes) -> None:
+        if key in self._memory:
+            self._memory_bytes -= len(self._memory.pop(key))
+        if len(data) > self.max_memory_bytes:
+            return
+        self._memory[key] = data
+        self._memory_bytes += len(data)
+        while self._memory_bytes > self.max_memory_bytes:
+            _, evicted = self._memory.popitem(last=False)
+            self._memory_bytes -= len(evicted)
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            data = self._memory.get(key)
+            if data is not None:
+                self._memory.move_to_end(key)
+                self.hits += 1
+                return _decode_entry(data)
+
+        if not self.cache_dir:
+            self.misses += 1
+            return None
+        try:
+            with open(self._path(key), "rb") as f:
+                data = f.read()
+            entry = _decode_entry(data)
+            os.utime(self._path(key))  # 디스크 LRU 용 사용 시각 갱신
+        except (OSError, ValueError, KeyError):
+            self.misses += 1
+            return None
+
+        with self._lock:
+            self._remember(key, data)
+            self.hits += 1
+        return entry
+
+    def put(self, key: str, result: Dict[str, Any]) -> None:
+        data = _encode_entry(result)
+        with self._lock:
+            self._remember(key, data)
+
+        if not self.cache_dir:
+            return
+        # 임시 파일에 쓴 뒤 교체하여 동시에 같은 키를 쓰더라도 깨진 파일이 남지 않도록 함
+        tmp_path = os.path.join(self.cache_dir, f".{key}.{uuid.uuid4().hex}.tmp")
+        with open(tmp_path, "wb") as f:
+            f.write(data)
+        os.replace(tmp_path, self._path(key))
+        self._trim_disk()
+
+    def _trim_disk(self) -> None:
+        entries = []
+        total = 0
+        for name in os.listdir(self.cache_dir):
+            if not name.endswith(".json"):
+                continue
+            path = os.path.join(self.cache_dir, name)
+            try:
+                stat = os.stat(path)
+            except OSError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+            total += stat.st_size
+
+        entries.sort()
+        for _, size, path in entries:
+            if total <= self.max_disk_bytes:
+                break
+            try:
+                os.remove(path)
+                total -= size
+            except OSError:
+                pass
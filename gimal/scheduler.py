@@ -1,8 +1,14 @@
 # scheduler.py (최종 버전: R_EXTRA 사용 최소화 및 3과목 연속 금지 로직 적용)
 
 import csv
+import os
 import random
-from typing import List, Dict, Tuple, Any
+import time
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from typing import List, Dict, Tuple, Any, Optional, Callable
+from occupancy import OccupancyGrid
+from context import SchedulingContext
 
 # =========================================================================
 # ⚙️ 설정 상수 (Configuration Constants)
@@ -13,11 +19,35 @@ START_HOUR = 9
 END_HOUR = 18
 DAYS = ["월", "화", "수", "목", "금"]
 
+# 📌 배정 방식: "greedy" (기본 선착순 배정) / "solver" (제한 시간 내 제약 충족 탐색) / "restarts" (시드별 다중 재시작)
+SCHEDULER_MODES = ["greedy", "solver", "restarts"]
+SOLVER_TIME_LIMIT = 10.0  # 초
+SOLVER_SEED = 0           # solver 초기 해(그리디)의 시드: 같은 입력이면 같은 출발점 (결과 캐시 대상)
+RESTART_COUNT = 100
+
 # 📌 배정 단위 정의
 SW_CLASSES = ["SW-1A", "SW-1B", "SW-2A", "SW-2B", "SW-3A", "SW-3B", "SW-4"]
 BD_CLASSES = ["BD-1", "BD-2", "BD-3"]
 ALL_CLASSES = SW_CLASSES + BD_CLASSES
 
+# 📌 배정 단위를 정할 학과 목록
+VALID_SW_DEPTS = ["소프트웨어융합과", "코딩전공", "소프트웨어융합학과", "소프트웨어융합과(2022)"]
+VALID_BD_DEPTS = ["빅데이터과"]
+
+# 📌 기본 배정 설정: 위 상수로 만든 불변 설정 객체 (다른 캠퍼스는 context.load_context 로 JSON 설정을 읽어 전달)
+DEFAULT_CONTEXT = SchedulingContext(
+    name="default",
+    rooms=ROOMS[:-1],
+    extra_room=ROOMS[-1],
+    start_hour=START_HOUR,
+    end_hour=END_HOUR,
+    days=DAYS,
+    sw_classes=SW_CLASSES,
+    bd_classes=BD_CLASSES,
+    sw_departments=VALID_SW_DEPTS,
+    bd_departments=VALID_BD_DEPTS,
+)
+
 # 📌 프로그램이 필수적으로 사용할 키 목록 정의
 REQUIRED_KEYS = ["교과목명", "강좌담당교수", "수업주수", "교과목학점", "개설학년", "개설학과", "교과목코드", "수강인원"]
 PROFESSOR_PREF_KEYS = [f"{i}순위" for i in range(1, 6)]
@@ -25,6 +55,9 @@ REQUIRED_KEYS += PROFESSOR_PREF_KEYS
 
 DAY_MAP = {day: i for i, day in enumerate(DAYS, 1)}
 
+# 📌 진행률 콜백: progress(처리한 수, 전체 수)
+ProgressCallback = Callable[[int, int], None]
+
 # 🎨 학년별 색상 매핑
 COLOR_MAP = {
     "SW-1": "#ffe0e6", "SW-2": "#fff9c4", "SW-3": "#e3f2fd", "SW-4": "#e8f5e9",  
@@ -33,10 +66,83 @@ COLOR_MAP = {
 }
 
 # =========================================================================
-# 📚 데이터 로드 함수 (load_courses) - 변경 없음
+# 📚 데이터 로드 함수 (load_courses)
 # =========================================================================
 
-def load_courses(file_path: str) -> List[Dict[str, Any]]:
+def _parse_course_row(row: Dict[str, str], context: SchedulingContext = DEFAULT_CONTEXT) -> Optional[Tuple[str, Dict[str, Any]]]:
+    """CSV 한 행을 (과목 ID, 과목 정보)로 변환합니다. 학점/학년/수강인원이 없으면 None 을 반환합니다."""
+    credits_str = row.get("교과목학점", "0").strip()
+    credits = int(credits_str) if credits_str.isdigit() else 0
+    grade_str = row.get("개설학년", "0").strip()
+    grade = int(grade_str) if grade_str.isdigit() else 0
+    capacity_str = row.get("수강인원", "0").strip()
+    capacity = int(capacity_str) if capacity_str.isdigit() else 0
+    weeks_str = row.get("수업주수", "0").strip()
+    weeks = int(weeks_str) if weeks_str.isdigit() else 0
+    
+    if credits == 0 or grade == 0 or capacity == 0:
+        return None
+
+    course_id = f"{row['교과목명']}_{row['강좌담당교수']}_{capacity}"
+    
+    preference_score = 0
+    preferred_days = []
+    for pref_key_index, pref_key in enumerate(PROFESSOR_PREF_KEYS):
+        day_name = row.get(pref_key, "").strip()
+        if day_name in context.day_map:
+            score = 6 - (pref_key_index + 1) 
+            preference_score += score
+            preferred_days.append(day_name)
+    
+    dept = row["개설학과"].strip()
+    course_name = row["교과목명"].strip()
+    
+    return course_id, {
+        "과목명": course_name,
+        "교수": row["강좌담당교수"],
+        "필요시간": credits,
+        "학년": grade,
+        "학과": dept,
+        "주수": weeks,
+        "선호도_점수": preference_score, 
+        "선호_요일": preferred_days,   
+        "그룹_키": (course_name, dept), 
+        # 캡스톤 과목 여부 플래그 추가
+        "is_capstone": course_name.startswith("캡스톤")
+    }
+
+
+def _assign_class_unit(course: Dict[str, Any], split_class_trackers: Dict[tuple, str],
+                       context: SchedulingContext = DEFAULT_CONTEXT) -> Optional[str]:
+    """
+    학과/학년으로 배정 단위를 정합니다. 설정에 A/B 분반이 있는 SW 학년은 같은 과목이 두 번째로 나오면 B반으로 분반합니다.
+    설정에 없는 배정 단위가 나오면 None 을 반환합니다.
+    """
+    grade = course['학년']
+    dept = course['학과']
+    class_unit = None
+    
+    if dept in context.sw_departments:
+        if f"SW-{grade}A" in context.unit_ids:
+            tracker_key = (course['과목명'], dept, grade)
+            if tracker_key not in split_class_trackers:
+                split_class_trackers[tracker_key] = 'A'
+            
+            if split_class_trackers[tracker_key] == 'A':
+                class_unit = f"SW-{grade}A"
+                split_class_trackers[tracker_key] = 'B'
+            elif split_class_trackers[tracker_key] == 'B':
+                class_unit = f"SW-{grade}B"
+        else:
+            class_unit = f"SW-{grade}"
+        
+    elif dept in context.bd_departments:
+        class_unit = f"BD-{grade}"
+
+    return class_unit if class_unit in context.unit_ids else None
+
+
+def load_courses(file_path: str, context: SchedulingContext = DEFAULT_CONTEXT) -> List[Dict[str, Any]]:
     courses = []
     encoding_list = ['utf-8', 'cp949', 'latin-1']
     reader = None
@@ -70,74 +176,19 @@ def load_courses(file_path: str) -> List[Dict[str, Any]]:
         
         for row in reader:
             try:
-                credits_str = row.get("교과목학점", "0").strip()
-                credits = int(credits_str) if credits_str.isdigit() else 0
-                grade_str = row.get("개설학년", "0").strip()
-                grade = int(grade_str) if grade_str.isdigit() else 0
-                capacity_str = row.get("수강인원", "0").strip()
-                capacity = int(capacity_str) if capacity_str.isdigit() else 0
-                weeks_str = row.get("수업주수", "0").strip()
-                weeks = int(weeks_str) if weeks_str.isdigit() else 0
-                
-                if credits == 0 or grade == 0 or capacity == 0:
+                parsed = _parse_course_row(row, context)
+                if parsed is None:
                     continue
-
-                course_id = f"{row['교과목명']}_{row['강좌담당교수']}_{capacity}"
-                
-                preference_score = 0
-                preferred_days = []
-                for pref_key_index, pref_key in enumerate(PROFESSOR_PREF_KEYS):
-                    day_name = row.get(pref_key, "").strip()
-                    if day_name in DAY_MAP:
-                        score = 6 - (pref_key_index + 1) 
-                        preference_score += score
-                        preferred_days.append(day_name)
-                
-                dept = row["개설학과"].strip()
-                course_name = row["교과목명"].strip()
-                
-                course_map[course_id] = {
-                    "과목명": course_name,
-                    "교수": row["강좌담당교수"],
-                    "필요시간": credits,
-                    "학년": grade,
-                    "학과": dept,
-                    "주수": weeks,
-                    "선호도_점수": preference_score, 
-                    "선호_요일": preferred_days,   
-                    "그룹_키": (course_name, dept), 
-                    # 캡스톤 과목 여부 플래그 추가
-                    "is_capstone": course_name.startswith("캡스톤")
-                }
+                course_id, course = parsed
+                course_map[course_id] = course
             except ValueError:
                 pass
         
         final_courses = []
-        valid_sw_depts = ["소프트웨어융합과", "코딩전공", "소프트웨어융합학과", "소프트웨어융합과(2022)"]
         split_class_trackers = {} 
 
         for course_id, course in course_map.items():
-            grade = course['학년']
-            dept = course['학과']
-            class_unit = None
-            
-            if dept in valid_sw_depts:
-                if grade == 4:
-                    class_unit = "SW-4"
-                elif grade in [1, 2, 3]:
-                    tracker_key = (course['과목명'], dept, grade)
-                    if tracker_key not in split_class_trackers:
-                        split_class_trackers[tracker_key] = 'A'
-                    
-                    if split_class_trackers[tracker_key] == 'A':
-                        class_unit = f"SW-{grade}A"
-                        split_class_trackers[tracker_key] = 'B'
-                    elif split_class_trackers[tracker_key] == 'B':
-                        class_unit = f"SW-{grade}B"
-                
-            elif dept == "빅데이터과":
-                if 1 <= grade <= 3:
-                    class_unit = f"BD-{grade}"
+            class_unit = _assign_class_unit(course, split_class_trackers, context)
 
             if class_unit:
                 course['배정_단위'] = class_unit
@@ -159,196 +210,413 @@ def load_courses(file_path: str) -> List[Dict[str, Any]]:
 
 
 # =========================================================================
-# ⚙️ 시간표 배정 함수 (schedule_courses) - 강화된 최적화 및 제약 조건 적용
+# ⚙️ 시간표 배정 함수 (schedule_courses) - 비트셋 점유 엔진 기반 충돌 검사
 # =========================================================================
 
-def schedule_courses(courses: List[Dict[str, Any]]) -> Tuple[Dict[Tuple[str, int, str], Tuple[str, str, str]], List[str]]:
+def _search_days(course: Dict[str, Any], day_load: Dict[str, int]) -> List[str]:
+    """선호 요일 & 부하 낮은 순 -> 나머지 요일 & 부하 낮은 순으로 요일 탐색 순서를 정합니다. (day_load 의 키 순서 = 설정의 요일 순서)"""
+    preferred_days = course["선호_요일"]
+    low_load_days = sorted(day_load, key=lambda day: day_load[day])
+
+    search_days = []
+    # 선호 요일 & 부하 낮은 순
+    for day in low_load_days:
+        if day in preferred_days:
+            search_days.append(day)
+    # 나머지 요일 & 부하 낮은 순
+    for day in low_load_days:
+        if day not in search_days:
+            search_days.append(day)
+
+    return list(dict.fromkeys(search_days))
+
+
+def _find_slot(grid: OccupancyGrid, course: Dict[str, Any], search_days: List[str], rooms: List[str]):
+    """요일 -> 강의실 -> 시작 시간 순서로 탐색하여 처음 배정 가능한 (요일, 강의실, 시작 시간)을 반환합니다."""
+    required_hours = course["필요시간"]
+    class_unit = course["배정_단위"]
+    professor = course["교수"]
+
+    for day in search_days:
+        for room in rooms:
+            # 기본 충돌 조건 (강의실/교수/배정 단위)은 비트 스캔으로 한 번에 걸러냄
+            for start_hour in grid.free_starts(day, room, professor, class_unit, required_hours):
+                # 연속 과목 수 3개 이상 금지 제약 조건 검사 (캡스톤은 예외)
+                if not course["is_capstone"] and grid.violates_consecutive_rule(day, class_unit, course["과목명"], start_hour, required_hours):
+                    continue
+                return day, room, start_hour
+    return None
+
+
+def _greedy_assign(courses: List[Dict[str, Any]], rng, grid: Optional[OccupancyGrid] = None,
+                   placements: Optional[Dict[str, Tuple[str, str, int]]] = None,
+                   progress: Optional[ProgressCallback] = None,
+                   context: SchedulingContext = DEFAULT_CONTEXT,
+                   deadline: Optional[float] = None) -> Tuple[Dict[Tuple[str, int, str], Tuple[str, str, str]], List[str], Dict[str, Dict[str, int]], int]:
+    """
+    그리디 배정 본체. (시간표, 미배정 목록, 단위별 요일 부하, 선호 요일 배정 수)를 반환합니다.
+    grid / placements 를 넘기면 점유 상태와 과목 ID -> (요일, 강의실, 시작 시간) 배정 결과를 채워 줍니다. (증분 수정용)
+    deadline(time.monotonic 기준)이 지나면 남은 과목은 미배정으로 두고 바로 반환합니다.
+    """
     room_schedule = {}
-    professor_schedule = {}
-    class_schedule = {} 
+    if grid is None:
+        grid = OccupancyGrid(context)
     unassigned_courses = []
+    preference_hits = 0
 
     # 1. 최적화된 정렬
     courses.sort(key=lambda x: (-x['선호도_점수'], -x['필요시간']))
-    random.shuffle(courses) 
+    rng.shuffle(courses) 
 
     # 2. 학과/학년별 현재 배정 현황 추적 (균등 배정 최적화용)
-    class_day_load = {unit: {day: 0 for day in DAYS} for unit in ALL_CLASSES}
+    class_day_load = {unit: {day: 0 for day in context.days} for unit in context.all_classes}
     
     # 강의실 분리
-    REGULAR_ROOMS = ROOMS[:-1] # 정규 강의실
-    EXTRA_ROOM = ["R_EXTRA"] # 추가 강의실
+    REGULAR_ROOMS = context.rooms # 정규 강의실
+    EXTRA_ROOM = [context.extra_room] # 추가 강의실
+
+    for index, course in enumerate(courses):
+        if progress is not None:
+            progress(index, len(courses))
+        if deadline is not None and time.monotonic() >= deadline:
+            unassigned_courses.extend(c['과목명'] + f" ({c['배정_단위']})" for c in courses[index:])
+            break
 
-    for course in courses:
-        assigned = False
         required_hours = course["필요시간"]
         class_unit = course["배정_단위"]
 
         # 3. 요일 탐색 순서 결정 (균등 배정 최적화 적용)
-        preferred_days = course["선호_요일"]
-        low_load_days = sorted(DAYS, key=lambda day: class_day_load[class_unit][day])
-        
-        search_days = []
-        # 선호 요일 & 부하 낮은 순
-        for day in low_load_days:
-            if day in preferred_days:
-                search_days.append(day)
-        # 나머지 요일 & 부하 낮은 순
-        for day in low_load_days:
-            if day not in search_days:
-                search_days.append(day)
-                
-        search_days = list(dict.fromkeys(search_days))
+        search_days = _search_days(course, class_day_load[class_unit])
 
         # ⭐️ 4. ATTEMPT 1: 정규 강의실(REGULAR_ROOMS)을 사용하여 모든 요일을 탐색 (선호 요일 우선)
-        for day in search_days:
-            for room in REGULAR_ROOMS:
-                start_hour = START_HOUR
-                
-                while start_hour + required_hours <= END_HOUR:
-                    
-                    conflict = False
-                    
-                    # 4-1. 기본 충돌 조건 검사
-                    for h in range(start_hour, start_hour + required_hours):
-                        if (day, h, room) in room_schedule:
-                            conflict = True
-                            break
-                        if (day, h, course["교수"]) in professor_schedule:
-                            conflict = True
-                            break
-                        if (day, h, class_unit) in class_schedule:
-                            conflict = True
-                            break
-                    
-                    # 4-2. 연속 과목 수 3개 이상 금지 제약 조건 검사 (캡스톤은 예외)
-                    if not conflict and not course["is_capstone"]: 
-                        
-                        course_names_before = set()
-                        course_names_after = set()
-                        
-                        # 앞 블록 검사
-                        hour_before = start_hour - 1
-                        if hour_before >= START_HOUR and (day, hour_before, class_unit) in class_schedule:
-                            course_names_before.add(class_schedule[(day, hour_before, class_unit)])
-                            second_hour_before = hour_before - 1
-                            if second_hour_before >= START_HOUR and (day, second_hour_before, class_unit) in class_schedule:
-                                course_names_before.add(class_schedule[(day, second_hour_before, class_unit)])
-                                
-                        # 뒤 블록 검사
-                        hour_after = start_hour + required_hours
-                        if hour_after < END_HOUR and (day, hour_after, class_unit) in class_schedule:
-                            course_names_after.add(class_schedule[(day, hour_after, class_unit)])
-                            second_hour_after = hour_after + 1
-                            if second_hour_after < END_HOUR and (day, second_hour_after, class_unit) in class_schedule:
-                                course_names_after.add(class_schedule[(day, second_hour_after, class_unit)])
-                        
-                        adjacent_courses = course_names_before.union(course_names_after)
-                        current_course_name = course["과목명"]
-                        
-                        # 인접한 과목이 2개인데, 현재 과목이 이들과 모두 다르다면 3과목 연속으로 간주
-                        if len(adjacent_courses) == 2 and current_course_name not in adjacent_courses:
-                            conflict = True
-                    
-                    if not conflict:
-                        # 배정 실행
-                        for h in range(start_hour, start_hour + required_hours):
-                            room_schedule[(day, h, room)] = (course["과목명"], class_unit, course["교수"])
-                            professor_schedule[(day, h, course["교수"])] = course["과목명"]
-                            class_schedule[(day, h, class_unit)] = course["과목명"]
-                        
-                        # 부하 업데이트
-                        class_day_load[class_unit][day] += required_hours
-                        
-                        assigned = True
-                        break # 시간 루프 탈출
-                    
-                    start_hour += 1 # 다음 시작 시간으로 이동
-
-                if assigned:
-                    break # 강의실 루프 탈출
-            if assigned:
-                break # 요일 루프 탈출
+        slot = _find_slot(grid, course, search_days, REGULAR_ROOMS)
 
         # ⭐️ 5. ATTEMPT 2: 정규 강의실 배정 실패 시, 추가 강의실(R_EXTRA)을 사용하여 모든 요일을 탐색 (최후의 수단)
-        if not assigned:
-            for day in search_days:
-                for room in EXTRA_ROOM: # R_EXTRA만 탐색
-                    start_hour = START_HOUR
-                    
-                    while start_hour + required_hours <= END_HOUR:
-                        
-                        conflict = False
-                        
-                        # 5-1. 기본 충돌 조건 검사 (R_EXTRA 포함)
-                        for h in range(start_hour, start_hour + required_hours):
-                            if (day, h, room) in room_schedule:
-                                conflict = True
-                                break
-                            if (day, h, course["교수"]) in professor_schedule:
-                                conflict = True
-                                break
-                            if (day, h, class_unit) in class_schedule:
-                                conflict = True
-                                break
-                        
-                        # 5-2. 연속 과목 수 3개 이상 금지 제약 조건 검사 (캡스톤 예외 포함)
-                        if not conflict and not course["is_capstone"]: 
-                            
-                            course_names_before = set()
-                            course_names_after = set()
-                            
-                            hour_before = start_hour - 1
-                            if hour_before >= START_HOUR and (day, hour_before, class_unit) in class_schedule:
-                                course_names_before.add(class_schedule[(day, hour_before, class_unit)])
-                                second_hour_before = hour_before - 1
-                                if second_hour_before >= START_HOUR and (day, second_hour_before, class_unit) in class_schedule:
-                                    course_names_before.add(class_schedule[(day, second_hour_before, class_unit)])
-                                    
-                            hour_after = start_hour + required_hours
-                            if hour_after < END_HOUR and (day, hour_after, class_unit) in class_schedule:
-                                course_names_after.add(class_schedule[(day, hour_after, class_unit)])
-                                second_hour_after = hour_after + 1
-                                if second_hour_after < END_HOUR and (day, second_hour_after, class_unit) in class_schedule:
-                                    course_names_after.add(class_schedule[(day, second_hour_after, class_unit)])
-                            
-                            adjacent_courses = course_names_before.union(course_names_after)
-                            current_course_name = course["과목명"]
-                            
-                            if len(adjacent_courses) == 2 and current_course_name not in adjacent_courses:
-                                conflict = True
-                        
-                        
-                        if not conflict:
-                            # 배정 실행
-                            for h in range(start_hour, start_hour + required_hours):
-                                room_schedule[(day, h, room)] = (course["과목명"], class_unit, course["교수"])
-                                professor_schedule[(day, h, course["교수"])] = course["과목명"]
-                                class_schedule[(day, h, class_unit)] = course["과목명"]
-                            
-                            # 부하 업데이트
-                            class_day_load[class_unit][day] += required_hours
-                            
-                            assigned = True
-                            break # 시간 루프 탈출
-                        
-                        start_hour += 1 # 다음 시작 시간으로 이동
-
-                    if assigned:
-                        break # 강의실 루프 탈출
-                if assigned:
-                    break # 요일 루프 탈출
-        
-        if not assigned:
+        if slot is None:
+            slot = _find_slot(grid, course, search_days, EXTRA_ROOM)
+
+        if slot is None:
             unassigned_courses.append(course['과목명'] + f" ({class_unit})")
+            continue
+
+        # 배정 실행
+        day, room, start_hour = slot
+        grid.place(day, room, course["교수"], class_unit, course["과목명"], start_hour, required_hours)
+        for h in range(start_hour, start_hour + required_hours):
+            room_schedule[(day, h, room)] = (course["과목명"], class_unit, course["교수"])
+        if placements is not None:
+            placements[course["id"]] = slot
+
+        # 부하 업데이트
+        class_day_load[class_unit][day] += required_hours
+        if day in course["선호_요일"]:
+            preference_hits += 1
+
+    if progress is not None:
+        progress(len(courses), len(courses))
             
+    return room_schedule, unassigned_courses, class_day_load, preference_hits
+
+
+def schedule_courses(courses: List[Dict[str, Any]], seed: Optional[int] = None,
+                     progress: Optional[ProgressCallback] = None,
+                     context: SchedulingContext = DEFAULT_CONTEXT) -> Tuple[Dict[Tuple[str, int, str], Tuple[str, str, str]], List[str]]:
+    """seed 를 주면 전역 random 대신 독립 난수 생성기를 사용하여 같은 입력에 대해 항상 같은 시간표를 만듭니다."""
+    rng = random.Random(seed) if seed is not None else random
+    room_schedule, unassigned_courses, _, _ = _greedy_assign(courses, rng, progress=progress, context=context)
     return room_schedule, unassigned_courses
 
 # =========================================================================
-# 🎨 HTML 시각화 함수 (generate_full_html_schedule) - 변경 없음
+# 🧩 제약 충족 탐색 함수 (solve_courses) - 백트래킹 + 분기 한정
+#   - 변수: 과목 / 값: (요일, 강의실, 시작 시간) 또는 미배정
+#   - 제약: 강의실·교수·배정 단위 중복 금지, 3과목 연속 금지(캡스톤 예외)
+#   - 목표: (미배정 과목 수, R_EXTRA 사용 시간) 사전식 최소화
 # =========================================================================
 
-def generate_full_html_schedule(schedule: Dict[Tuple[str, int, str], Tuple[str, str, str]], unassigned_courses: List[str]) -> str:
+def _schedule_score(schedule: Dict[Tuple[str, int, str], Tuple[str, str, str]], unassigned_courses: List[str],
+                    extra_room: str = DEFAULT_CONTEXT.extra_room) -> Tuple[int, int]:
+    extra_hours = sum(1 for (_, _, room) in schedule if room == extra_room)
+    return len(unassigned_courses), extra_hours
+
+
+def _course_domain(grid: OccupancyGrid, course: Dict[str, Any], search_days: List[str], rooms: List[str]) -> List[Tuple[str, str, int]]:
+    """현재 점유 상태에서 과목이 들어갈 수 있는 모든 (요일, 강의실, 시작 시간) 후보를 탐색 순서대로 반환합니다."""
+    values = []
+    for day in search_days:
+        for room in rooms:
+            for start_hour in grid.free_starts(day, room, course["교수"], course["배정_단위"], course["필요시간"]):
+                if not course["is_capstone"] and grid.violates_consecutive_rule(day, course["배정_단위"], course["과목명"], start_hour, course["필요시간"]):
+                    continue
+                values.append((day, room, start_hour))
+    return values
+
+
+def solve_courses(courses: List[Dict[str, Any]], time_limit: float = SOLVER_TIME_LIMIT,
+                  progress: Optional[ProgressCallback] = None,
+                  context: SchedulingContext = DEFAULT_CONTEXT) -> Tuple[Dict[Tuple[str, int, str], Tuple[str, str, str]], List[str]]:
+    """
+    그리디 결과를 초기 해로 두고, 제한 시간 안에서 더 나은 배정을 백트래킹으로 탐색합니다.
+    변수 선택은 MRV(후보가 가장 적은 과목) + 차수(같은 교수/배정 단위를 공유하는 남은 과목 수) 휴리스틱,
+    매 단계 남은 과목의 후보를 다시 계산하는 전방 검사(forward checking)로 가지치기합니다.
+    반환 형식은 schedule_courses 와 같습니다.
+    """
+    deadline = time.monotonic() + time_limit
+    courses = sorted(courses, key=lambda x: (-x['선호도_점수'], -x['필요시간']))
+
+    # 1. 초기 해: 그리디 결과 (탐색이 바로 끝나도 그리디보다 나빠지지 않음, 제한 시간이 지나면 그때까지 배정한 결과)
+    #    전역 random 대신 고정 시드를 써서 같은 입력이면 같은 초기 해에서 출발
+    best_schedule, best_unassigned, _, _ = _greedy_assign(list(courses), random.Random(SOLVER_SEED), context=context, deadline=deadline)
+    best_score = _schedule_score(best_schedule, best_unassigned, context.extra_room)
+    if time.monotonic() >= deadline:
+        return best_schedule, best_unassigned
+
+    REGULAR_ROOMS = context.rooms
+    EXTRA_ROOM = [context.extra_room]
+
+    # 차수 휴리스틱용: 남은 과목의 교수별 / 배정 단위별 / (교수, 배정 단위)별 개수
+    # 같은 교수 또는 같은 배정 단위를 공유하는 남은 과목 수 = 교수 + 배정 단위 - 둘 다 같은 과목 (자기 자신 제외)
+    remaining_by_professor = Counter(course["교수"] for course in courses)
+    remaining_by_unit = Counter(course["배정_단위"] for course in courses)
+    remaining_by_pair = Counter((course["교수"], course["배정_단위"]) for course in courses)
+
+    def peer_degree(idx: int) -> int:
+        professor, unit = courses[idx]["교수"], courses[idx]["배정_단위"]
+        return remaining_by_professor[professor] + remaining_by_unit[unit] - remaining_by_pair[(professor, unit)] - 1
+
+    def set_remaining(idx: int, is_remaining: bool) -> None:
+        step = 1 if is_remaining else -1
+        professor, unit = courses[idx]["교수"], courses[idx]["배정_단위"]
+        remaining_by_professor[professor] += step
+        remaining_by_unit[unit] += step
+        remaining_by_pair[(professor, unit)] += step
+        if is_remaining:
+            remaining.add(idx)
+        else:
+            remaining.discard(idx)
+
+    grid = OccupancyGrid(context)
+    class_day_load = {unit: {day: 0 for day in context.days} for unit in context.all_classes}
+    placements: Dict[int, Tuple[str, str, int]] = {}
+    skipped = set()
+    remaining = set(range(len(courses)))
+    extra_hours = 0
+    stack = []  # [과목 인덱스, 남은 후보 이터레이터]
+
+    def domains_of(idx: int):
+        course = courses[idx]
+        search_days = _search_days(course, class_day_load[course["배정_단위"]])
+        return (
+            _course_domain(grid, course, search_days, REGULAR_ROOMS),
+            _course_domain(grid, course, search_days, EXTRA_ROOM),
+        )
+
+    def select_variable():
+        """MRV + 차수로 다음 과목을 고르고, 한계값(lower bound)이 현재 최선 이상이거나 제한 시간이 지나면 None 을 반환합니다."""
+        forced_skips = 0
+        forced_extra_hours = 0
+        best_key = None
+        best_choice = None
+        for idx in remaining:
+            # 후보 계산이 과목마다 비싸므로 과목 하나마다 제한 시간 확인
+            if time.monotonic() >= deadline:
+                return None
+            regular_values, extra_values = domains_of(idx)
+            if not regular_values and not extra_values:
+                forced_skips += 1
+            elif not regular_values:
+                forced_extra_hours += courses[idx]["필요시간"]
+
+            key = (len(regular_values) + len(extra_values), -peer_degree(idx), idx)
+            if best_key is None or key < best_key:
+                best_key = key
+                best_choice = (idx, regular_values + extra_values)
+
+        lower_bound = (len(skipped) + forced_skips, extra_hours + forced_extra_hours)
+        if lower_bound >= best_score:
+            return None
+        idx, values = best_choice
+        return idx, values + [None]  # 마지막 후보: 미배정
+
+    def undo(idx: int):
+        nonlocal extra_hours
+        if idx in skipped:
+            skipped.discard(idx)
+            return
+        slot = placements.pop(idx, None)
+        if slot is None:
+            return
+        course = courses[idx]
+        day, room, start_hour = slot
+        grid.release(day, room, course["교수"], course["배정_단위"], start_hour, course["필요시간"])
+        class_day_load[course["배정_단위"]][day] -= course["필요시간"]
+        if room == context.extra_room:
+            extra_hours -= course["필요시간"]
+
+    def apply(idx: int, slot) -> None:
+        nonlocal extra_hours
+        if slot is None:
+            skipped.add(idx)
+            return
+        course = courses[idx]
+        day, room, start_hour = slot
+        grid.place(day, room, course["교수"], course["배정_단위"], course["과목명"], start_hour, course["필요시간"])
+        class_day_load[course["배정_단위"]][day] += course["필요시간"]
+        if room == context.extra_room:
+            extra_hours += course["필요시간"]
+        placements[idx] = slot
+
+    def advance() -> bool:
+        """스택 맨 위 과목의 다음 후보로 이동합니다. 더 이상 후보가 없으면 한 단계씩 되돌아갑니다."""
+        while stack:
+            idx, values = stack[-1]
+            undo(idx)
+            # 되돌린 뒤의 상태는 후보를 계산한 시점과 같으므로 남은 후보는 그대로 유효함
+            for slot in values:
+                apply(idx, slot)
+                return True
+            stack.pop()
+            set_remaining(idx, True)
+        return False
+
+    while time.monotonic() < deadline:
+        if progress is not None:
+            progress(len(courses) - len(remaining), len(courses))
+
+        if not remaining:
+            score = (len(skipped), extra_hours)
+            if score < best_score:
+                best_score = score
+                best_schedule = {}
+                for idx, (day, room, start_hour) in placements.items():
+                    course = courses[idx]
+                    for h in range(start_hour, start_hour + course["필요시간"]):
+                        best_schedule[(day, h, room)] = (course["과목명"], course["배정_단위"], course["교수"])
+                best_unassigned = [courses[idx]['과목명'] + f" ({courses[idx]['배정_단위']})" for idx in sorted(skipped)]
+                if best_score == (0, 0):
+                    break
+            if not advance():
+                break
+            continue
+
+        choice = select_variable()
+        if choice is None:
+            if not advance():
+                break
+            continue
+
+        idx, values = choice
+        set_remaining(idx, False)
+        stack.append([idx, iter(values)])
+        if not advance():
+            break
+
+    return best_schedule, best_unassigned
+
+
+# =========================================================================
+# 🔁 다중 재시작 함수 (schedule_with_restarts) - 시드별 그리디 결과 중 최선 선택
+#   - 점수: (미배정 수, R_EXTRA 사용 시간, -선호 요일 배정 수, 요일 부하 분산) 사전식 최소화
+# =========================================================================
+
+_RESTART_COURSES: List[Dict[str, Any]] = []
+_RESTART_CONTEXT: SchedulingContext = DEFAULT_CONTEXT
+
+
+def _init_restart_worker(courses: List[Dict[str, Any]], context: SchedulingContext = DEFAULT_CONTEXT) -> None:
+    # 워커 프로세스마다 과목 목록과 배정 설정을 한 번만 전달받아 재사용
+    global _RESTART_COURSES, _RESTART_CONTEXT
+    _RESTART_COURSES = courses
+    _RESTART_CONTEXT = context
+
+
+def _day_load_variance(class_day_load: Dict[str, Dict[str, int]]) -> float:
+    """배정이 있는 단위들의 요일별 부하 분산 합계 (작을수록 요일에 고르게 분포)."""
+    total = 0.0
+    for day_load in class_day_load.values():
+        loads = list(day_load.values())
+        if not any(loads):
+            continue
+        mean = sum(loads) / len(loads)
+        total += sum((load - mean) ** 2 for load in loads) / len(loads)
+    return total
+
+
+def _score_seed(courses: List[Dict[str, Any]], context: SchedulingContext, seed: int) -> Tuple[Tuple[int, int, int, float], int]:
+    schedule, unassigned, class_day_load, preference_hits = _greedy_assign(list(courses), random.Random(seed), context=context)
+    unassigned_count, extra_hours = _schedule_score(schedule, unassigned, context.extra_room)
+    return (unassigned_count, extra_hours, -preference_hits, _day_load_variance(class_day_load)), seed
+
+
+def _restart_score(seed: int) -> Tuple[Tuple[int, int, int, float], int]:
+    # 워커 프로세스용: _init_restart_worker 로 받아 둔 과목 목록/설정 사용
+    return _score_seed(_RESTART_COURSES, _RESTART_CONTEXT, seed)
+
+
+def schedule_with_restarts(courses: List[Dict[str, Any]], restarts: int = RESTART_COUNT, base_seed: Optional[int] = None,
+                           max_workers: Optional[int] = None, progress: Optional[ProgressCallback] = None,
+                           context: SchedulingContext = DEFAULT_CONTEXT) -> Tuple[Dict[Tuple[str, int, str], Tuple[str, str, str]], List[str], int]:
+    """
+    base_seed, base_seed + 1, ... 로 restarts 번 그리디 배정을 실행하고 가장 점수가 좋은 시간표와 그 시드를 반환합니다.
+    워커는 점수만 돌려주고, 최종 시간표는 schedule_courses(courses, seed=best_seed) 로 다시 만들어 재현성을 보장합니다.
+    """
+    if base_seed is None:
+        base_seed = random.randrange(2 ** 32)
+    seeds = [base_seed + i for i in range(max(1, restarts))]
+    workers = min(max_workers or os.cpu_count() or 1, len(seeds))
+
+    results = []
+    if workers <= 1:
+        # 현재 프로세스에서 실행: 전역 변수를 쓰지 않음 (같은 프로세스의 동시 호출이 서로 덮어쓰지 않도록)
+        for seed in seeds:
+            results.append(_score_seed(courses, context, seed))
+            if progress is not None:
+                progress(len(results), len(seeds))
+    else:
+        chunksize = max(1, len(seeds) // (workers * 4))
+        executor = ProcessPoolExecutor(max_workers=workers, initializer=_init_restart_worker, initargs=(courses, context))
+        try:
+            for result in executor.map(_restart_score, seeds, chunksize=chunksize):
+                results.append(result)
+                if progress is not None:
+                    progress(len(results), len(seeds))
+        except BaseException:
+            # 취소(progress 에서 JobCancelled) 등으로 중단되면 남은 시드를 기다리지 않고 버림
+            executor.shutdown(wait=False, cancel_futures=True)
+            raise
+        executor.shutdown()
+
+    _, best_seed = min(results)
+    schedule, unassigned = schedule_courses(list(courses), seed=best_seed, context=context)
+    return schedule, unassigned, best_seed
+
+
+# =========================================================================
+# 🎨 HTML 시각화 함수 (generate_full_html_schedule) - 역색인 + 리스트 버퍼 렌더링
+# =========================================================================
+
+def _build_cell_index(schedule: Dict[Tuple[str, int, str], Tuple[str, str, str]],
+                      context: SchedulingContext = DEFAULT_CONTEXT) -> Dict[Tuple[str, str, int], Tuple[str, str, str]]:
+    """
+    시간표를 한 번만 훑어 (배정 단위, 요일, 시간) -> (과목명, 교수, 강의실) 역색인을 만듭니다.
+    같은 칸에 여러 강의실이 겹치면 설정의 강의실 순서상 앞선 강의실을 사용합니다. (기존 렌더링과 동일)
+    """
+    room_order = context.room_ids
+    cell_index = {}
+    cell_room_rank = {}
+    for (day, hour, room), (course_name, unit, professor_name) in schedule.items():
+        rank = room_order.get(room)
+        if rank is None:
+            continue
+        key = (unit, day, hour)
+        if key in cell_room_rank and cell_room_rank[key] <= rank:
+            continue
+        cell_room_rank[key] = rank
+        cell_index[key] = (course_name, professor_name, room)
+    return cell_index
+
+
+def generate_full_html_schedule(schedule: Dict[Tuple[str, int, str], Tuple[str, str, str]], unassigned_courses: List[str],
+                                context: SchedulingContext = DEFAULT_CONTEXT) -> str:
     
     TEXT_COLOR = COLOR_MAP["TEXT"]
     BG_COLOR_MAIN_HEADER = COLOR_MAP["HEADER_MAIN"]
@@ -363,11 +631,21 @@ def generate_full_html_schedule(schedule: Dict[Tuple[str, int, str], Tuple[str,
         key = key[:4] if key.startswith("BD-") else key 
         return COLOR_MAP.get(key, BG_COLOR_EMPTY)
 
+    # 📌 (배정 단위, 요일, 시간) 역색인: 칸마다 모든 강의실을 뒤지지 않도록 한 번만 생성
+    cell_index = _build_cell_index(schedule, context)
+    days = context.days
+    hours = context.hours
+    num_hours = context.num_hours
+    extra_room = context.extra_room
+
+    # 문자열 += 대신 리스트에 모아 마지막에 한 번에 join
+    html_parts = []
+    append = html_parts.append
     
-    full_html = f"<h2 style='text-align: center; color: {TEXT_COLOR};'>🏛️ 강의실 배정 결과 시간표 (학과 통합/분리) 🗓️</h2>"
+    append(f"<h2 style='text-align: center; color: {TEXT_COLOR};'>🏛️ 강의실 배정 결과 시간표 (학과 통합/분리) 🗓️</h2>")
     
     if unassigned_courses:
-        full_html += f"<div style='border: 2px solid red; padding: 10px; margin: 10px 0; background-color: #ffe0e0; color: #cc0000; font-weight: bold;'>⚠️ 배정 실패 과목: {', '.join(unassigned_courses)} - 시간/강의실/교수/연속 강의 충돌</div>"
+        append(f"<div style='border: 2px solid red; padding: 10px; margin: 10px 0; background-color: #ffe0e0; color: #cc0000; font-weight: bold;'>⚠️ 배정 실패 과목: {', '.join(unassigned_courses)} - 시간/강의실/교수/연속 강의 충돌</div>")
 
     
     table_style = f"width: 100%; border-collapse: collapse; text-align: center; font-size: 13px; color: {TEXT_COLOR}; table-layout: fixed;"
@@ -375,41 +653,75 @@ def generate_full_html_schedule(schedule: Dict[Tuple[str, int, str], Tuple[str,
     time_header_style = f"padding: 5px; font-weight: bold; background-color: {BG_COLOR_TIME_HEADER}; border: {THIN_BORDER}; color: {TEXT_COLOR};"
     cell_style = f"padding: 5px; height: 60px; border: {THIN_BORDER}; vertical-align: middle;"
 
-    full_html += f"<table border='0' style='{table_style}'>"
+    append(f"<table border='0' style='{table_style}'>")
     
     # 메인 헤더 (요일별 시간)
-    full_html += "<thead><tr>"
-    full_html += f"<th rowspan='2' colspan='2' style='{header_style}'>학과/학년/반</th>" 
+    append("<thead><tr>")
+    append(f"<th rowspan='2' colspan='2' style='{header_style}'>학과/학년/반</th>")
     
-    for i, day in enumerate(DAYS):
+    for i, day in enumerate(days):
         day_header_style = header_style
-        if i < len(DAYS) - 1:
+        if i < len(days) - 1:
             day_header_style += f" border-right: {THICK_BORDER};"
         
-        full_html += f"<th colspan='{END_HOUR - START_HOUR}' style='{day_header_style}'>{day}</th>"
-    full_html += "</tr>"
+        append(f"<th colspan='{num_hours}' style='{day_header_style}'>{day}</th>")
+    append("</tr>")
     
     # 시간 헤더
-    full_html += "<tr>"
-    for day_index, _ in enumerate(DAYS):
-        for hour_index, hour in enumerate(range(START_HOUR, END_HOUR)):
+    append("<tr>")
+    for day_index, _ in enumerate(days):
+        for hour_index, hour in enumerate(hours):
             time_style = time_header_style
-            if hour_index == END_HOUR - START_HOUR - 1 and day_index < len(DAYS) - 1:
+            if hour_index == num_hours - 1 and day_index < len(days) - 1:
                 time_style += f" border-right: {THICK_BORDER};"
 
-            full_html += f"<th style='{time_style}'>{hour}:00</th>"
-    full_html += "</tr></thead>"
+            append(f"<th style='{time_style}'>{hour}:00</th>")
+    append("</tr></thead>")
     
-    full_html += "<tbody>"
+    append("<tbody>")
+
+    def append_unit_cells(class_unit: str, grade_base_color: str, is_last: bool) -> None:
+        """한 배정 단위의 요일 x 시간 칸을 역색인 조회로 출력합니다."""
+        filled_style = cell_style + f" background-color: {grade_base_color}; font-weight: 500;"
+        empty_style = cell_style + f" background-color: {BG_COLOR_EMPTY};"
+        bottom_style = f" border-bottom: {THICK_BORDER};" if is_last else ""
+
+        for day_index, day in enumerate(days):
+            for hour_index, hour in enumerate(hours):
+                entry = cell_index.get((class_unit, day, hour))
+                if entry is not None:
+                    course_name, professor_name, room = entry
+                    room_display = room if room != extra_room else f"<span style='color: red; font-weight: bold;'>{extra_room}</span>"
+                    cell_content = (
+                        f"<div style='font-weight: bold; color: {TEXT_COLOR};'>{course_name}</div>"
+                        f"<div style='font-size: 11px; color: {TEXT_COLOR};'>({professor_name})</div>"
+                        f"<div style='font-size: 10px; color: #333; margin-top: 3px;'>{room_display}</div>" 
+                    )
+                    final_cell_style = filled_style
+                else:
+                    cell_content = ""
+                    final_cell_style = empty_style
+                
+                if hour_index == num_hours - 1 and day_index < len(days) - 1:
+                    final_cell_style += f" border-right: {THICK_BORDER};"
+                
+                append(f"<td style='{final_cell_style}{bottom_style}'>{cell_content}</td>")
     
     # 📌 1. SW 통합 그룹 출력 (소프트웨어융합과, 코딩전공)
-    full_html += f"<tr><td colspan='{2 + len(DAYS) * (END_HOUR - START_HOUR)}' style='{header_style}; background-color: #b3e5fc; border-top: {THICK_BORDER};'>⭐ 소프트웨어 통합 학과 시간표 (소프트웨어융합과/코딩전공) ⭐</td></tr>"
+    append(f"<tr><td colspan='{2 + len(days) * num_hours}' style='{header_style}; background-color: #b3e5fc; border-top: {THICK_BORDER};'>⭐ 소프트웨어 통합 학과 시간표 (소프트웨어융합과/코딩전공) ⭐</td></tr>")
     
-    for i, class_unit in enumerate(SW_CLASSES):
+    # 학년별 행 수 (A/B 분반 학년은 학년 칸을 분반 수만큼 세로 병합)
+    sw_classes = context.sw_classes
+    grade_row_counts = {}
+    for class_unit in sw_classes:
+        grade_row_counts[class_unit[3]] = grade_row_counts.get(class_unit[3], 0) + 1
+
+    for i, class_unit in enumerate(sw_classes):
         grade_base_color = get_course_bg_color(class_unit)
-        is_last_in_grade = (class_unit.endswith('B') and class_unit != 'SW-3B') or (class_unit == 'SW-4') or (class_unit == 'SW-3B')
+        is_last_in_grade = i == len(sw_classes) - 1 or sw_classes[i + 1][3] != class_unit[3]
+        is_first_in_grade = i == 0 or sw_classes[i - 1][3] != class_unit[3]
         
-        full_html += "<tr>"
+        append("<tr>")
         
         grade_num = class_unit[3]
         
@@ -417,60 +729,32 @@ def generate_full_html_schedule(schedule: Dict[Tuple[str, int, str], Tuple[str,
         if is_last_in_grade:
              grade_header_style += f" border-bottom: {THICK_BORDER};"
         
-        if class_unit.endswith('A'):
-            full_html += f"<td rowspan='2' style='{grade_header_style}'>{grade_num}학년</td>"
-        elif class_unit == 'SW-4':
-            full_html += f"<td colspan='2' style='{grade_header_style}'>{grade_num}학년</td>"
+        if class_unit.endswith('A') or class_unit.endswith('B'):
+            if is_first_in_grade:
+                append(f"<td rowspan='{grade_row_counts[grade_num]}' style='{grade_header_style}'>{grade_num}학년</td>")
+        else:
+            append(f"<td colspan='2' style='{grade_header_style}'>{grade_num}학년</td>")
         
         if class_unit.endswith('A') or class_unit.endswith('B'):
             class_display = class_unit[-1] + '반'
             ban_header_style = f"border: {THIN_BORDER}; background-color: {BG_COLOR_TIME_HEADER}; font-size: 11px; color: {TEXT_COLOR}; font-weight: bold;"
             if is_last_in_grade:
                 ban_header_style += f" border-bottom: {THICK_BORDER};"
-            full_html += f"<td style='{ban_header_style}'>{class_display}</td>"
+            append(f"<td style='{ban_header_style}'>{class_display}</td>")
         
-        for day_index, day in enumerate(DAYS):
-            for hour_index, hour in enumerate(range(START_HOUR, END_HOUR)):
-                cell_content = ""
-                
-                for room in ROOMS:
-                    key = (day, hour, room)
-                    if key in schedule:
-                        course_name, unit, professor_name = schedule[key]
-                        
-                        if unit == class_unit:
-                            room_display = room if room != "R_EXTRA" else "<span style='color: red; font-weight: bold;'>R_EXTRA</span>"
-                            cell_content = (
-                                f"<div style='font-weight: bold; color: {TEXT_COLOR};'>{course_name}</div>"
-                                f"<div style='font-size: 11px; color: {TEXT_COLOR};'>({professor_name})</div>"
-                                f"<div style='font-size: 10px; color: #333; margin-top: 3px;'>{room_display}</div>" 
-                            )
-                            break
-
-                final_cell_style = cell_style
-                if cell_content:
-                    final_cell_style += f" background-color: {grade_base_color}; font-weight: 500;"
-                else:
-                    final_cell_style += f" background-color: {BG_COLOR_EMPTY};"
+        append_unit_cells(class_unit, grade_base_color, is_last_in_grade)
                 
-                if hour_index == END_HOUR - START_HOUR - 1 and day_index < len(DAYS) - 1:
-                    final_cell_style += f" border-right: {THICK_BORDER};"
-                
-                if is_last_in_grade:
-                    final_cell_style += f" border-bottom: {THICK_BORDER};"
-
-                full_html += f"<td style='{final_cell_style}'>{cell_content}</td>"
-                
-        full_html += "</tr>"
+        append("</tr>")
 
     # 📌 2. BD 독립 그룹 출력 (빅데이터과)
-    full_html += f"<tr><td colspan='{2 + len(DAYS) * (END_HOUR - START_HOUR)}' style='{header_style}; background-color: #b3e5fc; border-top: {THICK_BORDER};'>⭐ 빅데이터과 독립 시간표 ⭐</td></tr>"
+    append(f"<tr><td colspan='{2 + len(days) * num_hours}' style='{header_style}; background-color: #b3e5fc; border-top: {THICK_BORDER};'>⭐ 빅데이터과 독립 시간표 ⭐</td></tr>")
 
-    for i, class_unit in enumerate(BD_CLASSES):
+    bd_classes = context.bd_classes
+    for i, class_unit in enumerate(bd_classes):
         grade_base_color = get_course_bg_color(class_unit)
-        is_last_in_bd = (i == len(BD_CLASSES) - 1)
+        is_last_in_bd = (i == len(bd_classes) - 1)
         
-        full_html += "<tr>"
+        append("<tr>")
         
         grade_num = class_unit[3]
         
@@ -478,79 +762,75 @@ def generate_full_html_schedule(schedule: Dict[Tuple[str, int, str], Tuple[str,
         if is_last_in_bd:
             bd_header_style += f" border-bottom: {THICK_BORDER};"
             
-        full_html += f"<td colspan='2' style='{bd_header_style}'>{grade_num}학년</td>"
-
-        for day_index, day in enumerate(DAYS):
-            for hour_index, hour in enumerate(range(START_HOUR, END_HOUR)):
-                cell_content = ""
-                
-                for room in ROOMS:
-                    key = (day, hour, room)
-                    if key in schedule:
-                        course_name, unit, professor_name = schedule[key]
-                        
-                        if unit == class_unit:
-                            room_display = room if room != "R_EXTRA" else "<span style='color: red; font-weight: bold;'>R_EXTRA</span>"
-                            cell_content = (
-                                f"<div style='font-weight: bold; color: {TEXT_COLOR};'>{course_name}</div>"
-                                f"<div style='font-size: 11px; color: {TEXT_COLOR};'>({professor_name})</div>"
-                                f"<div style='font-size: 10px; color: #333; margin-top: 3px;'>{room_display}</div>"
-                            )
-                            break
-
-                final_cell_style = cell_style
-                if cell_content:
-                    final_cell_style += f" background-color: {grade_base_color}; font-weight: 500;"
-                else:
-                    final_cell_style += f" background-color: {BG_COLOR_EMPTY};"
+        append(f"<td colspan='2' style='{bd_header_style}'>{grade_num}학년</td>")
 
-                if hour_index == END_HOUR - START_HOUR - 1 and day_index < len(DAYS) - 1:
-                    final_cell_style += f" border-right: {THICK_BORDER};"
+        append_unit_cells(class_unit, grade_base_color, is_last_in_bd)
                 
-                if is_last_in_bd:
-                    final_cell_style += f" border-bottom: {THICK_BORDER};"
-                
-                full_html += f"<td style='{final_cell_style}'>{cell_content}</td>"
-                
-        full_html += "</tr>"
+        append("</tr>")
 
-    full_html += "</tbody></table>"
+    append("</tbody></table>")
     
     # 5. 강의실 사용 현황 (R_EXTRA)
-    full_html += f"<h3 style='margin-top: 30px; color: {TEXT_COLOR};'>⚠️ 임시 할당 강의실 사용 현황 (R_EXTRA)</h3>"
-    used_extra_room = False
-    extra_room_details = ""
-    for (day, hour, room), (course, unit, professor) in schedule.items():
-        if room == "R_EXTRA":
-            extra_room_details += f"<li>{day} {hour}:00 ({unit}, {professor}): **{course}**</li>"
-            used_extra_room = True
+    append(f"<h3 style='margin-top: 30px; color: {TEXT_COLOR};'>⚠️ 임시 할당 강의실 사용 현황 ({extra_room})</h3>")
+    extra_room_details = [
+        f"<li>{day} {hour}:00 ({unit}, {professor}): **{course}**</li>"
+        for (day, hour, room), (course, unit, professor) in schedule.items()
+        if room == extra_room
+    ]
             
-    if used_extra_room:
-        full_html += f"<ul style='color: #cc0000; font-weight: bold;'>{extra_room_details}</ul>"
+    if extra_room_details:
+        append(f"<ul style='color: #cc0000; font-weight: bold;'>{''.join(extra_room_details)}</ul>")
     else:
-        full_html += "<p style='color: green;'>✅ 추가 강의실 (R_EXTRA)는 사용되지 않았습니다.</p>"
+        append(f"<p style='color: green;'>✅ 추가 강의실 ({extra_room})는 사용되지 않았습니다.</p>")
             
-    return full_html
+    return "".join(html_parts)
 
 
 # =========================================================================
-# 🚀 메인 스케줄러 실행 함수 (run_scheduler) - 변경 없음
+# 🚀 메인 스케줄러 실행 함수 (run_scheduler) - 배정 방식 선택 지원
 # =========================================================================
-def run_scheduler(file_path: str) -> str:
+def run_scheduler(file_path: str, mode: str = "greedy", time_limit: float = SOLVER_TIME_LIMIT, seed: Optional[int] = None,
+                  context: SchedulingContext = DEFAULT_CONTEXT) -> str:
     
     try:
-        courses = load_courses(file_path)
+        courses = load_courses(file_path, context)
     except ValueError as e:
         return f"<div style='border: 2px solid red; padding: 20px; background-color: #ffe0e0; color: #cc0000; font-weight: bold;'>❌ 데이터 로드 실패: {e}</div>"
     except Exception:
         return f"<div style='border: 2px solid red; padding: 20px; background-color: #ffe0e0; color: #cc0000; font-weight: bold;'>❌ 알 수 없는 오류가 발생했습니다. 파일 내용을 다시 한번 확인해주세요.</div>"
 
 
+    return schedule_and_render(courses, mode=mode, time_limit=time_limit, seed=seed, context=context)
+
+
+def run_schedule(courses: List[Dict[str, Any]], mode: str = "greedy", time_limit: float = SOLVER_TIME_LIMIT, seed: Optional[int] = None,
+                 progress: Optional[ProgressCallback] = None, context: SchedulingContext = DEFAULT_CONTEXT,
+                 max_workers: Optional[int] = None) -> Dict[str, Any]:
+    """
+    배정을 실행하고 {"schedule", "unassigned", "seed", "html"} 를 반환합니다. (결과 캐시/작업 큐에서 사용)
+    max_workers 는 restarts 방식의 프로세스 수입니다. (기본: CPU 코어 수)
+    """
     if not courses:
-        return f"<div style='border: 2px solid orange; padding: 20px; background-color: #fff3e0; color: #ff9800; font-weight: bold;'>⚠️ 경고: 파일에서 유효한 강의 데이터를 찾지 못했습니다. CSV 파일의 **개설학년, 교과목학점, 수강인원** 필드가 숫자로 채워져 있는지 확인해주세요.</div>"
+        html_output = f"<div style='border: 2px solid orange; padding: 20px; background-color: #fff3e0; color: #ff9800; font-weight: bold;'>⚠️ 경고: 파일에서 유효한 강의 데이터를 찾지 못했습니다. CSV 파일의 **개설학년, 교과목학점, 수강인원** 필드가 숫자로 채워져 있는지 확인해주세요.</div>"
+        return {"schedule": {}, "unassigned": [], "seed": seed, "html": html_output}
     
-    schedule, unassigned = schedule_courses(courses)
+    if mode == "solver":
+        schedule, unassigned = solve_courses(courses, time_limit=time_limit, progress=progress, context=context)
+    elif mode == "restarts":
+        schedule, unassigned, seed = schedule_with_restarts(courses, base_seed=seed, max_workers=max_workers, progress=progress, context=context)
+    else:
+        schedule, unassigned = schedule_courses(courses, seed=seed, progress=progress, context=context)
     
-    html_output = generate_full_html_schedule(schedule, unassigned)
+    html_output = generate_full_html_schedule(schedule, unassigned, context)
+
+    # 시드를 함께 표시하여 같은 CSV + 시드로 시간표를 그대로 재현할 수 있도록 함
+    if seed is not None and mode != "solver":
+        html_output += f"<p style='color: #555;'>🎲 재현용 시드: <b>{seed}</b> (같은 CSV를 빠른 배정 + 이 시드로 실행하면 동일한 시간표가 생성됩니다.)</p>"
     
-    return html_output
\ No newline at end of file
+    return {"schedule": schedule, "unassigned": unassigned, "seed": seed, "html": html_output}
+
+
+def schedule_and_render(courses: List[Dict[str, Any]], mode: str = "greedy", time_limit: float = SOLVER_TIME_LIMIT, seed: Optional[int] = None,
+                        progress: Optional[ProgressCallback] = None, context: SchedulingContext = DEFAULT_CONTEXT) -> str:
+    """이미 읽어 들인 과목 목록으로 배정을 실행하고 결과 HTML 을 반환합니다. (스트리밍 업로드 경로에서 사용)"""
+    return run_schedule(courses, mode=mode, time_limit=time_limit, seed=seed, progress=progress, context=context)["html"]
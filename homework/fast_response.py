@@ -0,0 +1,15 @@
+# fast_response.py (homework 폴더 안에서 실행할 때 쓰는 연결 모듈: cd homework; uvicorn main4:app)
+#
+# 구현은 저장소 최상위 fast_response.py 하나뿐이며, 여기서는 그 파일을 불러와 같은 이름으로 내보냅니다.
+# 저장소 최상위에서 실행하면 (uvicorn homework.main4:app) 이 모듈 대신 최상위 모듈이 바로 쓰입니다.
+
+import importlib.util
+import os
+
+_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "fast_response.py")
+_spec = importlib.util.spec_from_file_location("_fast_response", _PATH)
+_module = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(_module)
+
+FastJSONResponse = _module.FastJSONResponse
+dumps = _module.dumps
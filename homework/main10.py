@@ -1,8 +1,9 @@
 from fastapi import FastAPI
 from pydantic import BaseModel
 from typing import List, Union
+from fast_response import FastJSONResponse
 
-app = FastAPI()
+app = FastAPI(default_response_class=FastJSONResponse)
 
 class Image(BaseModel):
     url: str
@@ -18,4 +19,4 @@ class Item(BaseModel):
 
 @app.post("/items/")
 async def create_item(item: Item):
-    return item
+    return FastJSONResponse(item)
@@ -1,7 +1,8 @@
 from fastapi import FastAPI
 from pydantic import BaseModel, Field
+from fast_response import FastJSONResponse
 
-app = FastAPI()
+app = FastAPI(default_response_class=FastJSONResponse)
 
 class Item(BaseModel):
     name: str = Field(examples=["Foo"])
@@ -11,4 +12,4 @@ class Item(BaseModel):
 
 @app.put("/items/{item_id}")
 async def update_item(item_id: int, item: Item):
-    return {"item_id": item_id, "item": item}
+    return FastJSONResponse({"item_id": item_id, "item": item})
@@ -2,8 +2,9 @@ from fastapi import FastAPI
 from pydantic import BaseModel
 from datetime import datetime, date, time, timedelta
 from uuid import UUID
+from fast_response import FastJSONResponse
 
-app = FastAPI()
+app = FastAPI(default_response_class=FastJSONResponse)
 
 class Item(BaseModel):
     id: UUID
@@ -14,4 +15,4 @@ class Item(BaseModel):
 
 @app.post("/items/")
 async def create_item(item: Item):
-    return item
+    return FastJSONResponse(item)
@@ -1,7 +1,8 @@
 from fastapi import FastAPI
 from pydantic import BaseModel
+from fast_response import FastJSONResponse
 
-app = FastAPI()
+app = FastAPI(default_response_class=FastJSONResponse)
 
 class Item(BaseModel):
     name: str
@@ -11,4 +12,4 @@ class Item(BaseModel):
 
 @app.post("/items/")
 async def create_item(item: Item):
-    return item
+    return FastJSONResponse(item)
@@ -1,10 +1,11 @@
 from fastapi import FastAPI, Query
+from fast_response import FastJSONResponse
 
-app = FastAPI()
+app = FastAPI(default_response_class=FastJSONResponse)
 
 @app.get("/items/")
 async def read_items(q: str = Query(None, min_length=3, max_length=50, regex="^fixedquery$")):
     results = {"items": [{"item_id": "Foo"}, {"item_id": "Bar"}]}
     if q:
         results.update({"q": q})
-    return results
+    return FastJSONResponse(results)
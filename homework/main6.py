@@ -1,7 +1,8 @@
 from fastapi import FastAPI, Path
+from fast_response import FastJSONResponse
 
-app = FastAPI()
+app = FastAPI(default_response_class=FastJSONResponse)
 
 @app.get("/items/{item_id}")
 async def read_item(item_id: int = Path(..., title="The ID of the item to get", ge=1, le=1000)):
-    return {"item_id": item_id}
+    return FastJSONResponse({"item_id": item_id})
@@ -1,9 +1,10 @@
 from fastapi import FastAPI, Query
 from typing import List, Optional
+from fast_response import FastJSONResponse
 
-app = FastAPI()
+app = FastAPI(default_response_class=FastJSONResponse)
 
 @app.get("/items/")
 async def read_items(q: Optional[List[str]] = Query(None)):
     query_items = {"q": q}
-    return query_items
+    return FastJSONResponse(query_items)
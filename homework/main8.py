@@ -1,7 +1,8 @@
 from fastapi import FastAPI
 from pydantic import BaseModel
+from fast_response import FastJSONResponse
 
-app = FastAPI()
+app = FastAPI(default_response_class=FastJSONResponse)
 
 class Item(BaseModel):
     name: str
@@ -14,4 +15,4 @@ async def update_item(item_id: int, item: Item, q: str | None = None):
     result = {"item_id": item_id, **item.dict()}
     if q:
         result.update({"q": q})
-    return result
+    return FastJSONResponse(result)
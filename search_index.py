@@ -0,0 +1,71 @@
+# search_index.py (이름 검색 공용 규칙: 정규화 + 한글 초성 변환/비교 + 검색 결과 페이지)
+#
+#   normalize("Kim 민수")                     # 'kim 민수' - 저장/검색 모두 이 형태로 비교
+#   to_choseong("김민수")                     # 'ㄱㅁㅅ'
+#   matches_initials("김민수", "ㄱㅁㅅ", "김ㅁ", "ㄱㅁ")   # 완성 글자 + 초성 섞어 쓰기
+#   char_phrase("민수")                         # '"민 수"' - 1~2글자 검색어용 글자 단위 색인의 MATCH 구
+#
+# 실제 색인/검색은 server_store.CatalogStore (SQLite FTS5) 가 이 규칙으로 수행합니다.
+
+import unicodedata
+from typing import List, Dict, Any, Optional, NamedTuple
+
+# 한글 음절 (가~힣) -> 초성: (코드 - 0xAC00) // (21 * 28)
+HANGUL_BASE = 0xAC00
+HANGUL_LAST = 0xD7A3
+SYLLABLES_PER_CHOSEONG = 21 * 28
+CHOSEONG = "ㄱㄲㄴㄷㄸㄹㅁㅂㅃㅅㅆㅇㅈㅉㅊㅋㅌㅍㅎ"
+_CHOSEONG_SET = frozenset(CHOSEONG)
+
+DEFAULT_PAGE_SIZE = 20
+
+
+def normalize(text: str) -> str:
+    """검색 비교용 정규화: NFC 로 합친 뒤 casefold (한글 자모가 분리 입력되어도 같은 글자로 비교)."""
+    return unicodedata.normalize("NFC", text).casefold()
+
+
+# 음절 11172자 -> 초성 변환표 (str.translate 로 한 번에 변환)
+_CHOSEONG_TABLE = {code: CHOSEONG[(code - HANGUL_BASE) // SYLLABLES_PER_CHOSEONG] for code in range(HANGUL_BASE, HANGUL_LAST + 1)}
+
+
+def to_choseong(text: str) -> str:
+    """한글 음절을 초성으로 바꾼 문자열 (그 밖의 글자는 그대로). 입력과 길이가 같습니다."""
+    return text.translate(_CHOSEONG_TABLE)
+
+
+def has_choseong(text: str) -> bool:
+    return any(ch in _CHOSEONG_SET for ch in text)
+
+
+def matches_initials(name: str, initials: str, query: str, query_initials: str) -> bool:
+    """초성이 섞인 query 가 name 에 들어 있는지: 초성 문자열에서 위치를 찾고, 그 위치에서 완성 글자는 글자 그대로 같은지 확인."""
+    start = initials.find(query_initials)
+    while start >= 0:
+        if all(q in _CHOSEONG_SET or q == name[start + i] for i, q in enumerate(query)):
+            return True
+        start = initials.find(query_initials, start + 1)
+    return False
+
+
+# 1~2글자 검색어용 글자 단위 색인 (SQLite FTS5): 글자 사이를 띄어 써서 글자 하나가 토큰 하나가 되게 넣고,
+# 1글자는 토큰 하나, 2글자는 이웃한 두 토큰의 구(phrase)로 찾습니다. (토큰 위치가 곧 1/2글자 조각 색인)
+# 글자/숫자가 아닌 문자는 토크나이저가 버리므로 그 양옆 글자도 이웃으로 잡힘 -> 후보는 원래 문자열로 다시 확인합니다.
+CHAR_TOKENIZER = "unicode61 remove_diacritics 0"
+
+
+def spaced(text: str) -> str:
+    """글자 단위 색인에 넣는 형태 ('김민수' -> '김 민 수')."""
+    return " ".join(text)
+
+
+def char_phrase(needle: str) -> Optional[str]:
+    """글자 단위 색인의 MATCH 구. 글자/숫자가 하나도 없으면 색인으로 찾을 수 없으므로 None."""
+    if not any(ch.isalnum() for ch in needle):
+        return None
+    return '"' + spaced(needle).replace('"', '""') + '"'
+
+
+class SearchPage(NamedTuple):
+    items: List[Dict[str, Any]]
+    next_cursor: Optional[int]   # 다음 페이지 첫 레코드 ID (없으면 None)
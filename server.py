@@ -1,3 +1,11 @@
+import argparse
+import os
+from server_store import CatalogStore
+
+# 검색 결과 / 전체 목록을 한 번에 보여줄 개수
+PAGE_SIZE = 20
+
+# 저장소가 비어 있을 때 넣는 초기 데이터
 # 고객 목록
 customers = [
     {"name": "김민수", "age": 29, "address": "경기도 성남시 판교", "phone": "010-1234-5678"},
@@ -12,37 +20,86 @@ products = [
     {"name": "수제 맥주(500ml)", "price": 7000, "description": "지역 수수제 맥주"}
 ]
 
+# 고객/상품 저장소 (SQLite 파일, 이름 검색 색인 포함) - open_store() 에서 생성
+store = None
+
+
+def open_store(db_path=None):
+    """저장소를 열고, 처음 만든 저장소이면 초기 데이터를 넣습니다."""
+    global store
+    store = CatalogStore(db_path)
+    if store.count("customers") == 0:
+        store.bulk_insert("customers", customers)
+    if store.count("products") == 0:
+        store.bulk_insert("products", products)
+    return store
+
+
+def add_customer(customer):
+    return store.add("customers", customer)
+
+
+def add_product(product):
+    return store.add("products", product)
+
+
+def print_customer(c):
+    print(f"{c['name']} | 나이: {c['age']} | 주소: {c['address']} | 전화: {c['phone']}")
+
+
+def print_product(p):
+    print(f"{p['name']} | 단가: {p['price']}원 | 설명: {p['description']}")
+
+
+def ask_next_page():
+    return input("다음 페이지를 보려면 Enter, 그만 보려면 q: ").strip().lower() != "q"
+
+
+def print_search_pages(kind, query, print_record):
+    """검색 결과를 PAGE_SIZE 개씩 출력합니다. 다음 페이지가 있으면 Enter 로 계속, q 로 중단."""
+    page = store.search(kind, query, limit=PAGE_SIZE)
+    if not page.items:
+        print("검색 결과가 없습니다.")
+        return
+    print("\n-- 검색 결과 --")
+    while True:
+        for record in page.items:
+            print_record(record)
+        if page.next_cursor is None:
+            break
+        if not ask_next_page():
+            break
+        page = store.search(kind, query, cursor=page.next_cursor, limit=PAGE_SIZE)
+
+def print_all_pages(kind, print_record):
+    """저장된 레코드 전체를 PAGE_SIZE 개씩 출력합니다. (한 번에 한 페이지만 읽음)"""
+    pages = store.iter_pages(kind, PAGE_SIZE)
+    page = next(pages, None)
+    while page is not None:
+        for record in page:
+            print_record(record)
+        page = next(pages, None)
+        if page is not None and not ask_next_page():
+            break
+
+
 def show_all():
     print("\n=== 전체 정보 ===")
-    print("\n-- 고객 목록 --")
-    for c in customers:
-        print(f"{c['name']} | 나이: {c['age']} | 주소: {c['address']} | 전화: {c['phone']}")
+    print(f"\n-- 고객 목록 ({store.count('customers')}명) --")
+    print_all_pages("customers", print_customer)
     
-    print("\n-- 상품 목록 --")
-    for p in products:
-        print(f"{p['name']} | 단가: {p['price']}원 | 설명: {p['description']}")
+    print(f"\n-- 상품 목록 ({store.count('products')}개) --")
+    print_all_pages("products", print_product)
     print("================\n")
 
 def search_customers():
-    query = input("검색할 고객명을 입력하세요 (전체조회는 Enter): ")
-    result = [c for c in customers if query.lower() in c["name"].lower()]
-    if not result:
-        print("검색 결과가 없습니다.")
-    else:
-        print("\n-- 검색 결과 --")
-        for c in result:
-            print(f"{c['name']} | 나이: {c['age']} | 주소: {c['address']} | 전화: {c['phone']}")
+    query = input("검색할 고객명을 입력하세요 (초성 검색 가능, 전체조회는 Enter): ")
+    print_search_pages("customers", query, print_customer)
     print("================\n")
 
 def search_products():
-    query = input("검색할 상품명을 입력하세요 (전체조회는 Enter): ")
-    result = [p for p in products if query.lower() in p["name"].lower()]
-    if not result:
-        print("검색 결과가 없습니다.")
-    else:
-        print("\n-- 검색 결과 --")
-        for p in result:
-            print(f"{p['name']} | 단가: {p['price']}원 | 설명: {p['description']}")
+    query = input("검색할 상품명을 입력하세요 (초성 검색 가능, 전체조회는 Enter): ")
+    print_search_pages("products", query, print_product)
     print("================\n")
 
 # 메인 메뉴
@@ -67,5 +124,39 @@ def menu():
         else:
             print("잘못된 선택입니다. 다시 입력하세요.\n")
 
-if __name__ == "__main__":
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="고객/상품 조회 프로그램")
+    parser.add_argument("--db", help="저장소 SQLite 파일 (기본: server.db 또는 SERVER_DB_PATH)")
+    parser.add_argument("--import", dest="import_args", nargs=2, action="append", metavar=("KIND", "PATH"),
+                        help="CSV 또는 JSON(.json/.jsonl) 파일 일괄 가져오기 (KIND: customers / products)")
+    parser.add_argument("--export", dest="export_args", nargs=2, action="append", metavar=("KIND", "PATH"),
+                        help="CSV 또는 JSON Lines(.json/.jsonl) 파일로 내보내기")
+    parser.add_argument("--serve", action="store_true", help="메뉴 대신 HTTP API 서버 실행 (server_api.py)")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--workers", type=int, default=1, help="API 서버 워커 프로세스 수")
+    args = parser.parse_args(argv)
+
+    if args.db:
+        # API 워커 프로세스도 같은 저장소를 열도록 환경 변수로 전달
+        os.environ["SERVER_DB_PATH"] = args.db
+    # 워커들이 동시에 초기 데이터를 넣지 않도록 서버 시작 전에 한 번 열어 둠
+    open_store(args.db)
+    for kind, path in args.import_args or []:
+        loader = store.import_json if path.endswith((".json", ".jsonl")) else store.import_csv
+        print(f"{kind}: {loader(kind, path)}행을 가져왔습니다. ({path})")
+    for kind, path in args.export_args or []:
+        writer = store.export_json if path.endswith((".json", ".jsonl")) else store.export_csv
+        print(f"{kind}: {writer(kind, path)}행을 내보냈습니다. ({path})")
+    if args.serve:
+        import uvicorn
+        store.close()
+        uvicorn.run("server_api:app", host=args.host, port=args.port, workers=args.workers)
+        return
+    if args.import_args or args.export_args:
+        return
     menu()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,188 @@
+# server_api.py (server.py 고객/상품 검색 HTTP API: 커서 페이지 + ETag 조건부 응답 + 최근 검색 결과 LRU 캐시)
+#
+#   python server.py --serve --workers 4              # 또는 uvicorn server_api:app --workers 4
+#   GET  /customers?q=ㄱㅁㅅ&limit=20                  -> {"items": [...], "next_cursor": 57}
+#   GET  /customers?q=ㄱㅁㅅ&cursor=57                 # 다음 페이지 (next_cursor 가 null 이면 마지막 페이지)
+#   POST /products {"name": "치즈볼", "price": 2500}    # 추가 -> products 검색 캐시 무효화
+#
+# - 검색 결과는 JSON 으로 직렬화한 bytes 를 (종류, 데이터 버전, 검색어, 커서, 개수) 키로 캐시 (같은 검색은 DB 조회/인코딩 없이 응답)
+# - 데이터 버전은 저장소(SQLite)에 기록되므로 다른 워커 프로세스가 쓴 변경도 다음 요청부터 반영됨
+# - ETag 는 본문 해시, If-None-Match 가 같으면 본문 없이 304
+# - SQLite 조회/쓰기는 스레드 풀에서 실행 (이벤트 루프를 막지 않음, 저장소는 스레드마다 연결 하나)
+# - 같은 검색이 동시에 여러 번 들어오면 DB 조회는 한 번만 하고 결과를 나눠 씀
+
+import asyncio
+import hashlib
+import json
+import threading
+from collections import OrderedDict
+from contextlib import asynccontextmanager
+from typing import Dict, Optional, Tuple, Union
+
+from fastapi import FastAPI, Header, Query
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import Response
+from pydantic import BaseModel
+
+import server
+from search_index import normalize
+
+# 한 번에 요청할 수 있는 최대 개수 / 기억하는 검색 결과 수
+MAX_PAGE_SIZE = 100
+MAX_CACHED_RESPONSES = 1024
+# 클라이언트는 응답을 저장해 두되 쓸 때마다 ETag 로 확인
+CACHE_CONTROL = "no-cache"
+
+CacheKey = Tuple[str, int, str, int, int]
+
+
+class CachedResponse:
+    __slots__ = ("body", "etag")
+
+    def __init__(self, body: bytes):
+        self.body = body
+        self.etag = '"' + hashlib.sha1(body).hexdigest() + '"'
+
+
+class ResponseCache:
+    """검색 응답 LRU 캐시. 키에 데이터 버전이 들어 있어 변경 후의 요청은 이전 결과와 겹치지 않습니다."""
+
+    def __init__(self, max_entries: int = MAX_CACHED_RESPONSES):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[CacheKey, CachedResponse]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: CacheKey) -> Optional[CachedResponse]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+            return entry
+
+    def put(self, key: CacheKey, entry: CachedResponse) -> None:
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, kind: str) -> None:
+        """kind 의 캐시를 모두 버립니다. (버전이 바뀐 이전 결과가 LRU 자리를 차지하지 않도록)"""
+        with self._lock:
+            for key in [key for key in self._entries if key[0] == kind]:
+                del self._entries[key]
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class CustomerIn(BaseModel):
+    name: str
+    age: Optional[int] = None
+    address: Optional[str] = None
+    phone: Optional[str] = None
+
+
+class ProductIn(BaseModel):
+    name: str
+    price: Optional[int] = None
+    description: Optional[str] = None
+
+
+cache = ResponseCache()
+# 처리 중인 검색 (같은 키의 요청은 이 결과를 기다림)
+_pending: Dict[CacheKey, "asyncio.Future[CachedResponse]"] = {}
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # 저장소 경로는 SERVER_DB_PATH 환경 변수 (없으면 server.db)
+    server.open_store()
+    yield
+    server.store.close()
+
+
+app = FastAPI(lifespan=lifespan)
+
+
+def _etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    if not if_none_match:
+        return False
+    tags = [tag.strip() for tag in if_none_match.split(",")]
+    # 약한 비교 (W/ 접두어 무시)
+    return "*" in tags or etag in (tag[2:] if tag.startswith("W/") else tag for tag in tags)
+
+
+def _load_page(kind: str, query: str, cursor: int, limit: int) -> CachedResponse:
+    page = server.store.search(kind, query, cursor=cursor, limit=limit)
+    body = json.dumps({"items": page.items, "next_cursor": page.next_cursor}, ensure_ascii=False, separators=(",", ":"))
+    return CachedResponse(body.encode("utf-8"))
+
+
+async def _get_page(key: CacheKey) -> CachedResponse:
+    entry = cache.get(key)
+    if entry is not None:
+        return entry
+    pending = _pending.get(key)
+    if pending is not None:
+        return await asyncio.shield(pending)
+
+    future = asyncio.get_running_loop().create_future()
+    _pending[key] = future
+    try:
+        kind, _, query, cursor, limit = key
+        entry = await run_in_threadpool(_load_page, kind, query, cursor, limit)
+    except asyncio.CancelledError:
+        future.cancel()
+        raise
+    except Exception as exc:
+        future.set_exception(exc)
+        # 기다리는 요청이 없으면 예외를 꺼내지 않았다는 경고가 뜨므로 여기서 한 번 확인
+        future.exception()
+        raise
+    else:
+        cache.put(key, entry)
+        future.set_result(entry)
+    finally:
+        del _pending[key]
+    return entry
+
+
+async def search_response(kind: str, q: str, cursor: int, limit: int, if_none_match: Optional[str]) -> Response:
+    # 버전 조회는 기본 키 한 행 읽기라 이벤트 루프에서 바로 실행 (WAL 이므로 쓰기 중에도 막히지 않음)
+    key = (kind, server.store.data_version(kind), normalize(q.strip()), cursor, limit)
+    entry = await _get_page(key)
+    headers = {"ETag": entry.etag, "Cache-Control": CACHE_CONTROL}
+    if _etag_matches(if_none_match, entry.etag):
+        return Response(status_code=304, headers=headers)
+    return Response(content=entry.body, media_type="application/json", headers=headers)
+
+
+async def add_record(kind: str, record: Dict[str, Union[str, int, None]]) -> Dict[str, int]:
+    record_id = await run_in_threadpool(server.store.add, kind, record)
+    cache.invalidate(kind)
+    return {"id": record_id}
+
+
+@app.get("/customers")
+async def search_customers(q: str = "", cursor: int = Query(0, ge=0), limit: int = Query(server.PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+                           if_none_match: Optional[str] = Header(None)):
+    """고객 이름 검색 (초성 검색 가능, q 가 비어 있으면 전체 목록). 다음 페이지는 응답의 next_cursor 를 cursor 로 전달."""
+    return await search_response("customers", q, cursor, limit, if_none_match)
+
+
+@app.get("/products")
+async def search_products(q: str = "", cursor: int = Query(0, ge=0), limit: int = Query(server.PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+                          if_none_match: Optional[str] = Header(None)):
+    """상품 이름 검색 (초성 검색 가능, q 가 비어 있으면 전체 목록). 다음 페이지는 응답의 next_cursor 를 cursor 로 전달."""
+    return await search_response("products", q, cursor, limit, if_none_match)
+
+
+@app.post("/customers", status_code=201)
+async def create_customer(customer: CustomerIn):
+    return await add_record("customers", customer.dict())
+
+
+@app.post("/products", status_code=201)
+async def create_product(product: ProductIn):
+    return await add_record("products", product.dict())
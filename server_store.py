@@ -0,0 +1,287 @@
+# server_store.py (고객/상품 저장소: SQLite 테이블 + FTS5 trigram 이름 색인, CSV/JSON Lines 일괄 가져오기/내보내기)
+#
+#   store = CatalogStore("server.db")
+#   store.import_csv("customers", "customers.csv")          # 수백만 행도 배치 단위로 스트리밍
+#   store.search("customers", "ㄱㅁㅅ")                        # 이름 부분 문자열 / 초성 검색 (search_index 와 같은 규칙)
+#   for page in store.iter_pages("products"): ...           # 전체 목록을 페이지 단위로
+#
+# 이름은 저장할 때 정규화(name_norm)/초성(name_initials) 열을 함께 기록하고, 두 열을 FTS5 trigram 으로 색인합니다.
+# 3글자 이상 검색어는 trigram 색인으로, 1~2글자는 글자 단위 색인({kind}_chars, search_index.char_phrase)으로 찾습니다.
+
+import csv
+import json
+import os
+import sqlite3
+import threading
+from typing import List, Dict, Any, Optional, Iterable, Iterator
+
+from search_index import (SearchPage, DEFAULT_PAGE_SIZE, CHAR_TOKENIZER, normalize, to_choseong, has_choseong, matches_initials,
+                          spaced, char_phrase)
+
+# 기본 저장소 파일 (SERVER_DB_PATH 환경 변수가 있으면 그 경로 - 저장소를 열 때 읽음)
+DB_PATH = "server.db"
+IMPORT_BATCH_SIZE = 50000
+# trigram 색인은 3글자 이상 검색어에만 쓸 수 있음
+FTS_MIN_QUERY_LENGTH = 3
+
+# 종류별 (열 이름, 형 변환 함수) - 첫 열이 검색 대상 이름
+SCHEMAS = {
+    "customers": [("name", str), ("age", int), ("address", str), ("phone", str)],
+    "products": [("name", str), ("price", int), ("description", str)],
+}
+_SQL_TYPES = {str: "TEXT", int: "INTEGER"}
+
+
+def _columns(kind: str) -> List[str]:
+    if kind not in SCHEMAS:
+        raise ValueError(f"알 수 없는 데이터 종류입니다: {kind} (가능: {', '.join(SCHEMAS)})")
+    return [name for name, _ in SCHEMAS[kind]]
+
+
+def _convert(kind: str, record: Dict[str, Any]) -> tuple:
+    # 열 순서대로 형 변환한 값 + 정규화 이름 + 초성 이름 (빈 문자열 숫자는 None)
+    values = []
+    for name, cast in SCHEMAS[kind]:
+        value = record.get(name)
+        values.append(cast(value) if value not in (None, "") else None)
+    name_norm = normalize(str(values[0] or ""))
+    return tuple(values) + (name_norm, to_choseong(name_norm))
+
+
+class CatalogStore:
+    """고객/상품 레코드를 SQLite 에 저장하고 이름으로 검색합니다. 스레드마다 연결 하나를 사용합니다."""
+
+    def __init__(self, db_path: Optional[str] = None):
+        self.db_path = db_path or os.environ.get("SERVER_DB_PATH", DB_PATH)
+        self._local = threading.local()
+        self._create_tables()
+
+    def _conn(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.db_path)
+            conn.row_factory = sqlite3.Row
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.create_function("spaced", 1, spaced, deterministic=True)
+            self._local.conn = conn
+        return conn
+
+    def close(self) -> None:
+        conn = getattr(self._local, "conn", None)
+        if conn is not None:
+            conn.close()
+            self._local.conn = None
+
+    def _create_tables(self) -> None:
+        conn = self._conn()
+        with conn:
+            # 종류별 데이터 버전: 쓰기마다 같은 트랜잭션에서 1 증가 (다른 프로세스의 캐시/ETag 무효화 기준)
+            conn.execute("CREATE TABLE IF NOT EXISTS _versions (kind TEXT PRIMARY KEY, version INTEGER NOT NULL)")
+            for kind, schema in SCHEMAS.items():
+                columns = ", ".join(f"{name} {_SQL_TYPES[cast]}" for name, cast in schema)
+                conn.execute(f"CREATE TABLE IF NOT EXISTS {kind} (id INTEGER PRIMARY KEY, {columns}, name_norm TEXT NOT NULL, name_initials TEXT NOT NULL)")
+                conn.execute(f"CREATE VIRTUAL TABLE IF NOT EXISTS {kind}_fts USING fts5(name_norm, name_initials, "
+                             f"content='{kind}', content_rowid='id', tokenize='trigram')")
+                # 1~2글자 검색어용 글자 단위 색인 (내용은 {kind} 표에서 만들어 넣음)
+                has_chars = conn.execute("SELECT 1 FROM sqlite_master WHERE name = ?", (f"{kind}_chars",)).fetchone()
+                conn.execute(f"CREATE VIRTUAL TABLE IF NOT EXISTS {kind}_chars USING fts5(name_norm, name_initials, "
+                             f"content='', tokenize='{CHAR_TOKENIZER}')")
+                if not has_chars:
+                    # 글자 단위 색인이 없던 저장소: 기존 행으로 채움
+                    self._index_chars(conn, kind, 0)
+                conn.execute("INSERT OR IGNORE INTO _versions VALUES (?, 0)", (kind,))
+
+    @staticmethod
+    def _index_chars(conn: sqlite3.Connection, kind: str, after_id: int) -> None:
+        conn.execute(f"INSERT INTO {kind}_chars (rowid, name_norm, name_initials) "
+                     f"SELECT id, spaced(name_norm), spaced(name_initials) FROM {kind} WHERE id > ?", (after_id,))
+
+    def _bump_version(self, conn: sqlite3.Connection, kind: str) -> None:
+        conn.execute("UPDATE _versions SET version = version + 1 WHERE kind = ?", (kind,))
+
+    def data_version(self, kind: str) -> int:
+        """kind 데이터가 바뀔 때마다 증가하는 번호. (다른 프로세스가 쓴 변경도 반영)"""
+        _columns(kind)
+        return self._conn().execute("SELECT version FROM _versions WHERE kind = ?", (kind,)).fetchone()[0]
+
+    # ---------------------------------------------------------------------
+    # 쓰기
+    # ---------------------------------------------------------------------
+    def add(self, kind: str, record: Dict[str, Any]) -> int:
+        """레코드 하나를 추가하고 id 를 반환합니다. (이름 색인도 바로 갱신)"""
+        columns = _columns(kind)
+        values = _convert(kind, record)
+        conn = self._conn()
+        with conn:
+            cursor = conn.execute(f"INSERT INTO {kind} ({', '.join(columns)}, name_norm, name_initials) VALUES ({', '.join('?' * len(values))})", values)
+            conn.execute(f"INSERT INTO {kind}_fts (rowid, name_norm, name_initials) VALUES (?, ?, ?)", (cursor.lastrowid,) + values[-2:])
+            self._index_chars(conn, kind, cursor.lastrowid - 1)
+            self._bump_version(conn, kind)
+        return cursor.lastrowid
+
+    def bulk_insert(self, kind: str, records: Iterable[Dict[str, Any]], batch_size: int = IMPORT_BATCH_SIZE) -> int:
+        """
+        레코드를 batch_size 개씩 트랜잭션 하나로 추가하고 추가한 행 수를 반환합니다. 중간에 실패하면 이전 배치까지는 남습니다.
+        이름 색인은 배치마다 그 배치의 행만 추가하고, 빈 표에 넣을 때 trigram 색인은 끝난 뒤 한 번에 다시 만듭니다. (처음 가져오기가 더 빠름)
+        records 는 iterator 여도 되며 한 배치만큼만 메모리에 올립니다.
+        """
+        columns = _columns(kind)
+        sql = f"INSERT INTO {kind} ({', '.join(columns)}, name_norm, name_initials) VALUES ({', '.join('?' * (len(columns) + 2))})"
+        conn = self._conn()
+        rebuild_index = conn.execute(f"SELECT NOT EXISTS (SELECT 1 FROM {kind})").fetchone()[0]
+        total = 0
+        batch = []
+        try:
+            for record in records:
+                batch.append(_convert(kind, record))
+                if len(batch) >= batch_size:
+                    self._insert_batch(conn, kind, sql, batch, index=not rebuild_index)
+                    total += len(batch)
+                    batch = []
+            if batch:
+                self._insert_batch(conn, kind, sql, batch, index=not rebuild_index)
+                total += len(batch)
+        finally:
+            # 실패해도 이미 들어간 배치는 검색되도록 색인을 맞춰 둠
+            if rebuild_index and total:
+                with conn:
+                    conn.execute(f"INSERT INTO {kind}_fts ({kind}_fts) VALUES ('rebuild')")
+                    # 색인 전에 캐시된 검색 결과도 무효화
+                    self._bump_version(conn, kind)
+        return total
+
+    def _insert_batch(self, conn: sqlite3.Connection, kind: str, sql: str, batch: List[tuple], index: bool) -> None:
+        with conn:
+            last_id = conn.execute(f"SELECT COALESCE(MAX(id), 0) FROM {kind}").fetchone()[0]
+            conn.executemany(sql, batch)
+            # 글자 단위 색인은 항상 배치마다 (trigram 보다 훨씬 가벼움)
+            self._index_chars(conn, kind, last_id)
+            if index:
+                # 이번 배치의 행만 색인 (표 전체를 다시 색인하지 않음)
+                conn.execute(f"INSERT INTO {kind}_fts (rowid, name_norm, name_initials) "
+                             f"SELECT id, name_norm, name_initials FROM {kind} WHERE id > ?", (last_id,))
+            self._bump_version(conn, kind)
+
+    def import_csv(self, kind: str, path: str, batch_size: int = IMPORT_BATCH_SIZE) -> int:
+        """헤더가 있는 CSV 파일을 스트리밍으로 읽어 추가합니다. (UTF-8, BOM 허용)"""
+        with open(path, encoding="utf-8-sig", newline="") as f:
+            return self.bulk_insert(kind, csv.DictReader(f), batch_size)
+
+    def import_json(self, kind: str, path: str, batch_size: int = IMPORT_BATCH_SIZE) -> int:
+        """JSON Lines(한 줄에 객체 하나)는 스트리밍으로, JSON 배열 파일은 한 번에 읽어 추가합니다."""
+        with open(path, encoding="utf-8") as f:
+            first = f.read(1)
+            while first.isspace():
+                first = f.read(1)
+            f.seek(0)
+            if first == "[":
+                return self.bulk_insert(kind, json.load(f), batch_size)
+            return self.bulk_insert(kind, (json.loads(line) for line in f if line.strip()), batch_size)
+
+    # ---------------------------------------------------------------------
+    # 읽기
+    # ---------------------------------------------------------------------
+    def _select(self, kind: str) -> str:
+        return f"SELECT t.id, {', '.join('t.' + column for column in _columns(kind))}, t.name_norm, t.name_initials FROM {kind} t"
+
+    @staticmethod
+    def _row_to_record(row: sqlite3.Row) -> Dict[str, Any]:
+        record = dict(row)
+        del record["name_norm"], record["name_initials"]
+        return record
+
+    def count(self, kind: str) -> int:
+        _columns(kind)
+        return self._conn().execute(f"SELECT COUNT(*) FROM {kind}").fetchone()[0]
+
+    def get(self, kind: str, record_id: int) -> Optional[Dict[str, Any]]:
+        row = self._conn().execute(f"{self._select(kind)} WHERE t.id = ?", (record_id,)).fetchone()
+        return self._row_to_record(row) if row is not None else None
+
+    def iter_pages(self, kind: str, page_size: int = DEFAULT_PAGE_SIZE) -> Iterator[List[Dict[str, Any]]]:
+        """전체 레코드를 id 순서로 page_size 개씩 반환합니다. (id 커서로 다음 페이지를 읽으므로 한 페이지만 메모리에 올림)"""
+        last_id = 0
+        while True:
+            rows = self._conn().execute(f"{self._select(kind)} WHERE t.id > ? ORDER BY t.id LIMIT ?", (last_id, page_size)).fetchall()
+            if not rows:
+                return
+            yield [self._row_to_record(row) for row in rows]
+            last_id = rows[-1]["id"]
+
+    def _iter_matches(self, kind: str, query: str, cursor: int) -> Iterator[sqlite3.Row]:
+        # 검색어 조건에 맞는 행을 id 순서로 (SQL 결과는 필요한 만큼만 읽힘)
+        select = self._select(kind)
+        if not query:
+            return iter(self._conn().execute(f"{select} WHERE t.id >= ? ORDER BY t.id", (cursor,)))
+
+        initials_query = has_choseong(query)
+        column = "name_initials" if initials_query else "name_norm"
+        needle = to_choseong(query) if initials_query else query
+        if len(needle) >= FTS_MIN_QUERY_LENGTH:
+            phrase = '"' + needle.replace('"', '""') + '"'
+            rows = self._conn().execute(
+                f"{select} JOIN {kind}_fts f ON f.rowid = t.id WHERE {kind}_fts MATCH ? AND f.rowid >= ? ORDER BY f.rowid",
+                (f"{column} : {phrase}", cursor))
+        else:
+            phrase = char_phrase(needle)
+            if phrase is not None:
+                match = f"{column} : {phrase}"
+                if initials_query:
+                    # '김ㅁ' 처럼 완성 글자가 섞이면 그 글자도 이름 열에서 함께 찾아 후보를 줄임
+                    for ch in dict.fromkeys(query):
+                        if not has_choseong(ch) and char_phrase(ch) is not None:
+                            match += f" AND name_norm : {char_phrase(ch)}"
+                # 1~2글자: 글자 단위 색인 후보 중 실제로 이어진 것만 (토크나이저가 버린 문장부호 양옆도 이웃으로 잡히므로)
+                rows = self._conn().execute(
+                    f"{select} JOIN {kind}_chars c ON c.rowid = t.id WHERE {kind}_chars MATCH ? AND c.rowid >= ? "
+                    f"AND instr(t.{column}, ?) > 0 ORDER BY c.rowid", (match, cursor, needle))
+            else:
+                # 글자/숫자가 없는 검색어 (문장부호 등): id 순서로 훑다가 한 페이지가 차면 멈춤
+                rows = self._conn().execute(f"{select} WHERE t.id >= ? AND instr(t.{column}, ?) > 0 ORDER BY t.id", (cursor, needle))
+
+        if not initials_query:
+            return iter(rows)
+        # 초성 위치에서 완성 글자까지 맞는지 확인
+        return (row for row in rows if matches_initials(row["name_norm"], row["name_initials"], query, needle))
+
+    def search(self, kind: str, query: str, cursor: int = 0, limit: int = DEFAULT_PAGE_SIZE) -> SearchPage:
+        """이름에 query 가 들어 있는 레코드를 id 가 cursor 이상인 것부터 limit 개 반환합니다. 빈 검색어는 전체 조회입니다."""
+        _columns(kind)
+        items = []
+        next_cursor = None
+        for row in self._iter_matches(kind, normalize(query.strip()), max(0, cursor)):
+            if len(items) == limit:
+                next_cursor = row["id"]
+                break
+            items.append(self._row_to_record(row))
+        return SearchPage(items, next_cursor)
+
+    # ---------------------------------------------------------------------
+    # 내보내기
+    # ---------------------------------------------------------------------
+    def _iter_all(self, kind: str) -> Iterator[Dict[str, Any]]:
+        for page in self.iter_pages(kind, IMPORT_BATCH_SIZE):
+            yield from page
+
+    def export_csv(self, kind: str, path: str) -> int:
+        """전체 레코드를 CSV 로 저장합니다. (id 제외, import_csv 로 다시 읽을 수 있는 형식)"""
+        columns = _columns(kind)
+        total = 0
+        with open(path, "w", encoding="utf-8", newline="") as f:
+            writer = csv.DictWriter(f, fieldnames=columns, extrasaction="ignore")
+            writer.writeheader()
+            for record in self._iter_all(kind):
+                writer.writerow(record)
+                total += 1
+        return total
+
+    def export_json(self, kind: str, path: str) -> int:
+        """전체 레코드를 JSON Lines 로 저장합니다. (id 제외)"""
+        columns = _columns(kind)
+        total = 0
+        with open(path, "w", encoding="utf-8") as f:
+            for record in self._iter_all(kind):
+                f.write(json.dumps({column: record[column] for column in columns}, ensure_ascii=False) + "\n")
+                total += 1
+        return total
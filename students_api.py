@@ -1,28 +1,54 @@
-from fastapi import FastAPI
+from contextlib import asynccontextmanager
+from fastapi import FastAPI, HTTPException
+from fastapi.responses import Response
 from typing import Union
 
-app = FastAPI()  # FastAPI 서버 객체 생성
+from fast_response import FastJSONResponse
+from students_store import StudentStore, NOT_FOUND_JSON
+
+# 한 번의 일괄 조회로 받을 수 있는 최대 id 수 (URL 길이 제한 안쪽)
+MAX_BATCH_IDS = 1000
+
+# 학생 데이터 (서버 시작 시 한 번 로드, 경로는 STUDENTS_PATH 환경 변수 - 없으면 예제 데이터)
+store = None
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    global store
+    store = StudentStore.load()
+    yield
+
+
+app = FastAPI(lifespan=lifespan, default_response_class=FastJSONResponse)  # FastAPI 서버 객체 생성
+
+
+def json_response(body: bytes) -> Response:
+    # 미리 직렬화한 본문을 그대로 전송
+    return Response(content=body, media_type="application/json")
+
+
+def parse_ids(ids: str) -> list:
+    try:
+        student_ids = [int(part) for part in ids.split(",") if part.strip()]
+    except ValueError:
+        raise HTTPException(status_code=422, detail="ids 는 쉼표로 구분한 정수여야 합니다. (예: ids=1,2,3)")
+    if len(student_ids) > MAX_BATCH_IDS:
+        raise HTTPException(status_code=422, detail=f"ids 는 한 번에 {MAX_BATCH_IDS}개까지 조회할 수 있습니다.")
+    return student_ids
 
 # 1) 기본 루트 API
 @app.get("/")
 def read_root():
-    return {"message": "Welcome to Student API!"}
+    return FastJSONResponse({"message": "Welcome to Student API!"})
 
 # 2) 학생 정보 조회 API
 @app.get("/students/{student_id}")
-def get_student(student_id: int, detail: Union[bool, None] = False):
-    # 예제용 가짜 데이터
-    students = {
-        1: {"name": "김민수", "age": 20, "major": "컴퓨터공학"},
-        2: {"name": "박지훈", "age": 22, "major": "전자공학"},
-        3: {"name": "이서연", "age": 21, "major": "경영학"}
-    }
-
-    student = students.get(student_id)
-    if not student:
-        return {"error": "Student not found"}
-
-    if detail:
-        return student  # 모든 정보 반환
-    else:
-        return {"name": student["name"]}  # 이름만 반환
+async def get_student(student_id: int, detail: Union[bool, None] = False):
+    body = store.get_json(student_id, bool(detail))  # detail 이면 모든 정보, 아니면 이름만
+    return json_response(body if body is not None else NOT_FOUND_JSON)
+
+# 3) 학생 여러 명 일괄 조회 API (예: /students?ids=1,2,3&detail=true)
+@app.get("/students")
+async def get_students(ids: str, detail: Union[bool, None] = False):
+    return json_response(store.batch_json(parse_ids(ids), bool(detail)))
@@ -0,0 +1,100 @@
+# students_store.py (학생 데이터 저장소: 시작할 때 한 번 읽어 id 색인 + 응답 JSON 미리 직렬화)
+#
+#   store = StudentStore.load("students.json")    # .json(배열/객체) / .jsonl / .db(SQLite students 테이블)
+#   store.get_json(1, detail=False)               # b'{"name":"김민수"}' (요청마다 dict 를 만들지 않음)
+#   store.batch_json([1, 2, 99], detail=True)     # b'{"students":{"1":{...},"2":{...}},"missing":[99]}'
+#
+# 학생마다 이름만 / 전체 정보 두 가지 응답 본문을 bytes 로 만들어 두고, 일괄 조회는 이 bytes 를 이어 붙이기만 합니다.
+
+import json
+import os
+import sqlite3
+from typing import List, Dict, Any, Iterable, Optional, Tuple
+
+STUDENTS_PATH = os.environ.get("STUDENTS_PATH", "students.json")
+STUDENTS_TABLE = "students"
+
+# 데이터 파일이 없을 때 쓰는 예제 데이터
+SAMPLE_STUDENTS = {
+    1: {"name": "김민수", "age": 20, "major": "컴퓨터공학"},
+    2: {"name": "박지훈", "age": 22, "major": "전자공학"},
+    3: {"name": "이서연", "age": 21, "major": "경영학"},
+}
+
+NOT_FOUND_JSON = b'{"error":"Student not found"}'
+
+
+def _dumps(value: Any) -> bytes:
+    return json.dumps(value, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+def _read_json(path: str) -> Dict[int, Dict[str, Any]]:
+    # {"1": {...}} 객체, [{"id": 1, ...}] 배열, 한 줄에 객체 하나(JSON Lines) 모두 허용
+    with open(path, encoding="utf-8") as f:
+        if path.endswith(".jsonl"):
+            rows = [json.loads(line) for line in f if line.strip()]
+        else:
+            data = json.load(f)
+            if isinstance(data, dict):
+                return {int(student_id): record for student_id, record in data.items()}
+            rows = data
+    return {int(row.pop("id")): row for row in rows}
+
+
+def _read_sqlite(path: str) -> Dict[int, Dict[str, Any]]:
+    conn = sqlite3.connect(path)
+    conn.row_factory = sqlite3.Row
+    try:
+        rows = conn.execute(f"SELECT * FROM {STUDENTS_TABLE}").fetchall()
+    finally:
+        conn.close()
+    students = {}
+    for row in rows:
+        record = dict(row)
+        students[int(record.pop("id"))] = record
+    return students
+
+
+class StudentStore:
+    """
+    id -> (이름만 JSON, 전체 정보 JSON) 읽기 전용 색인입니다.
+    요청 처리에는 dict 조회와 bytes 연결만 남도록 응답 본문을 미리 직렬화해 둡니다.
+    """
+
+    def __init__(self, students: Dict[int, Dict[str, Any]]):
+        self._bodies: Dict[int, Tuple[bytes, bytes]] = {
+            student_id: (_dumps({"name": record["name"]}), _dumps(record))
+            for student_id, record in students.items()
+        }
+
+    @classmethod
+    def load(cls, path: Optional[str] = STUDENTS_PATH) -> "StudentStore":
+        """확장자로 형식을 고릅니다. (.db/.sqlite: SQLite, 그 밖: JSON) 파일이 없으면 예제 데이터를 씁니다."""
+        if not path or not os.path.exists(path):
+            return cls(SAMPLE_STUDENTS)
+        if path.endswith((".db", ".sqlite", ".sqlite3")):
+            return cls(_read_sqlite(path))
+        return cls(_read_json(path))
+
+    def __len__(self) -> int:
+        return len(self._bodies)
+
+    def get_json(self, student_id: int, detail: bool = False) -> Optional[bytes]:
+        """학생 한 명의 응답 본문 (없으면 None)."""
+        bodies = self._bodies.get(student_id)
+        if bodies is None:
+            return None
+        return bodies[1] if detail else bodies[0]
+
+    def batch_json(self, student_ids: Iterable[int], detail: bool = False) -> bytes:
+        """여러 학생을 {"students": {id: 응답}, "missing": [없는 id]} 한 본문으로 (요청 순서 유지, 중복 id 는 한 번만)."""
+        index = 1 if detail else 0
+        parts: List[bytes] = []
+        missing: List[int] = []
+        for student_id in dict.fromkeys(student_ids):
+            bodies = self._bodies.get(student_id)
+            if bodies is None:
+                missing.append(student_id)
+            else:
+                parts.append(b'"%d":%s' % (student_id, bodies[index]))
+        return b'{"students":{' + b",".join(parts) + b'},"missing":' + _dumps(missing) + b"}"